@@ -17,6 +17,13 @@ import urllib.request
 import urllib.error
 from typing import Optional, Dict, List
 
+try:
+    # Share the pooled HTTP client from arche-tools when run from a checkout
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "arche-tools"))
+    from arche_http import get_client
+except ImportError:
+    get_client = None
+
 
 REPO_OWNER = "coreyshort"
 REPO_NAME = "arche"
@@ -77,15 +84,15 @@ def create_issue(
         "Content-Type": "application/json"
     }
     
-    request = urllib.request.Request(
-        url,
-        data=json.dumps(data).encode("utf-8"),
-        headers=headers,
-        method="POST"
-    )
+    payload = json.dumps(data).encode("utf-8")
     
     try:
-        with urllib.request.urlopen(request) as response:
+        if get_client is not None:
+            response = get_client().request("POST", url, data=payload, headers=headers)
+        else:
+            request = urllib.request.Request(url, data=payload, headers=headers, method="POST")
+            response = urllib.request.urlopen(request, timeout=30)
+        with response:
             return json.loads(response.read())
     except urllib.error.HTTPError as e:
         error_body = e.read().decode("utf-8")
@@ -20,6 +20,14 @@ import json
 import argparse
 from typing import Optional
 
+try:
+    # Share the pooled HTTP client from arche-tools when run from a checkout
+    # (this script is also piped straight from curl, where it isn't available)
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "arche-tools"))
+    from arche_http import get_client
+except ImportError:
+    get_client = None
+
 
 def generate_template(title: str, mode: str, category: str, priority: str, 
                      problem: str, solution: str, implementation: str = "", 
@@ -80,9 +88,13 @@ def create_via_api(title: str, body: str, token: str) -> Optional[str]:
             "labels": ["improvement", "status:proposed"]
         }).encode()
         
-        req = urllib.request.Request(url, data=data, headers=headers, method='POST')
+        if get_client is not None:
+            response = get_client().request("POST", url, data=data, headers=headers)
+        else:
+            req = urllib.request.Request(url, data=data, headers=headers, method='POST')
+            response = urllib.request.urlopen(req, timeout=30)
         
-        with urllib.request.urlopen(req) as response:
+        with response:
             result = json.loads(response.read())
             return result.get('html_url')
             
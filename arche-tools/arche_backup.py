@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Deduplicated backups of an arche project's framework files.
+
+update_arche.py snapshots the framework files, .arche-config and
+.arche-lock before every apply. Contents are stored once per git blob SHA,
+and each snapshot is a small manifest naming the blobs it holds:
+
+    .arche-backups/
+        objects/ab/cdef...          file contents, named by git blob SHA
+        snapshots/<id>.json         {"id": ..., "created_at": ..., "version": ...,
+                                     "files": {"agents.md": "<sha>", ...}}
+        20251220-143022/            backups from before the store (still restorable)
+
+A snapshot only writes blobs the store doesn't have yet, and a rollback
+only rewrites files whose contents differ from the snapshot, so both cost
+O(changed files). prune() applies the retention policy (keep the newest N
+snapshots and/or those younger than D days), and gc() deletes blobs no
+snapshot refers to.
+
+The store also holds the upstream version of each framework file as
+installed by bootstrap.py or update_arche.py (see put()), so an update can
+merge local edits against it whatever the template source.
+"""
+
+import io
+import json
+import shutil
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from arche_cache import fingerprints, materialize
+
+
+BACKUP_DIR = ".arche-backups"
+SNAPSHOT_FORMAT = "%Y%m%d-%H%M%S"
+DEFAULT_KEEP = 10  # Snapshots kept by update_arche.py unless .arche-config says otherwise
+
+
+@dataclass
+class Snapshot:
+    """One backup: the blob SHA of each file it holds, or a legacy directory."""
+    id: str
+    created_at: datetime
+    files: Dict[str, str] = field(default_factory=dict)
+    version: Optional[str] = None
+    legacy: Optional[Path] = None  # Timestamped copy made before the object store
+    stored: int = 0  # Blobs this snapshot added to the store
+
+
+class BackupStore:
+    """The content-addressed backup store of one project directory."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.dir = self.root / BACKUP_DIR
+
+    # -- blobs -------------------------------------------------------------
+
+    def object_path(self, sha: str) -> Path:
+        return self.dir / "objects" / sha[:2] / sha[2:]
+
+    def get(self, sha: str) -> Optional[bytes]:
+        """Contents of a stored blob, or None."""
+        try:
+            return self.object_path(sha).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, sha: str, data: bytes) -> bool:
+        """Add blob ``sha`` with contents ``data``; returns whether it was new."""
+        target = self.object_path(sha)
+        if target.exists():
+            return False
+        materialize(io.BytesIO(data), target, sha, len(data))
+        return True
+
+    def _store(self, path: Path) -> Tuple[str, bool]:
+        """Add a file's contents; returns its SHA and whether the blob was new."""
+        sha = fingerprints().blob_sha(path)
+        target = self.object_path(sha)
+        if target.exists():
+            return sha, False
+        with open(path, "rb") as source:
+            materialize(source, target)
+        return sha, True
+
+    # -- snapshots ---------------------------------------------------------
+
+    def snapshot(self, names: Iterable[str], version: Optional[str] = None) -> Snapshot:
+        """Back up the existing files among ``names`` (relative to the project)."""
+        now = datetime.now()
+        snapshot_id = now.strftime(SNAPSHOT_FORMAT)
+        suffix = 1
+        while self._manifest_path(snapshot_id).exists() or (self.dir / snapshot_id).is_dir():
+            suffix += 1
+            snapshot_id = f"{now.strftime(SNAPSHOT_FORMAT)}-{suffix}"
+
+        files = {}
+        stored = 0
+        for name in names:
+            path = self.root / name
+            if path.is_file():
+                files[name], new = self._store(path)
+                stored += new
+        snapshot = Snapshot(snapshot_id, now, files, version, stored=stored)
+        data = {
+            "id": snapshot_id,
+            "created_at": now.isoformat(timespec="seconds"),
+            "version": version,
+            "files": files,
+        }
+        materialize(io.BytesIO((json.dumps(data, indent=2) + "\n").encode("utf-8")), self._manifest_path(snapshot_id))
+        return snapshot
+
+    def snapshots(self) -> List[Snapshot]:
+        """Every snapshot, oldest first, including legacy timestamped directories."""
+        found = []
+        for path in (self.dir / "snapshots").glob("*.json"):
+            try:
+                data = json.loads(path.read_text())
+                found.append(Snapshot(
+                    data["id"], datetime.fromisoformat(data["created_at"]), data["files"], data.get("version")
+                ))
+            except (OSError, ValueError, KeyError):
+                continue  # Unreadable manifests are left for the user to inspect
+        if self.dir.is_dir():
+            for path in self.dir.iterdir():
+                try:
+                    created = datetime.strptime(path.name, SNAPSHOT_FORMAT)
+                except ValueError:
+                    continue
+                if path.is_dir():
+                    files = {child.name: "" for child in path.iterdir() if child.is_file()}
+                    found.append(Snapshot(path.name, created, files, legacy=path))
+        return sorted(found, key=lambda snapshot: (snapshot.created_at, snapshot.id))
+
+    def find(self, snapshot_id: str) -> Optional[Snapshot]:
+        return next((snapshot for snapshot in self.snapshots() if snapshot.id == snapshot_id), None)
+
+    def restore(self, snapshot: Snapshot) -> List[str]:
+        """Put back every file of ``snapshot`` that differs on disk; returns the names rewritten."""
+        restored = []
+        for name, sha in sorted(snapshot.files.items()):
+            target = self.root / name
+            if snapshot.legacy is not None:
+                shutil.copy2(snapshot.legacy / name, target)
+                restored.append(name)
+                continue
+            if target.is_file() and fingerprints().blob_sha(target) == sha:
+                continue
+            blob = self.object_path(sha)
+            with open(blob, "rb") as source:
+                materialize(source, target, sha, blob.stat().st_size)  # Verified, so a damaged blob fails loudly
+            restored.append(name)
+        return restored
+
+    # -- retention ---------------------------------------------------------
+
+    def prune(self, keep: Optional[int] = None, keep_days: Optional[float] = None) -> List[Snapshot]:
+        """
+        Delete snapshots outside the retention policy; returns those deleted.
+
+        A snapshot is kept if it is one of the newest ``keep`` or younger
+        than ``keep_days`` days. With neither limit nothing is deleted, and
+        the newest snapshot is always kept. Blobs are left for gc().
+        """
+        if keep is None and keep_days is None:
+            return []
+        snapshots = self.snapshots()
+        cutoff = datetime.now() - timedelta(days=keep_days) if keep_days is not None else None
+        first_kept = len(snapshots) - max(keep or 0, 1)
+        deleted = []
+        for index, snapshot in enumerate(snapshots):
+            if index >= first_kept or (cutoff is not None and snapshot.created_at >= cutoff):
+                continue
+            if snapshot.legacy is not None:
+                shutil.rmtree(snapshot.legacy)
+            else:
+                self._manifest_path(snapshot.id).unlink(missing_ok=True)
+            deleted.append(snapshot)
+        return deleted
+
+    def gc(self, keep: Iterable[str] = ()) -> int:
+        """Delete blobs no snapshot refers to, except those in ``keep``; returns the bytes freed."""
+        referenced = {sha for snapshot in self.snapshots() for sha in snapshot.files.values()}
+        referenced.update(keep)
+        freed = 0
+        objects = self.dir / "objects"
+        if not objects.is_dir():
+            return 0
+        for shard in objects.iterdir():
+            for path in shard.iterdir():
+                if not path.name.startswith(".") and shard.name + path.name not in referenced:
+                    freed += path.stat().st_size
+                    path.unlink()
+            if not any(shard.iterdir()):
+                shard.rmdir()
+        return freed
+
+    def size(self) -> int:
+        """Bytes used by the store, legacy directories included."""
+        if not self.dir.is_dir():
+            return 0
+        return sum(path.stat().st_size for path in self.dir.rglob("*") if path.is_file())
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        return self.dir / "snapshots" / f"{snapshot_id}.json"
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Local content-addressed cache for arche template files.
+
+Files are stored once per git blob SHA, so the same `_shared/init_env.md`
+or form file is downloaded only the first time any project needs it. A
+small ref → tree map plus the cached tree listings let bootstrap run fully
+offline for refs it has seen before.
+
+Layout (default: ~/.cache/arche, or $XDG_CACHE_HOME/arche):
+    objects/ab/cdef...   file contents, named by git blob SHA
+    trees/<sha>.json     recursive tree listing for a tree SHA
+    refs.json            {"main": {"tree": "<sha>", "fetched_at": "..."}}
+    http/                ETag / Last-Modified validators (see arche_http.ValidatorCache)
+    fingerprints.json    git blob SHAs of local files by stat signature (FingerprintCache)
+
+Eviction is least-recently-used by file mtime: every cache hit touches the
+object, and prune() removes the oldest entries until the cache fits in its
+size budget.
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+DEFAULT_CACHE_MB = 100
+CHUNK_SIZE = 64 * 1024
+
+FINGERPRINT_FILE = "fingerprints.json"
+MAX_FINGERPRINTS = 100_000
+# Files modified this recently are hashed but not remembered: a later write
+# within the filesystem's timestamp granularity could leave the stat unchanged
+RACY_WINDOW_NS = 2 * 10**9
+
+# Read once at import (os.umask can only be queried by setting it) so files
+# created via mkstemp get the same permissions as a plain open() would give
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class IntegrityError(ValueError):
+    """Content doesn't match the git blob it was expected to be."""
+
+
+def default_cache_dir() -> Path:
+    """Return the platform cache directory for arche."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "arche"
+
+
+def git_blob_sha(data: bytes) -> str:
+    """Compute the git blob SHA-1 of file contents."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def git_blob_sha_file(path: Path) -> str:
+    """Compute the git blob SHA-1 of a file without loading it into memory."""
+    hasher = hashlib.sha1(b"blob %d\0" % path.stat().st_size)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def materialize(stream, target: Path, sha: Optional[str] = None, size: Optional[int] = None, transform=None) -> int:
+    """
+    Stream ``stream`` into ``target`` all-or-nothing.
+
+    Data is copied in chunks into a temporary file next to ``target`` and
+    renamed over it only once complete, so memory use is flat and an
+    interrupted write never leaves a truncated file behind. When both the
+    expected git blob ``sha`` and ``size`` are known the content is
+    verified on the fly and IntegrityError is raised on a mismatch.
+
+    ``transform`` (an object with ``feed(chunk) -> bytes`` and
+    ``finish() -> bytes``) rewrites the data on its way to disk; the
+    verification still applies to the original bytes.
+
+    Returns the number of bytes written.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    hasher = hashlib.sha1(b"blob %d\0" % size) if sha and size is not None else None
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".part")
+    received = written = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                received += len(chunk)
+                if hasher:
+                    hasher.update(chunk)
+                if transform is not None:
+                    chunk = transform.feed(chunk)
+                out.write(chunk)
+                written += len(chunk)
+            if transform is not None:
+                tail = transform.finish()
+                out.write(tail)
+                written += len(tail)
+        if hasher and (received != size or hasher.hexdigest() != sha):
+            raise IntegrityError(f"content does not match blob {sha[:7]}")
+        os.chmod(tmp, 0o666 & ~_UMASK)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return written
+
+
+class TemplateCache:
+    """Content-addressed store of template blobs and tree listings."""
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_CACHE_MB * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    # -- blobs -------------------------------------------------------------
+
+    def object_path(self, sha: str) -> Path:
+        return self.root / "objects" / sha[:2] / sha[2:]
+
+    def has(self, sha: str) -> bool:
+        return self.object_path(sha).exists()
+
+    def get(self, sha: str) -> Optional[bytes]:
+        """Return cached contents for a blob, or None on a miss."""
+        path = self.object_path(sha)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self._count(hit=False)
+            return None
+        self._touch(path)
+        self._count(hit=True)
+        return data
+
+    def copy_to(self, sha: str, target: Path, transform=None) -> bool:
+        """Copy a cached blob to ``target`` (see materialize). Returns False on a miss."""
+        path = self.object_path(sha)
+        if not path.exists():
+            self._count(hit=False)
+            return False
+        with open(path, "rb") as source:
+            materialize(source, target, transform=transform)
+        self._touch(path)
+        self._count(hit=True)
+        return True
+
+    def put(self, sha: str, data: bytes) -> bool:
+        """Store a blob if its contents match ``sha``. Returns True if stored."""
+        if git_blob_sha(data) != sha:
+            return False
+        path = self.object_path(sha)
+        if not path.exists():
+            materialize(io.BytesIO(data), path)
+        return True
+
+    def put_file(self, sha: str, path: Path, verified: bool = False) -> bool:
+        """
+        Store a file's contents if they match ``sha``. Returns True if stored.
+
+        Pass ``verified`` when the file was already checked against ``sha``
+        (e.g. by materialize) to skip hashing it again.
+        """
+        if self.has(sha):
+            return True
+        if not verified and git_blob_sha_file(path) != sha:
+            return False
+        with open(path, "rb") as source:
+            materialize(source, self.object_path(sha))
+        return True
+
+    # -- refs and trees ----------------------------------------------------
+
+    def resolve_ref(self, ref: str) -> Optional[str]:
+        """Return the tree SHA last seen for ``ref``."""
+        entry = self._load_refs().get(ref)
+        return entry.get("tree") if entry else None
+
+    def load_tree(self, tree_sha: str) -> Optional[Dict]:
+        """Return a cached recursive tree listing."""
+        path = self.root / "trees" / f"{tree_sha}.json"
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        self._touch(path)
+        return data
+
+    def store_tree(self, ref: str, data: Dict):
+        """Cache a recursive tree listing and point ``ref`` at it."""
+        path = self.root / "trees" / f"{data['sha']}.json"
+        if not path.exists():
+            materialize(io.BytesIO(json.dumps(data).encode("utf-8")), path)
+        with self._lock:
+            refs = self._load_refs()
+            refs[ref] = {
+                "tree": data["sha"],
+                "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            materialize(io.BytesIO(json.dumps(refs, indent=2).encode("utf-8")), self.root / "refs.json")
+
+    # -- maintenance -------------------------------------------------------
+
+    def size(self) -> int:
+        return sum(path.stat().st_size for path in self._entries())
+
+    def prune(self) -> int:
+        """Evict least-recently-used entries until under budget. Returns bytes freed."""
+        entries = []
+        total = 0
+        for path in self._entries():
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                freed += size
+            except OSError:
+                continue
+        return freed
+
+    # -- internals ---------------------------------------------------------
+
+    def _entries(self):
+        for sub in ("objects", "trees", "http"):
+            base = self.root / sub
+            if base.exists():
+                yield from (path for path in base.rglob("*") if path.is_file())
+
+    def _load_refs(self) -> Dict:
+        try:
+            return json.loads((self.root / "refs.json").read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @staticmethod
+    def _touch(path: Path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+class FingerprintCache:
+    """
+    Git blob SHAs of local files, remembered by path and stat signature.
+
+    A file whose size, mtime_ns, inode and ctime_ns are unchanged since it
+    was last hashed is not read again. Entries are kept in
+    ``path`` (None: in memory only) and written back by save(). With
+    ``verify`` every file is hashed and the entries refreshed.
+    """
+
+    def __init__(self, path: Optional[Path] = None, verify: bool = False):
+        self.path = Path(path) if path else None
+        self.verify = verify
+        self.hits = 0
+        self.hashed = 0
+        self._entries: Optional[Dict[str, List]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def blob_sha(self, path: Path) -> str:
+        """The git blob SHA-1 of a file, hashing it only if its stat changed."""
+        key = os.path.abspath(path)
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino, stat.st_ctime_ns]
+        entries = self._load()
+        entry = entries.get(key)
+        if entry is not None and not self.verify and entry[:4] == signature:
+            with self._lock:
+                self.hits += 1
+            return entry[4]
+
+        started = time.time_ns()
+        sha = git_blob_sha_file(Path(path))
+        with self._lock:
+            self.hashed += 1
+            if started - max(stat.st_mtime_ns, stat.st_ctime_ns) > RACY_WINDOW_NS:
+                entries.pop(key, None)  # Re-inserted as the newest
+                entries[key] = signature + [sha]
+                self._dirty = True
+            elif entries.pop(key, None) is not None:
+                self._dirty = True
+        return sha
+
+    def save(self):
+        """Write the entries back (the newest MAX_FINGERPRINTS) if anything changed."""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            entries = dict(list(self._entries.items())[-MAX_FINGERPRINTS:])
+            data = json.dumps({"version": 1, "entries": entries}, separators=(",", ":")).encode("utf-8")
+            self._dirty = False
+        try:
+            materialize(io.BytesIO(data), self.path)
+        except OSError:
+            pass  # The cache is an optimisation; never fail a run over it
+
+    def _load(self) -> Dict[str, List]:
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    entries = {}
+                    if self.path is not None:
+                        try:
+                            data = json.loads(self.path.read_text())
+                            if data.get("version") == 1 and isinstance(data.get("entries"), dict):
+                                entries = data["entries"]
+                        except (OSError, ValueError, AttributeError):
+                            pass
+                    self._entries = entries
+        return self._entries
+
+
+_fingerprints = FingerprintCache()
+
+
+def fingerprints() -> FingerprintCache:
+    """The fingerprint cache local file hashes go through (in memory unless configured)."""
+    return _fingerprints
+
+
+def configure_fingerprints(path: Optional[Path], verify: bool = False) -> FingerprintCache:
+    """Back fingerprints() with ``path`` (e.g. the cache's fingerprints.json), or force ``verify``."""
+    global _fingerprints
+    _fingerprints = FingerprintCache(path, verify)
+    return _fingerprints
@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for arche tools.
+
+bootstrap.py, update_arche.py and the .github helper scripts all talk to
+GitHub through this module instead of calling urllib.request.urlopen
+directly. Compared to urlopen it provides:
+
+- Persistent keep-alive connections, pooled per host and safe to share
+  between threads, so a run pays one TCP+TLS handshake per host
+- Transparent gzip decoding (responses are requested with
+  Accept-Encoding: gzip and decoded while streaming)
+- A default timeout and User-Agent on every request
+- GITHUB_TOKEN authentication for api.github.com when the variable is set
+- Request, byte and connection counters for verbose output, and an
+  "http" span per request (up to the response headers) when tracing
+- An optional on-disk validator cache: get_conditional() sends
+  If-None-Match / If-Modified-Since and serves the stored body on a 304,
+  which GitHub does not count against the API rate limit
+- Rate-limit awareness: X-RateLimit-* headers are tracked per host,
+  concurrency to a host is throttled as its remaining budget shrinks, and
+  idempotent requests are retried with jittered exponential backoff on
+  5xx, 429, secondary rate limits and dropped connections
+
+Errors are raised as urllib.error.HTTPError / URLError, so callers keep
+their existing exception handling. Proxies from the usual *_proxy
+environment variables are honoured.
+
+Usage:
+    from arche_http import get_client
+
+    with get_client().get(url) as response:
+        data = response.read()
+"""
+
+import base64
+import hashlib
+import http.client
+import io
+import json
+import os
+import random
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from arche_cache import materialize
+from arche_trace import tracer
+
+
+USER_AGENT = "arche-tools/1.0 (+https://github.com/coreyshort/arche)"
+DEFAULT_TIMEOUT = 30.0
+MAX_REDIRECTS = 5
+MAX_IDLE_PER_HOST = 8
+CHUNK_SIZE = 64 * 1024
+
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+TOKEN_HOSTS = ("api.github.com",)
+
+DEFAULT_RETRIES = 3
+DEFAULT_MAX_CONCURRENCY = 8
+BACKOFF_BASE = 0.5  # Seconds; doubled per attempt, with full jitter
+MAX_WAIT = 60.0  # Longest we'll sleep for a rate-limit reset before giving up
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+RETRY_STATUS = (500, 502, 503, 504)
+
+
+@dataclass
+class HttpStats:
+    """Counters for one client."""
+    requests: int = 0
+    bytes_received: int = 0  # On the wire, before gzip decoding
+    connections_opened: int = 0
+    connections_reused: int = 0
+    conditional: int = 0  # Requests sent with stored validators
+    revalidated: int = 0  # ... answered 304 and served from disk
+    retries: int = 0
+
+    def hit_ratio(self) -> float:
+        return self.revalidated / self.conditional if self.conditional else 0.0
+
+    def summary(self) -> str:
+        text = (
+            f"{self.requests} request(s), {self.bytes_received / 1024:.1f} KB received, "
+            f"{self.connections_opened} connection(s) opened, {self.connections_reused} reused"
+        )
+        if self.conditional:
+            text += f", {self.revalidated}/{self.conditional} not modified ({self.hit_ratio():.0%})"
+        if self.retries:
+            text += f", {self.retries} retried"
+        return text
+
+
+class RateLimitError(urllib.error.HTTPError):
+    """A request was refused by the rate limit and the reset is too far away to wait for."""
+
+    def __init__(self, url: str, code: int, msg: str, hdrs, fp, reset_at: Optional[float]):
+        super().__init__(url, code, msg, hdrs, fp)
+        self.reset_at = reset_at
+
+
+class RateBudget:
+    """
+    Rate-limit budget for one host, fed from X-RateLimit-* response headers.
+
+    Also acts as a concurrency gate: while the remaining budget is unknown
+    or healthy up to ``max_concurrency`` requests may be in flight, and the
+    allowance shrinks to one as the budget runs out, so a nearly exhausted
+    quota isn't burned by a burst of parallel requests.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def allowed(self) -> int:
+        if self.remaining is None:
+            return self.max_concurrency
+        return max(1, min(self.max_concurrency, self.remaining // 10))
+
+    def update(self, headers):
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        with self._cond:
+            try:
+                self.remaining = int(remaining)
+                self.limit = int(headers.get("X-RateLimit-Limit", self.limit or 0)) or None
+                self.reset_at = float(headers.get("X-RateLimit-Reset")) if headers.get("X-RateLimit-Reset") else None
+            except ValueError:
+                return
+            self._cond.notify_all()
+
+    def __enter__(self):
+        with self._cond:
+            while self._in_flight >= self.allowed():
+                self._cond.wait()
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+
+class ValidatorCache:
+    """
+    On-disk HTTP validator cache: ETag / Last-Modified and body per URL.
+
+    Each URL is stored as <sha256(url)>.json (validators) next to
+    <sha256(url)>.body. Both are written atomically, and the body's digest
+    is recorded so a torn or stale pair is treated as a miss.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        meta = self._load_meta(url)
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        meta = self._load_meta(url)
+        try:
+            body = self._path(url, ".body").read_bytes()
+        except OSError:
+            return None
+        if hashlib.sha256(body).hexdigest() != meta.get("sha256"):
+            return None
+        return body
+
+    def store(self, url: str, headers, body: bytes):
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": hashlib.sha256(body).hexdigest(),
+        }
+        try:
+            materialize(io.BytesIO(body), self._path(url, ".body"))
+            materialize(io.BytesIO(json.dumps(meta).encode("utf-8")), self._path(url, ".json"))
+        except OSError:
+            pass  # The cache is an optimisation; never fail a request over it
+
+    def _path(self, url: str, suffix: str) -> Path:
+        return self.root / (hashlib.sha256(url.encode("utf-8")).hexdigest() + suffix)
+
+    def _load_meta(self, url: str) -> Dict:
+        try:
+            return json.loads(self._path(url, ".json").read_text())
+        except (OSError, ValueError):
+            return {}
+
+
+class Response:
+    """
+    A streamed response body.
+
+    Reading to the end and closing (or leaving the ``with`` block) returns
+    the connection to the pool; closing early discards it.
+    """
+
+    def __init__(self, client: "HttpClient", key: Tuple, conn: http.client.HTTPConnection,
+                 raw: http.client.HTTPResponse, url: str):
+        self.url = url
+        self.status = raw.status
+        self.reason = raw.reason
+        self.headers = raw.headers
+        self._client = client
+        self._key = key
+        self._conn = conn
+        self._raw = raw
+        self._buffer = bytearray()
+        self._eof = False
+        self._closed = False
+        encoding = raw.headers.get("Content-Encoding", "").lower()
+        self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == "gzip" else None
+
+    def getheader(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self.headers.get(name, default)
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """Read decoded bytes: everything, or at most ``amt``."""
+        if amt is None or amt < 0:
+            while not self._eof:
+                self._buffer += self._read_chunk()
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            return data
+
+        while len(self._buffer) < amt and not self._eof:
+            self._buffer += self._read_chunk()
+        data = bytes(self._buffer[:amt])
+        del self._buffer[:amt]
+        return data
+
+    def json(self) -> Any:
+        return json.loads(self.read())
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if not self._eof and self._raw.length == 0:
+            self._raw.read()  # Bodiless response (HEAD, 204, 304): nothing to drain
+            self._eof = True
+        if self._eof and not self._raw.will_close:
+            self._client._release(self._key, self._conn)
+        else:
+            self._raw.close()
+            self._conn.close()
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _read_chunk(self) -> bytes:
+        try:
+            data = self._raw.read(CHUNK_SIZE)
+        except (OSError, http.client.HTTPException) as e:
+            # The connection is in an unknown state: never return it to the pool
+            self._closed = True
+            self._raw.close()
+            self._conn.close()
+            raise urllib.error.URLError(e)
+        self._client._count(bytes_received=len(data))
+        if not data:
+            self._eof = True
+            return self._decoder.flush() if self._decoder else b""
+        return self._decoder.decompress(data) if self._decoder else data
+
+
+class HttpClient:
+    """Thread-safe HTTP client with per-host keep-alive connection pools."""
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        user_agent: str = USER_AGENT,
+        max_idle_per_host: int = MAX_IDLE_PER_HOST,
+        token: Optional[str] = None,
+        validators: Optional[ValidatorCache] = None,
+        retries: int = DEFAULT_RETRIES,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ):
+        self.timeout = timeout
+        self.validators = validators
+        self.retries = retries
+        self.max_concurrency = max_concurrency
+        self._budgets: Dict[str, RateBudget] = {}
+        self.user_agent = user_agent
+        self.max_idle_per_host = max_idle_per_host
+        self.token = token if token is not None else os.environ.get("GITHUB_TOKEN")
+        self.stats = HttpStats()
+        self._idle: Dict[Tuple, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._ssl = ssl.create_default_context()
+        self._proxies = urllib.request.getproxies()
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        return self.request("GET", url, headers=headers)
+
+    def get_once(self, url: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        """A single GET attempt (redirects followed), for use inside with_retries()."""
+        return self._request_once("GET", url, None, headers)
+
+    def get_bytes(self, url: str, headers: Optional[Dict[str, str]] = None) -> bytes:
+        def fetch() -> bytes:
+            with self.get_once(url, headers) as response:
+                return response.read()
+        # Retrying here also covers connections dropped mid-body
+        return self.with_retries("GET", fetch)
+
+    def get_json(self, url: str, headers: Optional[Dict[str, str]] = None) -> Any:
+        return json.loads(self.get_bytes(url, headers))
+
+    def get_conditional(self, url: str, headers: Optional[Dict[str, str]] = None) -> bytes:
+        """
+        GET a full body, revalidating against the validator cache.
+
+        With stored validators the request carries If-None-Match /
+        If-Modified-Since; a 304 is answered from disk. Without a validator
+        cache this is just get_bytes().
+        """
+        if self.validators is None:
+            return self.get_bytes(url, headers)
+
+        conditional = self.validators.conditional_headers(url)
+
+        def fetch() -> Tuple[int, bytes, Any]:
+            with self.get_once(url, {**(headers or {}), **conditional}) as response:
+                return response.status, response.read(), response.headers
+
+        status, body, response_headers = self.with_retries("GET", fetch)
+        if status != 304:
+            self.validators.store(url, response_headers, body)
+            if conditional:
+                self._count(conditional=1)
+            return body
+
+        body = self.validators.load_body(url)
+        if body is None:
+            # Validators outlived their body: fetch it again unconditionally
+            def refetch() -> Tuple[bytes, Any]:
+                with self.get_once(url, headers) as response:
+                    return response.read(), response.headers
+
+            body, response_headers = self.with_retries("GET", refetch)
+            self.validators.store(url, response_headers, body)
+            return body
+
+        self._count(conditional=1, revalidated=1)
+        return body
+
+    def with_retries(self, method: str, fn: Callable[[], Any]) -> Any:
+        """
+        Call ``fn`` (which performs requests), retrying transient failures.
+
+        Use this to make a whole streamed download retryable, including
+        failures after the response headers have arrived. ``fn`` should
+        request with get_once(): get() and request() already retry, and
+        nesting them would multiply the attempts.
+        """
+        attempts = self.retries + 1 if method in IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            try:
+                return fn()
+            except urllib.error.URLError as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt == attempts - 1:
+                    raise
+            self._count(retries=1)
+            time.sleep(delay)
+
+    def budget(self, url: str) -> RateBudget:
+        """The rate-limit budget (and concurrency gate) for the host of ``url``."""
+        host = urllib.parse.urlsplit(url).hostname or ""
+        with self._lock:
+            if host not in self._budgets:
+                self._budgets[host] = RateBudget(self.max_concurrency)
+            return self._budgets[host]
+
+    def check_budget(self, rate_limit_url: str, planned: int) -> Optional[str]:
+        """
+        Preflight a run that plans ``planned`` rate-limited requests.
+
+        Uses the budget already learned from responses, or asks the
+        rate_limit endpoint (which doesn't count against the quota).
+        Returns an explanation if the plan doesn't fit, otherwise None.
+        Single-request plans are not checked: the request itself fails
+        just as fast.
+        """
+        if planned <= 1:
+            return None
+
+        budget = self.budget(rate_limit_url)
+        if budget.remaining is None or (budget.reset_at and budget.reset_at < time.time()):
+            try:
+                core = self.get_json(rate_limit_url)["resources"]["core"]
+            except (urllib.error.URLError, ValueError, KeyError, TypeError):
+                return None  # Can't tell; let the requests speak for themselves
+            budget.remaining, budget.limit, budget.reset_at = core["remaining"], core["limit"], core["reset"]
+
+        if budget.remaining >= planned:
+            return None
+        reset = time.strftime("%H:%M", time.localtime(budget.reset_at)) if budget.reset_at else "later"
+        of_limit = f" of {budget.limit}" if budget.limit else ""
+        return f"this run needs ~{planned} GitHub API request(s) but only {budget.remaining}{of_limit} remain until {reset}"
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Response:
+        """
+        Send a request, following redirects.
+
+        Idempotent requests are retried on transient failures (see
+        _retry_delay). Raises urllib.error.HTTPError for 4xx/5xx responses
+        (RateLimitError when refused by a rate limit) and
+        urllib.error.URLError for connection failures and timeouts.
+        """
+        return self.with_retries(method, lambda: self._request_once(method, url, data, headers))
+
+    def _request_once(
+        self,
+        method: str,
+        url: str,
+        data: Optional[bytes],
+        headers: Optional[Dict[str, str]]
+    ) -> Response:
+        headers = dict(headers or {})
+        host = urllib.parse.urlsplit(url).hostname
+
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(method, url, data, headers)
+
+            location = response.getheader("Location")
+            if response.status in REDIRECT_CODES and location:
+                response.read()
+                response.close()
+                url = urllib.parse.urljoin(url, location)
+                if response.status == 303 or (response.status in (301, 302) and method == "POST"):
+                    method, data = "GET", None
+                if urllib.parse.urlsplit(url).hostname != host:
+                    headers.pop("Authorization", None)
+                continue
+
+            if response.status >= 400:
+                body = response.read()
+                response.close()
+                if _is_rate_limited(response.status, response.headers):
+                    raise RateLimitError(
+                        url, response.status, response.reason, response.headers, io.BytesIO(body),
+                        self.budget(url).reset_at
+                    )
+                raise urllib.error.HTTPError(
+                    url, response.status, response.reason, response.headers, io.BytesIO(body)
+                )
+            return response
+
+        raise urllib.error.URLError(f"Too many redirects: {url}")
+
+    def close(self):
+        """Close all idle pooled connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    # -- internals ---------------------------------------------------------
+
+    def _retry_delay(self, error: urllib.error.URLError, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying ``error``, or None if it isn't transient."""
+        backoff = random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+        if not isinstance(error, urllib.error.HTTPError):
+            return backoff  # Connection reset, timeout, DNS hiccup
+
+        if isinstance(error, RateLimitError):
+            retry_after = error.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                wait = float(retry_after)
+            elif error.reset_at:
+                # A reset already in the past (clock skew, a slow response) leaves just the backoff
+                wait = max(0.0, error.reset_at - time.time() + 1) or backoff
+            else:
+                wait = backoff
+            return wait if wait <= MAX_WAIT else None
+
+        return backoff if error.code in RETRY_STATUS else None
+
+    def _send(self, method: str, url: str, data: Optional[bytes], headers: Dict[str, str]) -> Response:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"Unsupported URL scheme: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+
+        proxy = self._proxy_for(parts.scheme, parts.hostname)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        if proxy and parts.scheme == "http":
+            target = url  # Plain-HTTP proxies expect the absolute URL
+
+        request_headers = {"User-Agent": self.user_agent, "Accept-Encoding": "gzip"}
+        if self.token and parts.hostname in TOKEN_HOSTS:
+            request_headers["Authorization"] = f"token {self.token}"
+        request_headers.update(headers)
+
+        budget = self.budget(url)
+        for attempt in range(2):
+            conn, reused = self._acquire(key, proxy)
+            try:
+                with budget, tracer.span("http", method=method, url=url) as span:
+                    conn.request(method, target, body=data, headers=request_headers)
+                    raw = conn.getresponse()
+                    budget.update(raw.headers)
+                    if span is not None:
+                        span.update(status=raw.status, reused=reused)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                # A pooled connection the server already closed: retry once on a fresh one
+                if reused and attempt == 0 and method in ("GET", "HEAD"):
+                    continue
+                raise urllib.error.URLError(e)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+
+            self._count(requests=1)
+            return Response(self, key, conn, raw, url)
+
+        raise urllib.error.URLError(f"Connection to {parts.hostname} failed")
+
+    def _acquire(self, key: Tuple, proxy: Optional[str]) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.stats.connections_reused += 1
+                return idle.pop(), True
+            self.stats.connections_opened += 1
+
+        scheme, host, port = key
+        if proxy:
+            proxy_parts = urllib.parse.urlsplit(proxy)
+            proxy_port = proxy_parts.port or (443 if proxy_parts.scheme == "https" else 80)
+            if scheme == "https":
+                conn = http.client.HTTPSConnection(
+                    proxy_parts.hostname, proxy_port, timeout=self.timeout, context=self._ssl
+                )
+                tunnel_headers = {}
+                if proxy_parts.username:
+                    credentials = f"{urllib.parse.unquote(proxy_parts.username)}:{urllib.parse.unquote(proxy_parts.password or '')}"
+                    tunnel_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+                conn.set_tunnel(host, port, headers=tunnel_headers)
+            else:
+                conn = http.client.HTTPConnection(proxy_parts.hostname, proxy_port, timeout=self.timeout)
+        elif scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self._ssl)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        return conn, False
+
+    def _release(self, key: Tuple, conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _proxy_for(self, scheme: str, host: str) -> Optional[str]:
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(host):
+            return None
+        return proxy
+
+    def _count(self, requests: int = 0, bytes_received: int = 0, conditional: int = 0,
+               revalidated: int = 0, retries: int = 0):
+        with self._lock:
+            self.stats.requests += requests
+            self.stats.bytes_received += bytes_received
+            self.stats.conditional += conditional
+            self.stats.revalidated += revalidated
+            self.stats.retries += retries
+
+
+def _is_rate_limited(status: int, headers) -> bool:
+    if status == 429:
+        return True
+    # GitHub signals both primary and secondary limits with 403
+    return status == 403 and (headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in headers)
+
+
+def describe_error(error: Exception) -> str:
+    """One-line explanation of a network error for user-facing messages."""
+    if isinstance(error, RateLimitError):
+        if error.reset_at:
+            reset = time.strftime("%H:%M", time.localtime(error.reset_at))
+            return f"GitHub rate limit exceeded (resets at {reset}; set GITHUB_TOKEN for a higher limit)"
+        return "GitHub rate limit exceeded (set GITHUB_TOKEN for a higher limit)"
+    return str(error)
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Return the process-wide shared client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def configure(
+    timeout: Optional[float] = None,
+    user_agent: Optional[str] = None,
+    validator_dir: Optional[Path] = None,
+    retries: int = DEFAULT_RETRIES,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> HttpClient:
+    """
+    Replace the shared client with one using the given settings.
+
+    ``validator_dir`` enables the on-disk ETag / Last-Modified cache used by
+    get_conditional(). ``max_concurrency`` caps in-flight requests per host
+    once a rate-limit budget is known.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HttpClient(
+            timeout=timeout if timeout is not None else DEFAULT_TIMEOUT,
+            user_agent=user_agent or USER_AGENT,
+            validators=ValidatorCache(validator_dir) if validator_dir else None,
+            retries=retries,
+            max_concurrency=max_concurrency
+        )
+        return _client
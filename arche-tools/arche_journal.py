@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+All-or-nothing updates of the files in an arche project.
+
+update_arche.py applies an update as one transaction: the new framework
+files, side files (.rej, .arche-new), .arche-config and .arche-lock are
+staged first, then committed together, so a crash or a failed download
+never leaves new files behind an old ``arche_version``:
+
+    .arche-backups/txn/
+        0, 1, ...       staged contents, fsynced
+        journal.json    {"created_at": ..., "version": ..., "backup": ...,
+                         "ops": [{"path": "agents.md", "staged": "0"},
+                                 {"path": "agents.md.rej", "delete": true}]}
+
+Writing the journal is the commit point. Before it is on disk nothing in
+the project has changed, and recover() just discards the staged files.
+After it, every op is carried out with an atomic rename or unlink; replaying
+them is idempotent, so recover() finishes a commit that was interrupted
+half way. The journal is removed last. A journal that can't be read
+(a damaged disk, or edited by hand) is treated as never committed.
+
+Staging, committing and recovering all hold .arche-backups/txn.lock, an
+flock (a byte-range lock on Windows) that the OS drops if its process
+dies. Recovery waits for a running update to finish rather than
+discarding its staged files under it, and a second update in the same
+project fails with TransactionBusy instead of interleaving with the first.
+
+Usage:
+    from arche_journal import Transaction, recover
+
+    recover(root)                      # On startup, before reading any state
+    with Transaction(root) as txn:     # Dropped unless committed
+        txn.write("agents.md", data)
+        txn.delete("agents.md.rej")
+        txn.commit(version="a1b2c3d")
+"""
+
+import json
+import os
+import shutil
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from arche_backup import BACKUP_DIR
+
+
+TXN_DIR = f"{BACKUP_DIR}/txn"
+JOURNAL = "journal.json"
+LOCK = f"{BACKUP_DIR}/txn.lock"
+
+
+class TransactionBusy(OSError):
+    """Another process is updating the project."""
+
+
+def _acquire(root: Path, wait: bool) -> int:
+    """Open and lock ``root``'s transaction lock; returns the descriptor to pass to _release()."""
+    path = Path(root) / LOCK
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK if wait else msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        if wait:
+            raise
+        raise TransactionBusy(f"Another update is running in {root}")
+    return fd
+
+
+def _release(fd: int):
+    if fcntl is None:
+        try:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+    os.close(fd)  # Also drops an flock
+
+
+@contextmanager
+def locked(root: Path) -> Iterator[None]:
+    """Hold ``root``'s transaction lock (waiting for it), e.g. while pruning backups."""
+    fd = _acquire(root, wait=True)
+    try:
+        yield
+    finally:
+        _release(fd)
+
+
+def _write_durably(path: Path, data: bytes):
+    """Write ``data`` to ``path`` and fsync it."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_dir(path: Path):
+    """Make renames and unlinks in ``path`` durable (directories can't be opened on Windows)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Transaction:
+    """
+    Writes and deletes under one project directory, staged and then committed together.
+
+    Holds the project's transaction lock from creation until commit() or
+    abort(); raises TransactionBusy if another process holds it. Used as a
+    context manager, anything not committed is aborted on the way out.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.dir = self.root / TXN_DIR
+        self.ops: List[Dict] = []
+        self._fd: Optional[int] = _acquire(self.root, wait=False)
+        self._committed = False
+        try:
+            _recover(self.root)  # Never stage on top of an interrupted transaction
+            self.dir.mkdir(parents=True, exist_ok=True)
+        except BaseException:
+            self._unlock()
+            raise
+
+    def __enter__(self) -> "Transaction":
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._fd is not None:
+            if self._committed:
+                self._unlock()  # Failed while replaying: the next recover() finishes it
+            else:
+                self.abort()
+
+    def write(self, path: str, data: bytes):
+        """Stage ``data`` as the new contents of ``path`` (relative to the project)."""
+        staged = str(len(self.ops))
+        _write_durably(self.dir / staged, data)
+        self.ops.append({"path": path, "staged": staged})
+
+    def delete(self, path: str):
+        """Stage removing ``path`` if it exists."""
+        self.ops.append({"path": path, "delete": True})
+
+    def commit(self, **info):
+        """Make every staged change; ``info`` (version, backup, ...) is recorded in the journal."""
+        journal = {"created_at": datetime.now().isoformat(timespec="seconds"), **info, "ops": self.ops}
+        partial = self.dir / f"{JOURNAL}.part"
+        _write_durably(partial, (json.dumps(journal, indent=2) + "\n").encode("utf-8"))
+        os.replace(partial, self.dir / JOURNAL)
+        _fsync_dir(self.dir)  # The commit point
+        self._committed = True
+        _replay(self.root, journal)
+        self._unlock()
+
+    def abort(self):
+        """Drop everything staged; the project is left as it was."""
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self._unlock()
+
+    def _unlock(self):
+        if self._fd is not None:
+            _release(self._fd)
+            self._fd = None
+
+
+def _replay(root: Path, journal: Dict):
+    """Carry out a committed journal's ops, skipping those already done, then retire it."""
+    txn_dir = root / TXN_DIR
+    touched = set()
+    for op in journal["ops"]:
+        target = root / op["path"]
+        if op.get("delete"):
+            try:
+                target.unlink()
+            except FileNotFoundError:
+                continue
+        else:
+            staged = txn_dir / op["staged"]
+            if not staged.exists():
+                continue  # Renamed into place before an interruption
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged, target)
+        touched.add(target.parent)
+    for directory in touched:
+        _fsync_dir(directory)
+    (txn_dir / JOURNAL).unlink()
+    _fsync_dir(txn_dir)
+    shutil.rmtree(txn_dir, ignore_errors=True)
+
+
+def recover(root: Path) -> Optional[str]:
+    """
+    Resolve a transaction interrupted in ``root``.
+
+    Returns "committed" if a committed one was finished, "discarded" if
+    staged files from one that never committed were dropped, "corrupt" if
+    they were dropped because the journal was unreadable (files it had
+    already renamed into place stay), or None if there was nothing to do.
+    Waits while another process is staging or committing an update.
+    """
+    if not (Path(root) / TXN_DIR).is_dir():
+        return None  # Nothing to do; don't create .arche-backups/ in every directory
+    fd = _acquire(root, wait=True)
+    try:
+        return _recover(Path(root))
+    finally:
+        _release(fd)
+
+
+def _recover(root: Path) -> Optional[str]:
+    """recover() for a caller holding the transaction lock."""
+    txn_dir = root / TXN_DIR
+    if not txn_dir.is_dir():
+        return None
+    try:
+        journal = json.loads((txn_dir / JOURNAL).read_text())
+    except FileNotFoundError:
+        shutil.rmtree(txn_dir, ignore_errors=True)
+        return "discarded"
+    except ValueError:
+        journal = None
+    if not _valid(journal):
+        shutil.rmtree(txn_dir, ignore_errors=True)
+        return "corrupt"
+    _replay(root, journal)
+    return "committed"
+
+
+def _valid(journal) -> bool:
+    """Whether ``journal`` has the shape commit() writes, so replaying it can't fail half way."""
+    if not isinstance(journal, dict) or not isinstance(journal.get("ops"), list):
+        return False
+    for op in journal["ops"]:
+        if not isinstance(op, dict) or not isinstance(op.get("path"), str):
+            return False
+        if not op.get("delete") and not isinstance(op.get("staged"), str):
+            return False
+    return True
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Lock manifest of the framework files installed in an arche project.
+
+bootstrap.py writes ``.arche-lock`` next to ``.arche-config`` and
+update_arche.py rewrites it after every apply. For each installed file it
+records where the file came from and two git blob SHAs:
+
+    {
+      "version": 1,
+      "mode": "3-layer",
+      "branch": "main",
+      "revision": "a1b2c3d",
+      "files": {
+        "agents.md": {
+          "source": "modes/3-layer/_shared/agents.md",
+          "sha": "<blob SHA upstream>",
+          "installed": "<blob SHA of the file as written>"
+        }
+      }
+    }
+
+``sha`` lets an update check compare against a remote tree listing without
+downloading any file bodies. ``installed`` differs from ``sha`` when the
+project name was rendered into the file. Comparing it with the file on disk
+tells exactly whether the user has changed the file since it was written.
+"""
+
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from arche_cache import fingerprints, materialize
+
+
+LOCK_FILE = ".arche-lock"
+LOCK_VERSION = 1
+
+
+class ProjectLock:
+    """The ``.arche-lock`` of one project directory."""
+
+    def __init__(self, root: Path, data: Dict):
+        self.root = Path(root)
+        self.data = data
+        self.data.setdefault("files", {})
+
+    @classmethod
+    def load(cls, root: Path) -> Optional["ProjectLock"]:
+        """Read the lock in ``root``; None if there is none or it is unreadable."""
+        try:
+            data = json.loads((Path(root) / LOCK_FILE).read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != LOCK_VERSION or not isinstance(data.get("files"), dict):
+            return None
+        return cls(root, data)
+
+    @classmethod
+    def create(cls, root: Path, **fields) -> "ProjectLock":
+        """A new, empty lock; ``fields`` (mode, branch, revision, ...) are stored as-is."""
+        return cls(root, {"version": LOCK_VERSION, **{k: v for k, v in fields.items() if v is not None}, "files": {}})
+
+    @property
+    def files(self) -> Dict[str, Dict]:
+        return self.data["files"]
+
+    def entry(self, path: str) -> Optional[Dict]:
+        return self.files.get(path)
+
+    def record(self, path: str, source: str, sha: Optional[str], verified: bool = True):
+        """
+        Record ``path`` (relative to the project) as installed from blob ``sha``.
+
+        With ``verified`` the file is known to hold exactly blob ``sha``.
+        Otherwise (rendered files, unknown SHAs) the installed hash is read
+        from disk.
+        """
+        installed = sha if verified and sha else fingerprints().blob_sha(self.root / path)
+        self.files[path] = {"source": source, "sha": sha, "installed": installed}
+
+    def forget(self, path: str):
+        self.files.pop(path, None)
+
+    def local_hash(self, path: str) -> Optional[str]:
+        """Git blob SHA of the file on disk (unless its stat is unchanged), or None if it is missing."""
+        try:
+            return fingerprints().blob_sha(self.root / path)
+        except OSError:
+            return None
+
+    def is_modified(self, path: str) -> Optional[bool]:
+        """
+        True if ``path`` no longer holds what was installed, False if it does.
+
+        Returns None when the lock has no entry for the file.
+        A deleted file counts as modified.
+        """
+        entry = self.entry(path)
+        if entry is None:
+            return None
+        return self.local_hash(path) != entry.get("installed")
+
+    def dumps(self) -> bytes:
+        """The lock file's contents, stamped with the current time."""
+        self.data["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        self.data["files"] = dict(sorted(self.files.items()))
+        return (json.dumps(self.data, indent=2) + "\n").encode("utf-8")
+
+    def save(self):
+        """Write the lock atomically."""
+        materialize(io.BytesIO(self.dumps()), self.root / LOCK_FILE)
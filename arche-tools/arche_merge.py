@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Line-level diffs and three-way merges of framework files.
+
+update_arche.py uses this when a file has local edits and upstream has a
+new version. Given the version the project was installed from (base), the
+file on disk (local) and the new upstream version, merge3() keeps every
+change that only one side made and reports a conflict only where both
+sides changed the same lines differently, the way diff3 and git do.
+
+Lines are compared without their line endings, so a file an editor
+converted between CRLF and LF still merges cleanly; unchanged lines keep
+their local endings.
+
+Diffs anchor on lines that occur exactly once on both sides (patience
+diff), then trim common prefixes and suffixes between anchors. Directive
+files are mostly unique lines, so this stays close to linear in file size;
+difflib's quadratic matcher is only used on small ambiguous gaps.
+update_arche.py --diff uses the same matcher for unified diffs. Hunks
+hold line indices only, and unified_diff() produces its output lazily.
+
+Usage:
+    from arche_merge import diff_hunks, merge3, render, unified_diff
+
+    result = merge3(base_text, local_text, upstream_text)
+    text = render(result, "local", "arche 1a2b3c4")   # Conflict markers
+    text, rejects = render_rejects(result)             # Or keep local, list rejects
+
+    hunks = diff_hunks(old_lines, new_lines)
+    for line in unified_diff(old_lines, new_lines, hunks, "a/agents.md", "b/agents.md"):
+        sys.stdout.write(line)
+"""
+
+import bisect
+import difflib
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+
+# Gaps without unique anchors are matched with difflib only up to this
+# many line pairs; larger ones are treated as replaced wholesale
+SMALL_GAP = 10_000
+
+# Unchanged lines shown around each change in a unified diff
+CONTEXT = 3
+
+
+@dataclass
+class Conflict:
+    """A region both sides changed: base, local and upstream lines."""
+    base: List[str]
+    local: List[str]
+    upstream: List[str]
+
+
+@dataclass
+class MergeResult:
+    """Merged chunks in order: runs of lines, and conflicts where both sides changed."""
+    chunks: List[Union[List[str], Conflict]] = field(default_factory=list)
+
+    @property
+    def conflicts(self) -> List[Conflict]:
+        return [chunk for chunk in self.chunks if isinstance(chunk, Conflict)]
+
+    def _add(self, lines: List[str]):
+        if not lines:
+            return
+        if self.chunks and isinstance(self.chunks[-1], list):
+            self.chunks[-1].extend(lines)
+        else:
+            self.chunks.append(list(lines))
+
+
+def matches(a: Sequence[str], b: Sequence[str]) -> List[Tuple[int, int]]:
+    """Pairs (i, j) of matching lines a[i] == b[j], increasing in both."""
+    found: List[Tuple[int, int]] = []
+    ranges = [(0, len(a), 0, len(b))]
+    while ranges:
+        alo, ahi, blo, bhi = ranges.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            found.append((alo, blo))
+            alo, blo = alo + 1, blo + 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi, bhi = ahi - 1, bhi - 1
+            found.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
+            continue
+
+        anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            # Each gap between anchors (and the ends) gets the same treatment
+            previous_a, previous_b = alo, blo
+            for i, j in anchors:
+                found.append((i, j))
+                ranges.append((previous_a, i, previous_b, j))
+                previous_a, previous_b = i + 1, j + 1
+            ranges.append((previous_a, ahi, previous_b, bhi))
+        elif (ahi - alo) * (bhi - blo) <= SMALL_GAP:
+            matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+            for i, j, size in matcher.get_matching_blocks():
+                found.extend((alo + i + k, blo + j + k) for k in range(size))
+    found.sort()
+    return found
+
+
+def _unique_anchors(a, alo, ahi, b, blo, bhi) -> List[Tuple[int, int]]:
+    """Longest increasing run of lines unique to both ranges (patience sorting)."""
+    positions: Dict[str, List[int]] = {}
+    for i in range(alo, ahi):
+        entry = positions.setdefault(a[i], [0, i, -1])
+        entry[0] += 1
+    for j in range(blo, bhi):
+        entry = positions.get(b[j])
+        if entry is not None:
+            entry[2] = j if entry[2] == -1 else -2  # -2: seen more than once in b
+    pairs = [(i, j) for count, i, j in positions.values() if count == 1 and j >= 0]
+    pairs.sort()
+
+    # Longest increasing subsequence of j, in O(k log k)
+    tails: List[int] = []
+    tail_index: List[int] = []
+    back = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        slot = bisect.bisect_left(tails, j)
+        if slot == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[slot] = j
+            tail_index[slot] = index
+        back[index] = tail_index[slot - 1] if slot else -1
+    run = []
+    index = tail_index[-1] if tail_index else -1
+    while index != -1:
+        run.append(pairs[index])
+        index = back[index]
+    run.reverse()
+    return run
+
+
+def merge3(base: str, local: str, upstream: str) -> MergeResult:
+    """Merge two edited versions of ``base`` line by line."""
+    base_lines = base.splitlines(keepends=True)
+    local_lines = local.splitlines(keepends=True)
+    upstream_lines = upstream.splitlines(keepends=True)
+    base_keys, local_keys, upstream_keys = (
+        [line.rstrip("\r\n") for line in lines] for lines in (base_lines, local_lines, upstream_lines)
+    )
+
+    # Where each base line sits in local and upstream (-1: changed there)
+    in_local = [-1] * len(base_lines)
+    for i, j in matches(base_keys, local_keys):
+        in_local[i] = j
+    in_upstream = [-1] * len(base_lines)
+    for i, j in matches(base_keys, upstream_keys):
+        in_upstream[i] = j
+
+    def resolve(o_end: int, a_end: int, b_end: int):
+        if local_keys[a:a_end] == base_keys[o:o_end]:
+            result._add(upstream_lines[b:b_end])  # Only upstream changed (or neither)
+        elif upstream_keys[b:b_end] == base_keys[o:o_end] or local_keys[a:a_end] == upstream_keys[b:b_end]:
+            result._add(local_lines[a:a_end])  # Only local changed, or both made the same change
+        else:
+            result.chunks.append(Conflict(base_lines[o:o_end], local_lines[a:a_end], upstream_lines[b:b_end]))
+
+    result = MergeResult()
+    o = a = b = 0
+    while True:
+        # Next base line both sides kept: everything before it is one chunk
+        stable = o
+        while stable < len(base_lines) and (in_local[stable] < 0 or in_upstream[stable] < 0):
+            stable += 1
+        if stable < len(base_lines):
+            next_a, next_b = in_local[stable], in_upstream[stable]
+        else:
+            next_a, next_b = len(local_lines), len(upstream_lines)
+        resolve(stable, next_a, next_b)
+        if stable == len(base_lines):
+            return result
+
+        o, a, b = stable, next_a, next_b
+        while o < len(base_lines) and in_local[o] == a and in_upstream[o] == b:
+            result._add([local_lines[a]])
+            o, a, b = o + 1, a + 1, b + 1
+
+
+def _terminated(lines: List[str]) -> List[str]:
+    """``lines`` with a final newline, so a marker never joins the last line."""
+    if lines and not lines[-1].endswith(("\n", "\r")):
+        return lines[:-1] + [lines[-1] + "\n"]
+    return lines
+
+
+def render(result: MergeResult, local_label: str = "local", upstream_label: str = "upstream") -> str:
+    """The merged text, with git-style conflict markers around each conflict."""
+    out: List[str] = []
+    for chunk in result.chunks:
+        if isinstance(chunk, Conflict):
+            out.append(f"<<<<<<< {local_label}\n")
+            out.extend(_terminated(chunk.local))
+            out.append("=======\n")
+            out.extend(_terminated(chunk.upstream))
+            out.append(f">>>>>>> {upstream_label}\n")
+        else:
+            out.extend(chunk)
+    return "".join(out)
+
+
+def render_rejects(result: MergeResult, path: str = "file") -> Tuple[str, str]:
+    """
+    The merged text keeping local lines at each conflict, and the rejected
+    upstream hunks as a unified diff (empty if there were no conflicts).
+    """
+    out: List[str] = []
+    rejects: List[str] = []
+    line = 1
+    for chunk in result.chunks:
+        if isinstance(chunk, Conflict):
+            rejects.append(f"@@ -{line},{len(chunk.local)} +{line},{len(chunk.upstream)} @@\n")
+            rejects.extend("-" + text for text in _terminated(chunk.local))
+            rejects.extend("+" + text for text in _terminated(chunk.upstream))
+            out.extend(chunk.local)
+            line += len(chunk.local)
+        else:
+            out.extend(chunk)
+            line += len(chunk)
+    if rejects:
+        rejects[:0] = [f"--- {path}\n", f"+++ {path} (upstream)\n"]
+    return "".join(out), "".join(rejects)
+
+
+# -- two-way diffs ---------------------------------------------------------
+
+@dataclass
+class Hunk:
+    """
+    One hunk of a unified diff: lines a[a_start:a_end] become
+    b[b_start:b_end]. ``ops`` are difflib-style opcodes (tag, i1, i2, j1, j2).
+    """
+    a_start: int
+    a_end: int
+    b_start: int
+    b_end: int
+    ops: List[Tuple[str, int, int, int, int]]
+
+    @property
+    def added(self) -> int:
+        return sum(j2 - j1 for tag, _, _, j1, j2 in self.ops if tag != "equal")
+
+    @property
+    def removed(self) -> int:
+        return sum(i2 - i1 for tag, i1, i2, _, _ in self.ops if tag != "equal")
+
+
+def opcodes(a: Sequence[str], b: Sequence[str]) -> List[Tuple[str, int, int, int, int]]:
+    """difflib-style opcodes turning ``a`` into ``b``, from matches()."""
+    codes = []
+    i = j = 0
+    for mi, mj in matches(a, b) + [(len(a), len(b))]:
+        if i < mi or j < mj:
+            tag = "replace" if i < mi and j < mj else "delete" if i < mi else "insert"
+            codes.append((tag, i, mi, j, mj))
+        if mi < len(a):
+            if codes and codes[-1][0] == "equal":
+                codes[-1] = ("equal", codes[-1][1], mi + 1, codes[-1][3], mj + 1)
+            else:
+                codes.append(("equal", mi, mi + 1, mj, mj + 1))
+        i, j = mi + 1, mj + 1
+    return codes
+
+
+def diff_hunks(a: Sequence[str], b: Sequence[str], context: int = CONTEXT) -> List[Hunk]:
+    """The hunks of a unified diff from ``a`` to ``b`` (empty if they are equal)."""
+    hunks: List[Hunk] = []
+    group: List[Tuple[str, int, int, int, int]] = []
+
+    def close():
+        if any(tag != "equal" for tag, *_ in group):
+            hunks.append(Hunk(group[0][1], group[-1][2], group[0][3], group[-1][4], list(group)))
+
+    codes = opcodes(a, b)
+    for index, (tag, i1, i2, j1, j2) in enumerate(codes):
+        if tag == "equal":
+            # Keep up to ``context`` lines on each side; a long run splits hunks
+            if index == 0:
+                i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+            if index == len(codes) - 1:
+                i2, j2 = min(i2, i1 + context), min(j2, j1 + context)
+            elif i2 - i1 > 2 * context and group:
+                group.append((tag, i1, i1 + context, j1, j1 + context))
+                close()
+                group = []
+                i1, j1 = i2 - context, j2 - context
+        if i1 < i2 or j1 < j2:
+            group.append((tag, i1, i2, j1, j2))
+    if group:
+        close()
+    return hunks
+
+
+def _range(start: int, end: int) -> str:
+    """A unified diff range: 1-based start, and the length unless it is 1."""
+    length = end - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+def unified_diff(
+    a: Sequence[str], b: Sequence[str], hunks: List[Hunk], from_label: str, to_label: str
+) -> Iterator[str]:
+    """The lines of a unified diff of ``hunks``, produced one at a time."""
+    if not hunks:
+        return
+    yield f"--- {from_label}\n"
+    yield f"+++ {to_label}\n"
+    for hunk in hunks:
+        yield f"@@ -{_range(hunk.a_start, hunk.a_end)} +{_range(hunk.b_start, hunk.b_end)} @@\n"
+        for tag, i1, i2, j1, j2 in hunk.ops:
+            if tag == "equal":
+                yield from _prefixed(" ", a, i1, i2)
+                continue
+            yield from _prefixed("-", a, i1, i2)
+            yield from _prefixed("+", b, j1, j2)
+
+
+def _prefixed(prefix: str, lines: Sequence[str], start: int, end: int) -> Iterator[str]:
+    for index in range(start, end):
+        line = lines[index]
+        if line.endswith("\n"):
+            yield prefix + line
+        else:
+            yield prefix + line + "\n\\ No newline at end of file\n"
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Template sources for arche tools.
+
+bootstrap.py and update_arche.py read the arche repository through a
+TemplateSource, so the same code runs against GitHub, a local checkout,
+an internal HTTP mirror or a sparse partial clone of any git remote:
+
+    github (default)                      api.github.com + raw.githubusercontent.com
+    /srv/arche, file:///srv/arche         local checkout or mirror directory
+    https://mirror.lan/arche              HTTP mirror laid out like raw.githubusercontent.com
+                                          (<base>/<ref>/<path>, needs modes/catalog.json)
+    git+https://host/arche.git            partial clone (--filter=blob:none) with a sparse
+    git+ssh://..., git+file:///...        checkout of only the modes/<mode> being read
+
+Every source answers the same questions: the recursive tree at a ref (in
+the shape of GitHub's git/trees API), file contents, and a revision
+string for update checks. GitHub can also list the files changed between
+two revisions in one request. Failures raise OSError (urllib's URLError is
+one), so callers handle every backend alike.
+"""
+
+import hashlib
+import io
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+from arche_cache import default_cache_dir, git_blob_sha, git_blob_sha_file, materialize
+from arche_http import get_client
+
+
+REPO_URL = "https://github.com/coreyshort/arche"
+RAW_URL = "https://raw.githubusercontent.com/coreyshort/arche"
+API_URL = "https://api.github.com/repos/coreyshort/arche"
+ARCHIVE_URL = "https://codeload.github.com/coreyshort/arche/tar.gz"
+RATE_LIMIT_URL = "https://api.github.com/rate_limit"
+
+CATALOG_PATH = "modes/catalog.json"  # Written by build_catalog.py
+CATALOG_SCHEMA = 1
+SKIP_DIRS = {"__pycache__", ".git"}
+COMPARE_FILE_LIMIT = 300  # GitHub's compare API lists at most this many changed files
+
+
+def download_url(url: str, target: Path, sha: Optional[str] = None, size: Optional[int] = None, transform=None) -> int:
+    """Stream ``url`` to ``target`` atomically (verified when sha and size are known)."""
+    def stream() -> int:
+        with get_client().get_once(url) as response:
+            return materialize(response, target, sha, size, transform)
+
+    return get_client().with_retries("GET", stream)
+
+
+def tree_from_catalog(catalog: Dict, sha: str) -> Dict:
+    """Build a git/trees-shaped listing from a modes/catalog.json payload."""
+    files: List[Dict] = []
+    for name, mode in catalog["modes"].items():
+        files.extend(mode.get("shared", []))
+        for form in mode.get("forms", {}).values():
+            files.extend(form.get("files", []))
+
+    dirs = {"modes"} | {f"modes/{name}" for name in catalog["modes"]}
+    entries = []
+    for item in files:
+        parts = item["path"].split("/")
+        dirs.update("/".join(parts[:i]) for i in range(1, len(parts)))
+        entries.append({"path": item["path"], "type": "blob", "sha": item["sha"], "size": item["size"]})
+    entries.extend({"path": path, "type": "tree", "sha": None} for path in dirs)
+    entries.sort(key=lambda entry: entry["path"])
+    return {"sha": sha, "tree": entries, "truncated": False}
+
+
+class TemplateSource:
+    """Where template files come from. Subclasses implement one backend."""
+
+    # Whether files travel over the network and are worth keeping in the
+    # local template cache (and whether --offline can stand in for them)
+    cacheable = False
+    # The --source value that recreates this source (None for GitHub);
+    # recorded in .arche-config so update_arche.py reads from the same place
+    spec: Optional[str] = None
+    # Whether revision() is the tree listing's own SHA, so a listing
+    # already fetched answers it without another request
+    revision_from_tree = True
+
+    def describe(self) -> str:
+        raise NotImplementedError
+
+    def cache_ref(self, ref: str) -> str:
+        """Key under which the template cache remembers ``ref``'s tree."""
+        return f"{self.describe()}@{ref}"
+
+    def tree(self, ref: str) -> Optional[Dict]:
+        """Recursive listing at ``ref`` (git/trees shape), or None if unavailable."""
+        raise NotImplementedError
+
+    def listdir(self, path: str, ref: str) -> List[Dict]:
+        """One directory (contents API shape); only needed when tree() is None."""
+        raise FileNotFoundError(f"{path}: no listing available from {self.describe()}")
+
+    def read(self, path: str, ref: str) -> bytes:
+        raise NotImplementedError
+
+    def fetch(self, path: str, ref: str, target: Path, sha: Optional[str] = None, size: Optional[int] = None, transform=None) -> int:
+        """Write ``path`` to ``target`` atomically (see materialize); returns bytes written."""
+        raise NotImplementedError
+
+    def revision(self, ref: str) -> Optional[str]:
+        """Short identifier of what ``ref`` currently points at."""
+        tree = self.tree(ref)
+        return tree["sha"][:7] if tree else None
+
+    def changes(self, base: str, head: str, path: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Files under ``path`` that differ between revisions ``base`` and ``head``.
+
+        Maps each path relative to ``path`` to its blob SHA at ``head``, or
+        None if it was removed. Returns None when the backend can't compare
+        two revisions; callers then diff tree listings instead.
+        """
+        return None
+
+    def check_budget(self, planned: int) -> Optional[str]:
+        """Reason a run needing ``planned`` API requests shouldn't start, if any."""
+        return None
+
+    def estimate_requests(self, files: int) -> int:
+        """Network requests needed to fetch ``files`` files (one each by default)."""
+        return files
+
+    def archive_url(self, ref: str) -> Optional[str]:
+        """Tarball of the whole tree at ``ref``, where the backend offers one."""
+        return None
+
+
+class GitHubSource(TemplateSource):
+    """The public repository on github.com (the default)."""
+
+    cacheable = True
+    revision_from_tree = False  # Commits and trees have different SHAs
+
+    def describe(self) -> str:
+        return REPO_URL
+
+    def cache_ref(self, ref: str) -> str:
+        return ref  # Plain ref names, as used by caches written before sources existed
+
+    def tree(self, ref: str) -> Optional[Dict]:
+        data = json.loads(get_client().get_conditional(f"{API_URL}/git/trees/{ref}?recursive=1"))
+        return None if data.get("truncated") else data
+
+    def listdir(self, path: str, ref: str) -> List[Dict]:
+        return json.loads(get_client().get_conditional(f"{API_URL}/contents/{path}?ref={ref}"))
+
+    def read(self, path: str, ref: str) -> bytes:
+        return get_client().get_conditional(f"{RAW_URL}/{ref}/{path}")
+
+    def fetch(self, path: str, ref: str, target: Path, sha: Optional[str] = None, size: Optional[int] = None, transform=None) -> int:
+        return download_url(f"{RAW_URL}/{ref}/{path}", target, sha, size, transform)
+
+    def revision(self, ref: str) -> Optional[str]:
+        data = json.loads(get_client().get_conditional(f"{API_URL}/commits/{ref}"))
+        return data["sha"][:7]  # Short SHA
+
+    def changes(self, base: str, head: str, path: str) -> Optional[Dict[str, Optional[str]]]:
+        # One commit per page keeps the response small; the file list comes whole on page 1
+        data = json.loads(get_client().get_conditional(f"{API_URL}/compare/{base}...{head}?per_page=1"))
+        files = data.get("files")
+        if data.get("status") not in ("ahead", "identical") or files is None or len(files) >= COMPARE_FILE_LIMIT:
+            return None  # Diverged or behind (a three-dot diff would miss reverts), or a capped list
+        prefix = path.rstrip("/") + "/"
+        changed: Dict[str, Optional[str]] = {}
+        for entry in files:
+            if entry["filename"].startswith(prefix):
+                changed[entry["filename"][len(prefix):]] = None if entry["status"] == "removed" else entry["sha"]
+            previous = entry.get("previous_filename")
+            if previous and previous.startswith(prefix):
+                changed.setdefault(previous[len(prefix):], None)  # Renamed away
+        return changed
+
+    def check_budget(self, planned: int) -> Optional[str]:
+        return get_client().check_budget(RATE_LIMIT_URL, planned=planned)
+
+    def archive_url(self, ref: str) -> Optional[str]:
+        return f"{ARCHIVE_URL}/{ref}"
+
+
+class HttpMirrorSource(TemplateSource):
+    """
+    A static HTTP mirror with the raw.githubusercontent.com layout.
+
+    Static servers can't list directories, so the tree comes from the
+    mirror's modes/catalog.json. All requests go through the shared client
+    (keep-alive, retries, conditional revalidation).
+    """
+
+    cacheable = True
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    def describe(self) -> str:
+        return self.base_url
+
+    def tree(self, ref: str) -> Optional[Dict]:
+        data = self.read(CATALOG_PATH, ref)
+        catalog = json.loads(data)
+        if catalog.get("schema") != CATALOG_SCHEMA:
+            raise OSError(f"{self.base_url}: unsupported catalog schema {catalog.get('schema')!r}")
+        tree = tree_from_catalog(catalog, git_blob_sha(data))
+        tree["tree"].append({"path": CATALOG_PATH, "type": "blob", "sha": tree["sha"], "size": len(data)})
+        return tree
+
+    def read(self, path: str, ref: str) -> bytes:
+        return get_client().get_conditional(f"{self.base_url}/{ref}/{path}")
+
+    def fetch(self, path: str, ref: str, target: Path, sha: Optional[str] = None, size: Optional[int] = None, transform=None) -> int:
+        return download_url(f"{self.base_url}/{ref}/{path}", target, sha, size, transform)
+
+
+class LocalSource(TemplateSource):
+    """
+    A checkout or mirror directory on this machine (or a mounted share).
+
+    The directory is read as-is: ``ref`` is ignored, and the tree is built
+    by hashing the files under modes/, once per run.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._tree: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def describe(self) -> str:
+        return str(self.root)
+
+    def tree(self, ref: str) -> Optional[Dict]:
+        with self._lock:
+            if self._tree is None:
+                self._tree = self._scan()
+            return self._tree
+
+    def _scan(self) -> Dict:
+        modes = self.root / "modes"
+        if not modes.is_dir():
+            raise FileNotFoundError(f"{modes}: not an arche checkout")
+
+        entries = [{"path": "modes", "type": "tree", "sha": None}]
+        for dirpath, dirnames, filenames in os.walk(modes):
+            dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS)
+            base = Path(dirpath)
+            for name in dirnames:
+                entries.append({"path": (base / name).relative_to(self.root).as_posix(), "type": "tree", "sha": None})
+            for name in sorted(filenames):
+                path = base / name
+                entries.append({
+                    "path": path.relative_to(self.root).as_posix(),
+                    "type": "blob",
+                    "sha": git_blob_sha_file(path),
+                    "size": path.stat().st_size,
+                })
+
+        listing = "".join(f"{entry['path']} {entry['sha']}\n" for entry in entries)
+        return {"sha": hashlib.sha1(listing.encode("utf-8")).hexdigest(), "tree": entries, "truncated": False}
+
+    def read(self, path: str, ref: str) -> bytes:
+        return (self.root / path).read_bytes()
+
+    def estimate_requests(self, files: int) -> int:
+        return 0
+
+    def fetch(self, path: str, ref: str, target: Path, sha: Optional[str] = None, size: Optional[int] = None, transform=None) -> int:
+        with open(self.root / path, "rb") as source:
+            return materialize(source, target, sha, size, transform)
+
+
+class GitSource(TemplateSource):
+    """
+    Any git remote, through a partial clone kept in the cache directory.
+
+    The clone is shallow and blobless (--filter=blob:none): listing a ref
+    costs only its trees. File contents are fetched on demand by widening
+    a cone-mode sparse checkout to the modes/<mode> directory being read,
+    so git fetches that directory's blobs in one batch. Tree entries give
+    sizes only for blobs fetched so far.
+    """
+
+    def __init__(self, url: str, cache_dir: Optional[Path] = None):
+        self.url = url
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        self.clone_dir = (cache_dir or default_cache_dir()) / "git" / key
+        self._commits: Dict[str, str] = {}
+        self._head: Optional[str] = None
+        self._cones: set = set()
+        self._lock = threading.RLock()
+
+    revision_from_tree = False
+
+    def describe(self) -> str:
+        return f"git+{self.url}"
+
+    def tree(self, ref: str) -> Optional[Dict]:
+        commit = self._commit(ref)
+        sizes = self._local_sizes()
+        entries = []
+        for line in self._git("ls-tree", "-r", "-t", "-z", commit).split("\0"):
+            if not line:
+                continue
+            meta, path = line.split("\t", 1)
+            _, kind, sha = meta.split()
+            entry = {"path": path, "type": kind, "sha": sha}
+            if kind == "blob" and sha in sizes:
+                entry["size"] = sizes[sha]
+            entries.append(entry)
+        return {"sha": self._git("rev-parse", f"{commit}^{{tree}}").strip(), "tree": entries, "truncated": False}
+
+    def read(self, path: str, ref: str) -> bytes:
+        with self._lock:
+            checkout = self._checkout(path, ref)
+            if checkout is not None:
+                return checkout.read_bytes()
+            return self._git_bytes("cat-file", "blob", f"{self._commit(ref)}:{path}")
+
+    def fetch(self, path: str, ref: str, target: Path, sha: Optional[str] = None, size: Optional[int] = None, transform=None) -> int:
+        with self._lock:
+            # Another thread's checkout of a different ref would replace the file mid-copy
+            checkout = self._checkout(path, ref)
+            if checkout is not None:
+                with open(checkout, "rb") as source:
+                    return materialize(source, target, sha, size, transform)
+        data = self.read(path, ref)
+        return materialize(io.BytesIO(data), target, sha, len(data) if sha else None, transform)
+
+    def revision(self, ref: str) -> Optional[str]:
+        return self._commit(ref)[:7]
+
+    def estimate_requests(self, files: int) -> int:
+        return 1 if files else 0  # The sparse checkout fetches a mode's blobs in one batch
+
+    def _commit(self, ref: str) -> str:
+        with self._lock:
+            if ref not in self._commits:
+                if not (self.clone_dir / ".git").exists():
+                    self.clone_dir.mkdir(parents=True, exist_ok=True)
+                    self._git("init", "-q")
+                    self._git("remote", "add", "origin", self.url)
+                    self._git("config", "remote.origin.promisor", "true")
+                    self._git("config", "remote.origin.partialclonefilter", "blob:none")
+                    self._git("sparse-checkout", "set", "--cone")
+                self._git("fetch", "-q", "--depth", "1", "--filter=blob:none", "origin", ref)
+                self._commits[ref] = self._git("rev-parse", "FETCH_HEAD^{commit}").strip()
+            return self._commits[ref]
+
+    def _checkout(self, path: str, ref: str) -> Optional[Path]:
+        """Working-tree copy of ``path`` at ``ref``, or None outside modes/<mode>/."""
+        parts = path.split("/")
+        if len(parts) < 3:
+            return None  # Top-level files are read straight from the object store
+        cone = "/".join(parts[:2])
+        commit = self._commit(ref)
+        if cone not in self._cones:
+            self._cones.add(cone)
+            self._git("sparse-checkout", "set", "--cone", *sorted(self._cones))
+            if self._head == commit:
+                return self.clone_dir / path
+        if self._head != commit:
+            self._git("checkout", "-q", "--detach", "--force", commit)
+            self._head = commit
+        return self.clone_dir / path
+
+    def _local_sizes(self) -> Dict[str, int]:
+        """
+        Sizes of the blobs already in the clone. ``ls-tree -l`` would fetch
+        every other blob from the remote, one request each, to size it.
+        """
+        sizes = {}
+        listing = self._git("cat-file", "--batch-all-objects", "--batch-check=%(objectname) %(objecttype) %(objectsize)")
+        for line in listing.splitlines():
+            sha, kind, size = line.split()
+            if kind == "blob":
+                sizes[sha] = int(size)
+        return sizes
+
+    def _git(self, *args: str) -> str:
+        return self._git_bytes(*args).decode("utf-8")
+
+    def _git_bytes(self, *args: str) -> bytes:
+        try:
+            result = subprocess.run(
+                # Checked-out files must hold their blobs byte for byte, or verification fails
+                ["git", "-c", "core.autocrlf=false", "-C", str(self.clone_dir), *args],
+                capture_output=True,
+                env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+            )
+        except FileNotFoundError:
+            raise OSError("git is not installed (needed for git+ sources)")
+        if result.returncode != 0:
+            message = result.stderr.decode("utf-8", "replace").strip().splitlines()
+            raise OSError(f"git {args[0]} failed: {message[-1] if message else result.returncode}")
+        return result.stdout
+
+
+def open_source(spec: Optional[str] = None, cache_dir: Optional[Path] = None) -> TemplateSource:
+    """
+    Create the source described by ``spec`` (see the module docstring).
+
+    None or "github" is the public GitHub repository; ``cache_dir`` is where
+    git sources keep their partial clones.
+    """
+    if not spec or spec == "github":
+        return GitHubSource()
+    if spec.startswith("git+"):
+        source = GitSource(spec[len("git+"):], cache_dir)
+    elif spec.startswith("file://"):
+        source = LocalSource(Path(unquote(urlparse(spec).path)))
+    elif spec.startswith(("http://", "https://")):
+        source = HttpMirrorSource(spec)
+    else:
+        # Relative paths are recorded absolute so later runs elsewhere still resolve
+        source = LocalSource(Path(spec).expanduser().resolve())
+        spec = str(source.root)
+    source.spec = spec
+    return source
+
+
+_source: Optional[TemplateSource] = None
+
+
+def get_source() -> TemplateSource:
+    """Return the source configured for this run (GitHub unless configured)."""
+    global _source
+    if _source is None:
+        _source = GitHubSource()
+    return _source
+
+
+def configure(spec: Optional[str] = None, cache_dir: Optional[Path] = None) -> TemplateSource:
+    """Select the source every fetch in this process reads from."""
+    global _source
+    _source = open_source(spec, cache_dir)
+    return _source
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Phase timing and counters for arche tools.
+
+bootstrap.py and update_arche.py wrap each phase of a run (tree listing,
+file fetches, hashing, disk and config writes, HTTP requests) in a span.
+Spans cost one attribute check while tracing is off; with --profile or
+--trace-json the tracer records every span and can:
+
+- print a one-line summary of time per phase plus request, byte, retry
+  and cache counters
+- export a Chrome trace-event file (open it in chrome://tracing or
+  https://ui.perfetto.dev) with one row per worker thread
+
+Phase times are summed over all spans of that name, so phases that run in
+parallel (file fetches) can add up to more than the wall time.
+
+Usage:
+    from arche_trace import tracer
+
+    with tracer.span("fetch", path=path):
+        ...
+    tracer.count("files_written")
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class Tracer:
+    """Records spans and counters for one run once enabled."""
+
+    def __init__(self):
+        self.enabled = False
+        self.events: List[Dict] = []
+        self.counters: Counter = Counter()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._disabled = nullcontext()
+
+    def enable(self):
+        """Start recording; timestamps are relative to this call."""
+        self.enabled = True
+        self._origin = time.perf_counter()
+
+    def span(self, name: str, **args):
+        """Context manager timing one phase; ``args`` are attached to the trace event."""
+        if not self.enabled:
+            return self._disabled
+        return self._span(name, args)
+
+    @contextmanager
+    def _span(self, name: str, args: Dict):
+        start = time.perf_counter()
+        try:
+            yield args  # Callers may add results (status, bytes) while the span is open
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = {key: value for key, value in args.items() if value is not None}
+            with self._lock:
+                self.events.append(event)
+
+    def count(self, name: str, amount: int = 1):
+        """Add to a named counter (no-op unless enabled)."""
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += amount
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def phase_totals(self) -> Dict[str, Dict]:
+        """Seconds and span count per span name, in order of first start."""
+        totals: Dict[str, Dict] = {}
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        for event in events:
+            entry = totals.setdefault(event["name"], {"seconds": 0.0, "count": 0})
+            entry["seconds"] += event["dur"] / 1e6
+            entry["count"] += 1
+        return totals
+
+    def summary(self, counters: Optional[Dict[str, int]] = None) -> str:
+        """One line: wall time, time per phase and counters (``counters`` are merged in)."""
+        merged = Counter(self.counters)
+        merged.update(counters or {})
+        parts = [f"{self.elapsed():.2f}s total"]
+        for name, entry in self.phase_totals().items():
+            suffix = f" ×{entry['count']}" if entry["count"] > 1 else ""
+            parts.append(f"{name} {entry['seconds']:.2f}s{suffix}")
+        for name, value in merged.items():
+            if name.startswith("bytes"):
+                parts.append(f"{name.replace('_', ' ')} {value / 1024:.1f} KB")
+            else:
+                parts.append(f"{name.replace('_', ' ')} {value}")
+        return " · ".join(parts)
+
+    def chrome_trace(self, counters: Optional[Dict[str, int]] = None, metadata: Optional[Dict] = None) -> Dict:
+        """The recorded spans in Chrome trace-event format, with final counter values."""
+        merged = Counter(self.counters)
+        merged.update(counters or {})
+        pid = os.getpid()
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        threads = {}
+        for event in events:
+            threads.setdefault(event["tid"], len(threads))
+        # Name threads in order of first activity: main, then workers
+        for tid, number in threads.items():
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": "main" if number == 0 else f"worker-{number}"},
+            })
+        if merged:
+            events.append({
+                "name": "counters", "ph": "C", "ts": self.elapsed() * 1e6, "pid": pid,
+                "args": dict(merged),
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": metadata or {}}
+
+    def write(self, path: Path, counters: Optional[Dict[str, int]] = None, metadata: Optional[Dict] = None):
+        Path(path).write_text(json.dumps(self.chrome_trace(counters, metadata)))
+
+    def report(
+        self,
+        profile: bool = False,
+        trace_path: Optional[Path] = None,
+        counters: Optional[Dict[str, int]] = None,
+        metadata: Optional[Dict] = None
+    ):
+        """Print the --profile summary line (to stderr) and/or write the --trace-json file."""
+        if profile:
+            print(f"\n⏱  {self.summary(counters)}", file=sys.stderr)
+        if trace_path:
+            try:
+                self.write(trace_path, counters, metadata)
+            except OSError as e:
+                print(f"⚠ Unable to write trace {trace_path}: {e}", file=sys.stderr)
+
+
+tracer = Tracer()
@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+"""
+Arche Benchmarks - Reproducible timings for arche tools
+
+Runs bootstrap.py, update_arche.py and arche_compat_check.py as separate
+processes against a local fake GitHub (see fake_github.py), so results
+don't depend on the network or on GitHub's rate limits. Every scenario is
+run at several tree sizes:
+
+    repo    this checkout, bootstrapping 3-layer/library
+    N       a generated mode whose form has N files (nested directories,
+            mixed sizes), plus the framework files update_arche.py reads
+
+For each run the harness records wall time, the requests the server saw
+(total and per endpoint) and the process's peak RSS. Results are written
+as a JSON baseline; ``compare`` diffs two baselines and exits 1 on
+regressions, so a change can be checked against the version before it.
+
+The server can add latency, fail a fraction of requests with 503 and
+enforce an API rate limit, to see how the tools behave on slow or flaky
+connections. These settings are stored with the results.
+
+Usage:
+    python benchmark.py run                                  # All scenarios → benchmark-results.json
+    python benchmark.py run --sizes 10,100 --repeat 5 --latency 0.05 --output before.json
+    python benchmark.py run --scenarios bootstrap,update-check --error-rate 0.1
+    python benchmark.py compare before.json after.json       # Exit 1 on regressions
+    python benchmark.py retries                              # Exit 1 if a failing URL isn't tried exactly retries+1 times
+    python benchmark.py plan                                 # Exit 1 if --plan right after a bootstrap would write anything
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import urllib.error
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import arche_http
+from build_catalog import build_catalog, render
+from fake_github import FakeGitHub
+from arche_source import CATALOG_PATH, download_url
+
+
+TOOLS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = TOOLS_DIR.parent
+RESULTS_SCHEMA = 1
+DEFAULT_SIZES = "repo,10,100,1000"
+DEFAULT_REPEAT = 3
+DEFAULT_TIMEOUT = 300.0
+DEFAULT_THRESHOLD = 0.10  # Relative slowdown counted as a regression
+MIN_DELTA = 0.02  # Seconds; smaller wall-time differences are noise
+
+BENCH_MODE = "bench"
+BENCH_FORM = "bench"
+FRAMEWORK_FILES = ["agents.md", "INSTRUCTIONS.md", "init_env.md"]
+RELEASE_REVISION = "fedcba9876543210fedcba9876543210fedcba98"  # Published by the update scenarios
+
+# Runs a tool with arche_source's GitHub URLs pointed at the fake server.
+# Linux carries the RSS high-water mark across exec, so the child's own
+# VmHWM is reported instead of trusting wait4 (which would include the
+# harness's memory from before the fork)
+SHIM = textwrap.dedent("""
+    import atexit, json, os, runpy, sys
+
+    def report_peak():
+        try:
+            with open("/proc/self/status") as status, open(os.environ["ARCHE_BENCH_RSS"], "w") as out:
+                out.write(next(line.split()[1] for line in status if line.startswith("VmHWM:")))
+        except (OSError, StopIteration):
+            pass
+
+    atexit.register(report_peak)
+    tool = sys.argv[1]
+    sys.path.insert(0, os.path.dirname(tool))
+    import arche_source
+    for name, value in json.loads(os.environ["ARCHE_BENCH_URLS"]).items():
+        setattr(arche_source, name, value)
+    sys.argv = sys.argv[1:]
+    runpy.run_path(tool, run_name="__main__")
+""")
+
+
+# -- trees -----------------------------------------------------------------
+
+def generate_tree(root: Path, files: int, seed: int = 0):
+    """
+    Write a synthetic arche tree with one mode and one form of ``files`` files.
+
+    Contents are pseudo-random text (0.5-16 KB) from a fixed seed, so every
+    run and every machine serves identical bytes.
+    """
+    rng = random.Random(seed)
+    mode = root / "modes" / BENCH_MODE
+    form = mode / "forms" / BENCH_FORM
+    words = ["arche", "agent", "layer", "directive", "package_name", "tool", "loop", "state", "output", "plan"]
+
+    def text(size: int) -> str:
+        lines = []
+        while sum(len(line) + 1 for line in lines) < size:
+            lines.append(" ".join(rng.choice(words) for _ in range(rng.randint(4, 12))))
+        return "\n".join(lines) + "\n"
+
+    for name in FRAMEWORK_FILES:
+        (mode / "_shared").mkdir(parents=True, exist_ok=True)
+        (mode / "_shared" / name).write_text(f"# {name}\n\n" + text(rng.randint(2048, 8192)))
+
+    form.mkdir(parents=True, exist_ok=True)
+    (form / "project.json").write_text(json.dumps({
+        "name": "Benchmark",
+        "description": f"Generated form with {files} files",
+        "directories": ["data", "logs"],
+        "languages": ["python"],
+    }, indent=2))
+    for number in range(max(0, files - len(FRAMEWORK_FILES))):
+        path = form / f"pkg{number % 10}" / f"sub{number % 3}" / f"file{number}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text(rng.randint(512, 16384)))
+
+    (root / CATALOG_PATH).write_text(render(build_catalog(root)))
+
+
+@dataclass
+class Tree:
+    """One tree size: what the server serves and which mode/form to bootstrap."""
+    label: str
+    root: Path
+    mode: str
+    form: str
+    compat_modes: int
+
+
+def prepare_tree(label: str, work: Path) -> Tree:
+    if label == "repo":
+        return Tree(label, REPO_ROOT, "3-layer", "library", 5)
+    files = int(label)
+    root = work / f"tree-{files}"
+    generate_tree(root, files)
+    return Tree(label, root, BENCH_MODE, BENCH_FORM, max(2, round(math.sqrt(files))))
+
+
+# -- running tools ---------------------------------------------------------
+
+@dataclass
+class RunResult:
+    exit_code: int
+    wall: float
+    peak_rss_kb: int
+    requests: int
+    by_endpoint: Dict[str, int]
+
+
+class Runner:
+    """Runs tool processes against one fake server, measuring each."""
+
+    def __init__(self, fake: Optional[FakeGitHub], timeout: float = DEFAULT_TIMEOUT, verbose: bool = False):
+        self.fake = fake
+        self.timeout = timeout
+        self.verbose = verbose
+
+    def env(self, run_dir: Path) -> Dict[str, str]:
+        env = {
+            key: value for key, value in os.environ.items()
+            if not key.lower().endswith("_proxy") and key != "GITHUB_TOKEN"
+        }
+        # Keep the user's cache and ~/.arche-config out of the measurements
+        env["HOME"] = str(run_dir / "home")
+        env["XDG_CACHE_HOME"] = str(run_dir / "xdg-cache")
+        env["ARCHE_BENCH_URLS"] = json.dumps(self.fake.urls() if self.fake else {})
+        env["ARCHE_BENCH_RSS"] = str(run_dir / "peak-rss")
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+        return env
+
+    def run(self, tool: str, args: List[str], cwd: Path, run_dir: Path) -> RunResult:
+        """Run ``tool`` with ``args`` in ``cwd`` and measure it."""
+        cwd.mkdir(parents=True, exist_ok=True)
+        (run_dir / "home").mkdir(parents=True, exist_ok=True)
+        if self.fake is not None:
+            self.fake.reset()
+        output = None if self.verbose else subprocess.DEVNULL
+        command = [sys.executable, "-c", SHIM, str(TOOLS_DIR / tool), *args]
+        peak_file = run_dir / "peak-rss"
+        peak_file.unlink(missing_ok=True)  # Left by a setup run
+
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=cwd, env=self.env(run_dir), stdout=output, stderr=output)
+        timer = threading.Timer(self.timeout, process.kill)
+        timer.start()
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+        finally:
+            timer.cancel()
+        wall = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        try:
+            peak = int(peak_file.read_text())
+        except (OSError, ValueError):
+            # No /proc (macOS): the child's rusage, in bytes there
+            peak = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        by_endpoint = dict(self.fake.requests) if self.fake is not None else {}
+        return RunResult(process.returncode, wall, peak, sum(by_endpoint.values()), by_endpoint)
+
+
+# -- scenarios -------------------------------------------------------------
+
+def _bootstrap_args(tree: Tree, target: Path, cache: Path, *extra: str) -> List[str]:
+    return ["--mode", tree.mode, "--form", tree.form, "--target", str(target),
+            "--cache-dir", str(cache), "--no-telemetry", *extra]
+
+
+def _bootstrapped(runner: Runner, tree: Tree, run_dir: Path) -> Path:
+    """Set up a freshly bootstrapped project (not measured)."""
+    project = run_dir / "project"
+    result = runner.run("bootstrap.py", _bootstrap_args(tree, project, run_dir / "cache"), run_dir, run_dir)
+    if result.exit_code != 0:
+        raise RuntimeError(f"setup bootstrap failed (exit {result.exit_code})")
+    return project
+
+
+@contextmanager
+def _released(runner: Runner, tree: Tree) -> Iterator[None]:
+    """
+    Serve a new upstream revision that changes every framework file (not
+    measured), then go back to the original one.
+    
+    The change is at the top of each file, so it merges cleanly with edits
+    appended at the bottom.
+    """
+    fake = runner.fake
+    if fake is None:
+        yield
+        return
+    base = fake.revision
+    shared = f"modes/{tree.mode}/_shared"
+    changes = {
+        f"{shared}/{name}": b"Released upstream.\n\n" + fake.files[f"{shared}/{name}"]
+        for name in FRAMEWORK_FILES if f"{shared}/{name}" in fake.files
+    }
+    fake.load(revision=RELEASE_REVISION, changes=changes)
+    try:
+        yield
+    finally:
+        fake.load(revision=base)
+
+
+def scenario_bootstrap(runner: Runner, tree: Tree, run_dir: Path) -> RunResult:
+    """Cold bootstrap: empty target and template cache, api transport."""
+    return runner.run("bootstrap.py", _bootstrap_args(tree, run_dir / "project", run_dir / "cache"), run_dir, run_dir)
+
+
+def scenario_bootstrap_archive(runner: Runner, tree: Tree, run_dir: Path) -> RunResult:
+    """Cold bootstrap streaming one tarball (--transport archive)."""
+    args = _bootstrap_args(tree, run_dir / "project", run_dir / "cache", "--transport", "archive")
+    return runner.run("bootstrap.py", args, run_dir, run_dir)
+
+
+def scenario_bootstrap_warm(runner: Runner, tree: Tree, run_dir: Path) -> RunResult:
+    """Bootstrap into an empty target with every file already in the template cache."""
+    _bootstrapped(runner, tree, run_dir)
+    args = _bootstrap_args(tree, run_dir / "second", run_dir / "cache")
+    return runner.run("bootstrap.py", args, run_dir, run_dir)
+
+
+def scenario_bootstrap_rerun(runner: Runner, tree: Tree, run_dir: Path) -> RunResult:
+    """Re-run a completed bootstrap into the same target (nothing to write)."""
+    project = _bootstrapped(runner, tree, run_dir)
+    return runner.run("bootstrap.py", _bootstrap_args(tree, project, run_dir / "cache"), run_dir, run_dir)
+
+
+def scenario_update_check(runner: Runner, tree: Tree, run_dir: Path) -> RunResult:
+    """update_arche.py --check in a bootstrapped project, after a release changed its framework files."""
+    project = _bootstrapped(runner, tree, run_dir)
+    with _released(runner, tree):
+        return runner.run("update_arche.py", ["--check"], project, run_dir)
+
+
+def scenario_update_apply(runner: Runner, tree: Tree, run_dir: Path) -> RunResult:
+    """update_arche.py --apply of a release, with every framework file also modified locally."""
+    project = _bootstrapped(runner, tree, run_dir)
+    for name in FRAMEWORK_FILES:
+        path = project / name
+        if path.exists():
+            path.write_text(path.read_text() + "\nlocal edit\n")
+    with _released(runner, tree):
+        return runner.run("update_arche.py", ["--apply"], project, run_dir)
+
+
+def scenario_compat(runner: Runner, tree: Tree, run_dir: Path) -> RunResult:
+    """arche_compat_check.py over a mode list that grows with the tree size."""
+    known = ["3-layer", "rl-loop", "agentic-swarm", "event-driven"]  # Foundry may only appear once
+    modes = [known[number % len(known)] for number in range(tree.compat_modes)]
+    return runner.run("arche_compat_check.py", ["--modes", *modes], run_dir, run_dir)
+
+
+SCENARIOS: Dict[str, Callable[[Runner, Tree, Path], RunResult]] = {
+    "bootstrap": scenario_bootstrap,
+    "bootstrap-archive": scenario_bootstrap_archive,
+    "bootstrap-warm": scenario_bootstrap_warm,
+    "bootstrap-rerun": scenario_bootstrap_rerun,
+    "update-check": scenario_update_check,
+    "update-apply": scenario_update_apply,
+    "compat": scenario_compat,
+}
+
+
+# -- commands --------------------------------------------------------------
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(scenario: str, size: str, runs: List[RunResult]) -> Dict:
+    walls = [run.wall for run in runs]
+    return {
+        "scenario": scenario,
+        "size": size,
+        "wall_median": round(statistics.median(walls), 4),
+        "wall_min": round(min(walls), 4),
+        "wall_max": round(max(walls), 4),
+        "requests": runs[-1].requests,
+        "requests_by_endpoint": runs[-1].by_endpoint,
+        "peak_rss_kb": max(run.peak_rss_kb for run in runs),
+        "exit_codes": sorted({run.exit_code for run in runs}),
+        "runs": [
+            {"wall": round(run.wall, 4), "requests": run.requests, "peak_rss_kb": run.peak_rss_kb, "exit_code": run.exit_code}
+            for run in runs
+        ],
+    }
+
+
+def command_run(args: argparse.Namespace) -> int:
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    scenarios = [name.strip() for name in args.scenarios.split(",")] if args.scenarios else list(SCENARIOS)
+    for name in scenarios:
+        if name not in SCENARIOS:
+            raise SystemExit(f"✗ Unknown scenario '{name}' (choose from: {', '.join(SCENARIOS)})")
+    for size in sizes:
+        if size != "repo" and not size.isdigit():
+            raise SystemExit(f"✗ Invalid size '{size}' (use 'repo' or a file count)")
+
+    results = []
+    work = Path(tempfile.mkdtemp(prefix="arche-bench-"))
+    print(f"📏 Benchmarking {', '.join(scenarios)} at sizes {', '.join(sizes)} ({args.repeat} run(s) each)")
+    print(f"   Server: latency {args.latency:g}s, error rate {args.error_rate:g}, "
+          f"rate limit {args.rate_limit if args.rate_limit is not None else 'none'}\n")
+    print(f"   {'scenario':<20} {'size':>6} {'median':>9} {'requests':>9} {'peak RSS':>10}  exit")
+    try:
+        for size in sizes:
+            tree = prepare_tree(size, work)
+            fake = FakeGitHub(tree.root, latency=args.latency, jitter=args.jitter,
+                              error_rate=args.error_rate, rate_limit=args.rate_limit, seed=args.seed)
+            with fake:
+                runner = Runner(fake, args.timeout, args.verbose)
+                for scenario in scenarios:
+                    runs = []
+                    for number in range(args.repeat):
+                        run_dir = work / f"{scenario}-{size}-{number}"
+                        try:
+                            runs.append(SCENARIOS[scenario](runner, tree, run_dir))
+                        except RuntimeError as e:
+                            print(f"   {scenario:<20} {size:>6}  ✗ {e}")
+                            break
+                        finally:
+                            shutil.rmtree(run_dir, ignore_errors=True)
+                    if not runs:
+                        continue
+                    result = summarize(scenario, size, runs)
+                    results.append(result)
+                    print(f"   {scenario:<20} {size:>6} {result['wall_median']:>8.3f}s {result['requests']:>9} "
+                          f"{result['peak_rss_kb'] / 1024:>7.1f} MB  {','.join(map(str, result['exit_codes']))}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    baseline = {
+        "schema": RESULTS_SCHEMA,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "sizes": sizes, "repeat": args.repeat, "latency": args.latency, "jitter": args.jitter,
+            "error_rate": args.error_rate, "rate_limit": args.rate_limit, "seed": args.seed,
+        },
+        "results": results,
+    }
+    args.output.write_text(json.dumps(baseline, indent=2) + "\n")
+    print(f"\n✓ Wrote {args.output}")
+    return 0
+
+
+def compare(before: Dict, after: Dict, threshold: float = DEFAULT_THRESHOLD) -> Tuple[List[str], List[str]]:
+    """Compare two baselines: (report lines, regressions)."""
+    lines = []
+    regressions = []
+    previous = {(result["scenario"], result["size"]): result for result in before["results"]}
+    lines.append(f"   {'scenario':<20} {'size':>6} {'before':>9} {'after':>9} {'change':>8} {'requests':>11} {'peak RSS (MB)':>15}")
+    for result in after["results"]:
+        key = (result["scenario"], result["size"])
+        old = previous.get(key)
+        if old is None:
+            lines.append(f"   {key[0]:<20} {key[1]:>6} {'—':>9} {result['wall_median']:>8.3f}s {'new':>8}")
+            continue
+        change = (result["wall_median"] - old["wall_median"]) / old["wall_median"] if old["wall_median"] else 0.0
+        slower = change > threshold and result["wall_median"] - old["wall_median"] > MIN_DELTA
+        more_requests = result["requests"] > old["requests"]
+        more_memory = result["peak_rss_kb"] > old["peak_rss_kb"] * (1 + threshold)
+        marks = "".join(mark for mark, on in (("⏱", slower), ("🌐", more_requests), ("💾", more_memory)) if on)
+        lines.append(
+            f"   {key[0]:<20} {key[1]:>6} {old['wall_median']:>8.3f}s {result['wall_median']:>8.3f}s {change:>+8.0%} "
+            f"{old['requests']:>5} → {result['requests']:<4} {old['peak_rss_kb'] / 1024:>6.1f} → "
+            f"{result['peak_rss_kb'] / 1024:<6.1f} {marks}"
+        )
+        if slower:
+            regressions.append(f"{key[0]} @ {key[1]}: {change:+.0%} wall time")
+        if more_requests:
+            regressions.append(f"{key[0]} @ {key[1]}: {old['requests']} → {result['requests']} requests")
+        if more_memory:
+            regressions.append(f"{key[0]} @ {key[1]}: peak RSS {old['peak_rss_kb']} → {result['peak_rss_kb']} KB")
+    return lines, regressions
+
+
+def command_compare(args: argparse.Namespace) -> int:
+    try:
+        before = json.loads(args.before.read_text())
+        after = json.loads(args.after.read_text())
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"✗ Unable to read baseline: {e}")
+    for data, path in ((before, args.before), (after, args.after)):
+        if data.get("schema") != RESULTS_SCHEMA:
+            raise SystemExit(f"✗ {path} is not a benchmark baseline (schema {RESULTS_SCHEMA})")
+
+    print(f"📊 {args.before} ({before.get('revision') or '?'}) → {args.after} ({after.get('revision') or '?'})")
+    settings = ("latency", "jitter", "error_rate", "rate_limit", "seed")
+    if any(before["config"].get(key) != after["config"].get(key) for key in settings):
+        print("⚠️  Server settings differ between the baselines; timings aren't directly comparable")
+    if before.get("platform") != after.get("platform"):
+        print(f"⚠️  Recorded on different platforms ({before.get('platform')} vs {after.get('platform')})")
+    print()
+
+    lines, regressions = compare(before, after, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s):")
+        for regression in regressions:
+            print(f"   • {regression}")
+        return 1
+    print("\n✓ No regressions")
+    return 0
+
+
+def command_retries(args: argparse.Namespace) -> int:
+    """
+    Count the attempts each download path makes for a URL that always
+    fails with 503: retries are meant to happen in one layer only, so each
+    should try exactly ``--retries`` + 1 times.
+    """
+    work = Path(tempfile.mkdtemp(prefix="arche-bench-"))
+    arche_http.BACKOFF_BASE = 0.001  # Only the attempt count matters here
+    try:
+        (work / "tree").mkdir()
+        (work / "tree" / "file.md").write_text("contents\n")
+        with FakeGitHub(work / "tree", error_rate=1.0) as fake:
+            client = arche_http.configure(retries=args.retries, validator_dir=work / "http")
+            url = f"{fake.urls()['RAW_URL']}/main/file.md"
+            paths = {
+                "get": lambda: client.get(url).close(),
+                "get_bytes": lambda: client.get_bytes(url),
+                "get_conditional": lambda: client.get_conditional(url),
+                "download_url": lambda: download_url(url, work / "download.md"),
+            }
+            expected = args.retries + 1
+            print(f"🔁 Attempts per call against a server that always answers 503 (--retries {args.retries})\n")
+            failures = []
+            for name, call in paths.items():
+                fake.reset()
+                try:
+                    call()
+                except urllib.error.URLError:
+                    pass
+                attempts = fake.total_requests()
+                print(f"   {'✓' if attempts == expected else '✗'} {name:<16} {attempts} attempt(s)")
+                if attempts != expected:
+                    failures.append(name)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    if failures:
+        print(f"\n✗ Expected {expected} attempt(s) from: {', '.join(failures)}")
+        return 1
+    print(f"\n✓ Every path tries {expected} time(s)")
+    return 0
+
+
+def command_plan(args: argparse.Namespace) -> int:
+    """
+    Bootstrap with each transport, then ask ``--plan`` about the same
+    target: nothing may be reported as overwritten (exit 3) or fail.
+    """
+    work = Path(tempfile.mkdtemp(prefix="arche-bench-"))
+    try:
+        tree = prepare_tree(args.size, work)
+        with FakeGitHub(tree.root) as fake:
+            runner = Runner(fake, args.timeout, args.verbose)
+            print(f"📋 --plan right after a bootstrap ({tree.mode}/{tree.form}, size {args.size})\n")
+            failures = []
+            for transport in ("api", "archive"):
+                run_dir = work / transport
+                extra = ("--transport", transport)
+                project = run_dir / "project"
+                setup = runner.run("bootstrap.py", _bootstrap_args(tree, project, run_dir / "cache", *extra), run_dir, run_dir)
+                plan = runner.run("bootstrap.py", _bootstrap_args(tree, project, run_dir / "cache", *extra, "--plan"), run_dir, run_dir)
+                ok = setup.exit_code == 0 and plan.exit_code == 0
+                print(f"   {'✓' if ok else '✗'} {transport:<8} bootstrap exit {setup.exit_code}, plan exit {plan.exit_code}")
+                if not ok:
+                    failures.append(transport)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    if failures:
+        print(f"\n✗ A plan after bootstrapping reports changes with: {', '.join(failures)} (exit 3: overwrites)")
+        return 1
+    print("\n✓ Every plan after a bootstrap is a no-op")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark arche tools against a local fake GitHub")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks and write a JSON baseline")
+    run.add_argument("--sizes", default=DEFAULT_SIZES,
+                     help=f"Comma-separated tree sizes: 'repo' or a file count (default: {DEFAULT_SIZES})")
+    run.add_argument("--scenarios", help=f"Comma-separated scenarios (default: all of {', '.join(SCENARIOS)})")
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help=f"Runs per scenario and size (default: {DEFAULT_REPEAT})")
+    run.add_argument("--latency", type=float, default=0.0, metavar="SECONDS", help="Delay the server adds to every request")
+    run.add_argument("--jitter", type=float, default=0.0, metavar="SECONDS", help="Extra random delay per request, up to this much")
+    run.add_argument("--error-rate", type=float, default=0.0, metavar="FRACTION", help="Fraction of requests answered with 503")
+    run.add_argument("--rate-limit", type=int, metavar="N", help="API requests allowed per run before 403 rate-limit responses")
+    run.add_argument("--seed", type=int, default=0, help="Seed for injected errors and jitter (default: 0)")
+    run.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, metavar="SECONDS",
+                     help=f"Kill a run after this long (default: {DEFAULT_TIMEOUT:g})")
+    run.add_argument("--output", type=Path, default=Path("benchmark-results.json"),
+                     help="Where to write the results (default: benchmark-results.json)")
+    run.add_argument("-v", "--verbose", action="store_true", help="Show the tools' output")
+
+    diff = commands.add_parser("compare", help="Compare two baselines; exit 1 on regressions")
+    diff.add_argument("before", type=Path)
+    diff.add_argument("after", type=Path)
+    diff.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                      help=f"Relative slowdown or memory growth counted as a regression (default: {DEFAULT_THRESHOLD:g})")
+
+    retries = commands.add_parser("retries", help="Check each download path retries a failing URL exactly once per retry")
+    retries.add_argument("--retries", type=int, default=arche_http.DEFAULT_RETRIES,
+                         help=f"Retries to configure (default: {arche_http.DEFAULT_RETRIES})")
+
+    plan = commands.add_parser("plan", help="Check --plan right after a bootstrap reports no overwrites")
+    plan.add_argument("--size", default="repo", help="Tree size: 'repo' or a file count (default: repo)")
+    plan.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, metavar="SECONDS",
+                      help=f"Kill a run after this long (default: {DEFAULT_TIMEOUT:g})")
+    plan.add_argument("-v", "--verbose", action="store_true", help="Show the tools' output")
+
+    args = parser.parse_args()
+    commands = {"run": command_run, "compare": command_compare, "retries": command_retries, "plan": command_plan}
+    return commands[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,90 +20,793 @@ Usage:
 
 Requirements:
     - Python 3.10+
-    - Internet connection (to fetch from GitHub)
-    - Git (optional, for sparse checkout method)
+    - Internet connection (to fetch from GitHub), or a local/mirror --source
+    - Git (optional, for git+ sources: partial clone with sparse checkout)
 """
 
 import argparse
+import io
 import json
+import os
+import re
 import sys
-import urllib.request
 import urllib.error
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import shutil
+import tarfile
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from collections import Counter
+from dataclasses import asdict, dataclass, field, fields
 from datetime import datetime
 
+try:
+    import arche_http
+except ModuleNotFoundError as e:
+    if e.name != "arche_http":
+        raise
+    # Downloaded on its own: the arche_*.py modules it imports live next to it
+    sys.exit(
+        "✗ bootstrap.py needs the arche_*.py modules from the same folder. Download the whole folder:\n"
+        "   curl -fsSL https://codeload.github.com/coreyshort/arche/tar.gz/main | tar -xz --strip-components=1 arche-main/arche-tools\n"
+        "   python arche-tools/bootstrap.py --help"
+    )
+import arche_source
+from arche_backup import BackupStore
+from arche_cache import (
+    DEFAULT_CACHE_MB,
+    IntegrityError,
+    TemplateCache,
+    default_cache_dir,
+    git_blob_sha,
+    git_blob_sha_file,
+    materialize,
+)
+from arche_http import describe_error, get_client
+from arche_lock import LOCK_FILE, ProjectLock
+from arche_source import CATALOG_PATH, CATALOG_SCHEMA, REPO_URL, download_url, get_source
+from arche_trace import tracer
 
-REPO_URL = "https://github.com/coreyshort/arche"
-RAW_URL = "https://raw.githubusercontent.com/coreyshort/arche"
-API_URL = "https://api.github.com/repos/coreyshort/arche/contents"
 
+TRANSPORTS = ["api", "archive"]
+LINK_MODES = ["copy", "hardlink", "reflink"]
+DEFAULT_JOBS = 8
+JOURNAL_FILE = ".arche-bootstrap.json"
 
-def fetch_file(url: str, target: Path) -> bool:
-    """Fetch a single file from GitHub."""
-    try:
-        with urllib.request.urlopen(url) as response:
-            target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_bytes(response.read())
+
+@dataclass
+class FetchResult:
+    """Outcome of a template fetch: files written and per-path failures."""
+    copied: List[str] = field(default_factory=list)
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+    cached: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    # Local path (relative to the target) → (template path, blob SHA) of every file in place
+    installed: Dict[str, Tuple[str, Optional[str]]] = field(default_factory=dict)
+    # Short SHA of the commit the files came from, where the transport says (archives)
+    revision: Optional[str] = None
+
+    def merge(self, other: "FetchResult") -> "FetchResult":
+        self.copied.extend(other.copied)
+        self.failed.extend(other.failed)
+        self.cached.extend(other.cached)
+        self.unchanged.extend(other.unchanged)
+        self.installed.update(other.installed)
+        self.revision = self.revision or other.revision
+        return self
+
+
+class TemplateVariables:
+    """
+    Project variables substituted into template paths and file contents.
+    
+    Templates use placeholder identifiers such as ``package_name`` (import
+    name, ``src/package_name/``) and ``package-name`` (distribution name).
+    Only whole identifiers are replaced, so ``package_names`` is left alone.
+    """
+    
+    def __init__(self, values: Dict[str, str]):
+        self.values = values
+        names = sorted(values, key=len, reverse=True)
+        self._pattern = re.compile(
+            rb"(?<![A-Za-z0-9_])(" + b"|".join(re.escape(name.encode("utf-8")) for name in names) + rb")(?![A-Za-z0-9_])"
+        )
+        self._replacements = {name.encode("utf-8"): value.encode("utf-8") for name, value in values.items()}
+        self._path_pattern = re.compile(self._pattern.pattern.decode("utf-8"))
+        self.longest = max(len(name.encode("utf-8")) for name in names)
+    
+    @classmethod
+    def for_project(cls, project_name: Optional[str]) -> Optional["TemplateVariables"]:
+        """Variables derived from a project name, or None if there's nothing to render."""
+        words = re.findall(r"[A-Za-z0-9]+", project_name or "")
+        if not words:
+            return None
+        snake = "_".join(words).lower()
+        if snake[0].isdigit():
+            snake = f"_{snake}"  # Keep it a valid Python identifier
+        return cls({"package_name": snake, "package-name": "-".join(words).lower()})
+    
+    def render_path(self, relative: str) -> str:
+        return self._path_pattern.sub(lambda m: self.values[m.group(1)], relative)
+    
+    def applies_to(self, data: bytes) -> bool:
+        """Whether rendering would change ``data`` (binary data never changes)."""
+        return b"\0" not in data[:_StreamRenderer.BINARY_SNIFF] and self._pattern.search(data) is not None
+    
+    def renderer(self) -> "_StreamRenderer":
+        """A fresh materialize() transform for one file."""
+        return _StreamRenderer(self)
+    
+    def _substitute(self, data: bytes, start: int, stop: int) -> Tuple[bytes, int]:
+        """
+        Render matches in ``data[start:stop]``, reading ``data`` around it for
+        context. Returns the output and where unconsumed input begins; a match
+        running past ``stop`` stays unconsumed for the next chunk.
+        """
+        out = []
+        pos = start
+        for match in self._pattern.finditer(data, start):
+            if match.end() > stop:
+                stop = min(stop, match.start())
+                break
+            out.append(data[pos:match.start()])
+            out.append(self._replacements[match.group(1)])
+            pos = match.end()
+        out.append(data[pos:stop])
+        return b"".join(out), stop
+
+
+class _StreamRenderer:
+    """Chunk-by-chunk substitution that passes binary files through untouched."""
+    
+    BINARY_SNIFF = 8000  # Bytes checked for NUL, as git does
+    
+    def __init__(self, variables: TemplateVariables):
+        self.variables = variables
+        self.binary: Optional[bool] = None
+        self.changed = False
+        self._pending = b""  # Input held back in case a placeholder spans chunks
+        self._before = b""   # Last byte already emitted, for the word-boundary check
+    
+    def feed(self, chunk: bytes) -> bytes:
+        if self.binary is None:
+            self.binary = b"\0" in chunk[:self.BINARY_SNIFF]
+        if self.binary:
+            return chunk
+        return self._render(self._pending + chunk, final=False)
+    
+    def finish(self) -> bytes:
+        return b"" if self.binary else self._render(self._pending, final=True)
+    
+    def _render(self, data: bytes, final: bool) -> bytes:
+        # One byte of context before, and (unless final) one placeholder's
+        # length held back after, so no match or boundary straddles chunks
+        start = len(self._before)
+        context = self._before + data
+        stop = max(start, len(context) - (0 if final else self.variables.longest))
+        out, consumed = self.variables._substitute(context, start, stop)
+        if out != context[start:consumed]:
+            self.changed = True
+        self._pending = context[consumed:]
+        if consumed > start:
+            self._before = context[consumed - 1:consumed]
+        return out
+
+
+class BootstrapJournal:
+    """
+    Progress journal for a bootstrap, kept in the target directory.
+    
+    Records what was planned (mode, form, branch) and, per file, the git
+    blob it should contain plus the size/mtime it had when written. A re-run
+    or --resume uses it to skip files that are already correct: an entry
+    whose stat still matches is trusted without reading the file, anything
+    else is verified by hashing, and only missing or corrupt files are
+    fetched again. A file the tool itself changes after fetching it (the
+    template .gitignore, see settle()) also records its ``final`` blob.
+    """
+    
+    SAVE_INTERVAL = 0.5  # Seconds between journal writes while fetching
+    
+    def __init__(self, root: Path, data: Dict):
+        self.root = root
+        self.data = data
+        self._last_save = 0.0
+    
+    @classmethod
+    def load(cls, root: Path) -> Optional["BootstrapJournal"]:
+        try:
+            data = json.loads((root / JOURNAL_FILE).read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != 1 or not isinstance(data.get("files"), dict):
+            return None
+        return cls(root, data)
+    
+    @classmethod
+    def begin(
+        cls,
+        root: Path,
+        mode: str,
+        form: str,
+        branch: str,
+        tree: Optional[str],
+        name: Optional[str] = None
+    ) -> "BootstrapJournal":
+        """Start (or continue) the journal for a run; per-file entries are kept."""
+        previous = cls.load(root)
+        files = previous.data["files"] if previous else {}
+        journal = cls(root, {
+            "version": 1,
+            "mode": mode,
+            "form": form,
+            "branch": branch,
+            "name": name,
+            "source": get_source().spec,
+            "tree": tree,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "completed_at": None,
+            "files": files,
+        })
+        journal.save()
+        return journal
+    
+    def is_current(self, local: Path, source: str, sha: Optional[str]) -> bool:
+        """True if ``local`` already holds blob ``sha``. Records the file as planned."""
+        key = local.relative_to(self.root).as_posix()
+        entry = self.data["files"].get(key)
+        if entry is None or entry.get("sha") != sha:
+            entry = self.data["files"][key] = {"source": source, "sha": sha, "done": False}
+        if not self.matches(local, sha):
+            entry["done"] = False
+            return False
+        if not entry.get("done"):
+            self.mark_done(local)
         return True
+    
+    def matches(self, local: Path, sha: Optional[str]) -> bool:
+        """True if ``local`` holds blob ``sha``; reads the journal but never changes it."""
+        if not sha:
+            return False
+        try:
+            stat = local.stat()
+        except OSError:
+            return False
+        entry = self.data["files"].get(local.relative_to(self.root).as_posix(), {})
+        if (entry.get("sha") == sha and entry.get("done")
+                and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns):
+            return True
+        with tracer.span("hash", path=local.name):
+            actual = git_blob_sha_file(local)
+        return actual == sha or (entry.get("sha") == sha and entry.get("done") and actual == entry.get("final"))
+    
+    def mark_done(self, local: Path):
+        key = local.relative_to(self.root).as_posix()
+        entry = self.data["files"].setdefault(key, {"sha": None})
+        stat = local.stat()
+        entry.update(done=True, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        if time.monotonic() - self._last_save >= self.SAVE_INTERVAL:
+            self.save()
+    
+    def settle(self, local: Path):
+        """
+        Accept ``local`` as written once the tool has finished changing it.
+        
+        write_project_files appends its entries to the template .gitignore;
+        without this a re-run would see a file that no longer holds its blob
+        and copy the template over it again.
+        """
+        key = local.relative_to(self.root).as_posix()
+        entry = self.data["files"].get(key)
+        if entry is None or not entry.get("done") or not local.is_file():
+            return
+        entry["final"] = git_blob_sha_file(local)
+        self.mark_done(local)
+        self.save()
+    
+    def finish(self, complete: bool):
+        self.data["completed_at"] = datetime.now().isoformat(timespec="seconds") if complete else None
+        self.save()
+    
+    def save(self):
+        self._last_save = time.monotonic()
+        text = json.dumps(self.data, indent=2).encode("utf-8")
+        with tracer.span("journal"):
+            materialize(io.BytesIO(text), self.root / JOURNAL_FILE)
+
+
+# Template cache shared by every fetch in this run (see configure_cache)
+_cache: Optional[TemplateCache] = None
+_offline = False
+# --cache-dir, recorded in .arche-config so update_arche.py finds the same cache
+_cache_dir: Optional[Path] = None
+
+
+def configure_cache(
+    cache_dir: Optional[Path] = None,
+    enabled: bool = True,
+    offline: bool = False,
+    max_mb: int = DEFAULT_CACHE_MB
+) -> Optional[TemplateCache]:
+    """Set up the local template cache used by all fetches in this run."""
+    global _cache, _offline, _cache_dir
+    _cache = TemplateCache(cache_dir or default_cache_dir(), max_mb * 1024 * 1024) if enabled else None
+    _offline = offline
+    _cache_dir = Path(cache_dir).resolve() if cache_dir else None
+    return _cache
+
+
+def fetch_file(
+    url: str,
+    target: Path,
+    quiet: bool = False,
+    sha: Optional[str] = None,
+    size: Optional[int] = None
+) -> bool:
+    """
+    Fetch a single file by URL.
+    
+    The body is streamed to a temporary file and atomically renamed into
+    place. With the expected git blob ``sha`` (and ``size``) the content is
+    verified before the rename and stored in the template cache.
+    """
+    try:
+        download_url(url, target, sha, size)
+        error = _cache_downloaded(target, sha, size)
     except urllib.error.URLError as e:
-        print(f"✗ Failed to fetch {url}: {e}")
-        return False
+        error = describe_error(e)
+    except (IntegrityError, OSError) as e:
+        error = str(e)
+    if error and not quiet:
+        print(f"✗ Failed to fetch {url}: {error}")
+    return error is None
 
 
-def fetch_directory_tree(path: str, branch: str = "main") -> Optional[List[Dict]]:
-    """Fetch directory contents from GitHub API."""
-    url = f"{API_URL}/{path}?ref={branch}"
+def _download(
+    path: str,
+    branch: str,
+    target: Path,
+    sha: Optional[str] = None,
+    size: Optional[int] = None,
+    variables: Optional["TemplateVariables"] = None
+) -> Optional[str]:
+    """
+    Fetch ``path`` from the template source to ``target``, rendering
+    ``variables`` on the way; returns an error description on failure.
+    """
+    transform = variables.renderer() if variables else None
     try:
-        with urllib.request.urlopen(url) as response:
-            return json.loads(response.read())
+        with tracer.span("fetch", path=path, size=size):
+            get_source().fetch(path, branch, target, sha, size, transform)
+        tracer.count("files_fetched")
     except urllib.error.URLError as e:
-        print(f"✗ Failed to fetch directory listing: {e}")
+        return describe_error(e)
+    except (IntegrityError, OSError) as e:
+        return str(e)
+    if transform is not None and transform.changed:
+        return None  # Rendered output is no longer the blob; nothing to cache
+    return _cache_downloaded(target, sha, size)
+
+
+def _cache_downloaded(target: Path, sha: Optional[str], size: Optional[int]) -> Optional[str]:
+    if sha and _cache is not None:
+        try:
+            with tracer.span("cache_store"):
+                stored = _cache.put_file(sha, target, verified=size is not None)
+            if not stored:
+                return f"content does not match blob {sha[:7]}"
+        except OSError as e:
+            print(f"⚠ Unable to write template cache: {e}")
+    return None
+
+
+def _cached_copy(sha: str, target: Path, variables: Optional["TemplateVariables"] = None) -> bool:
+    """Copy blob ``sha`` from the template cache to ``target``; False on a miss."""
+    with tracer.span("cache_copy", path=target.name):
+        return _cache.copy_to(sha, target, variables.renderer() if variables else None)
+
+
+class TreeIndex:
+    """
+    In-memory index of the whole repository tree at one ref.
+    
+    Built from a single recursive git-trees call, it answers directory
+    listings and existence checks without further API requests. Listings
+    use the same item shape as the contents API (name, path, type, sha, size).
+    """
+    
+    def __init__(self, sha: str, entries: List[Dict]):
+        self.sha = sha
+        self._entries: Dict[str, Dict] = {}
+        self._children: Dict[str, List[str]] = {"": []}
+        
+        for entry in entries:
+            if entry["type"] not in ("blob", "tree"):
+                continue  # Submodules are not part of templates
+            path = entry["path"]
+            self._entries[path] = {
+                "name": path.rsplit("/", 1)[-1],
+                "path": path,
+                "type": "file" if entry["type"] == "blob" else "dir",
+                "sha": entry["sha"],
+                "size": entry.get("size"),
+            }
+            if entry["type"] == "tree":
+                self._children.setdefault(path, [])
+            parent = path.rsplit("/", 1)[0] if "/" in path else ""
+            self._children.setdefault(parent, []).append(path)
+    
+    @classmethod
+    def from_api(cls, data: Dict) -> "TreeIndex":
+        return cls(data["sha"], data["tree"])
+    
+    def get(self, path: str) -> Optional[Dict]:
+        return self._entries.get(path.strip("/"))
+    
+    def exists(self, path: str) -> bool:
+        return path.strip("/") in self._entries
+    
+    def is_dir(self, path: str) -> bool:
+        return path.strip("/") in self._children
+    
+    def listdir(self, path: str) -> Optional[List[Dict]]:
+        """List a directory like the contents API; None if it doesn't exist."""
+        children = self._children.get(path.strip("/"))
+        if children is None:
+            return None
+        return sorted((self._entries[child] for child in children), key=lambda item: item["name"])
+    
+    def files_under(self, path: str) -> List[Dict]:
+        """All files below ``path``, recursively, in path order."""
+        prefix = path.strip("/") + "/"
+        return [
+            entry for entry_path, entry in sorted(self._entries.items())
+            if entry_path.startswith(prefix) and entry["type"] == "file"
+        ]
+
+
+_tree_indexes: Dict[str, Optional[TreeIndex]] = {}
+_tree_lock = threading.Lock()
+
+
+def get_tree_index(branch: str = "main") -> Optional[TreeIndex]:
+    """
+    Fetch (once per run) the recursive tree index for ``branch``.
+    
+    Returns None when the listing fails or GitHub truncates it; callers then
+    fall back to per-directory contents API calls. In offline mode the index
+    comes from the template cache instead.
+    """
+    with _tree_lock:
+        if branch not in _tree_indexes:
+            with tracer.span("tree", branch=branch):
+                _tree_indexes[branch] = _cached_tree_index(branch) if _offline else _fetch_tree_index(branch)
+        return _tree_indexes[branch]
+
+
+def _fetch_tree_index(branch: str) -> Optional[TreeIndex]:
+    try:
+        data = get_source().tree(branch)
+        if data is None:
+            return None
+        index = TreeIndex.from_api(data)
+    except urllib.error.URLError as e:
+        print(f"⚠ Tree listing failed ({describe_error(e)}); listing directories one by one")
+        return None
+    except OSError as e:
+        print(f"⚠ Tree listing failed ({e})")
         return None
+    except (ValueError, KeyError):
+        return None
+    
+    if _cache is not None:
+        try:
+            _cache.store_tree(get_source().cache_ref(branch), data)
+        except OSError as e:
+            print(f"⚠ Unable to write template cache: {e}")
+    return index
+
+
+def _cached_tree_index(branch: str) -> Optional[TreeIndex]:
+    tree_sha = _cache.resolve_ref(get_source().cache_ref(branch)) if _cache is not None else None
+    data = _cache.load_tree(tree_sha) if tree_sha else None
+    if not data:
+        print(f"✗ No cached tree for '{branch}' (run once online to populate the cache)")
+        return None
+    return TreeIndex.from_api(data)
+
+
+def fetch_directory_tree(path: str, branch: str = "main", quiet: bool = False) -> Optional[List[Dict]]:
+    """Fetch directory contents, from the tree index when available."""
+    index = get_tree_index(branch)
+    if index is not None:
+        return index.listdir(path)
+    if _offline:
+        return None
+    
+    contents, error = _list_directory(path, branch)
+    if error and not quiet:
+        print(f"✗ Failed to fetch directory listing: {error}")
+    return contents
+
+
+def _list_directory(path: str, branch: str) -> Tuple[Optional[List[Dict]], Optional[str]]:
+    """Contents API listing of one directory: (items, error description)."""
+    try:
+        with tracer.span("list", path=path):
+            return get_source().listdir(path, branch), None
+    except urllib.error.URLError as e:
+        return None, describe_error(e)
+    except OSError as e:
+        return None, str(e)
+
+
+def template_dirs(mode: str, form: str) -> List[Tuple[str, List[str]]]:
+    """The directories a project is built from, each with the names excluded from it."""
+    return [(f"modes/{mode}/_shared", []), (f"modes/{mode}/forms/{form}", ["project.json"])]
+
+
+def _excluded(relative: str, exclude: List[str]) -> bool:
+    """Whether a file (path relative to its template directory) is skipped: any part of it is in ``exclude``."""
+    return any(piece in exclude for piece in relative.split("/"))
+
+
+def fetch_template(
+    remote_path: str,
+    local_path: Path,
+    branch: str = "main",
+    exclude: Optional[List[str]] = None,
+    jobs: int = DEFAULT_JOBS,
+    journal: Optional[BootstrapJournal] = None,
+    variables: Optional[TemplateVariables] = None
+) -> FetchResult:
+    """
+    Fetch a template directory using a bounded pool of worker threads.
+    
+    When the repository tree index is available the file list comes from it,
+    files already in the template cache are copied locally, and only cache
+    misses hit the network. Otherwise directory listings and
+    file downloads share one pool, so sibling subdirectories are crawled in
+    parallel (breadth-first) while files already discovered are downloading.
+    A failed file or listing is recorded in the result and the remaining
+    work carries on. With a ``journal``, files already holding the expected
+    content are left alone and completed files are recorded in it.
+    ``variables`` are rendered into paths and contents as files are written.
+    """
+    exclude = exclude or []
+    result = FetchResult()
+    index = get_tree_index(branch)
+    
+    def installed(target: Path, path: str, sha: Optional[str]):
+        result.installed[target.relative_to(local_path).as_posix()] = (path, sha)
+    
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        pending = {}
+        if index is not None:
+            # The whole file list is already known; only downloads remain
+            for item in index.files_under(remote_path):
+                relative = item["path"][len(remote_path.rstrip("/")) + 1:]
+                if _excluded(relative, exclude):
+                    continue
+                target = local_path / (variables.render_path(relative) if variables else relative)
+                if journal is not None and journal.is_current(target, item["path"], item["sha"]):
+                    print(f"  = {item['path']} (unchanged)")
+                    result.unchanged.append(item["path"])
+                    installed(target, item["path"], item["sha"])
+                    continue
+                if _cache is not None and _cached_copy(item["sha"], target, variables):
+                    print(f"  ✓ {item['path']} (cached)")
+                    result.copied.append(item["path"])
+                    result.cached.append(item["path"])
+                    installed(target, item["path"], item["sha"])
+                    if journal is not None:
+                        journal.mark_done(target)
+                    continue
+                if _offline:
+                    print(f"  ✗ {item['path']}")
+                    result.failed.append((item["path"], "not in cache"))
+                    continue
+                future = pool.submit(_download, item["path"], branch, target, item["sha"], item.get("size"), variables)
+                pending[future] = ("file", item["path"], target, item["sha"])
+        else:
+            future = pool.submit(_list_directory, remote_path, branch)
+            pending[future] = ("dir", remote_path, local_path, None)
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, path, target, sha = pending.pop(future)
+                
+                if kind == "file":
+                    error = future.result()
+                    if error is None:
+                        print(f"  ✓ {path}")
+                        result.copied.append(path)
+                        installed(target, path, sha)
+                        if journal is not None:
+                            journal.mark_done(target)
+                    else:
+                        print(f"  ✗ {path}")
+                        result.failed.append((path, error))
+                    continue
+                
+                contents, error = future.result()
+                if contents is None:
+                    print(f"  ✗ {path}/ (listing failed)")
+                    result.failed.append((path, f"directory listing failed: {error}"))
+                    continue
+                
+                for item in contents:
+                    name = item["name"]
+                    if name in exclude:
+                        continue
+                    local_name = variables.render_path(name) if variables else name
+                    
+                    if item["type"] == "file":
+                        if journal is not None and journal.is_current(target / local_name, item["path"], item.get("sha")):
+                            print(f"  = {item['path']} (unchanged)")
+                            result.unchanged.append(item["path"])
+                            installed(target / local_name, item["path"], item.get("sha"))
+                            continue
+                        child = pool.submit(
+                            _download, item["path"], branch, target / local_name, item.get("sha"), item.get("size"), variables
+                        )
+                        pending[child] = ("file", item["path"], target / local_name, item.get("sha"))
+                    elif item["type"] == "dir":
+                        subdir = target / local_name
+                        subdir.mkdir(parents=True, exist_ok=True)
+                        child = pool.submit(_list_directory, item["path"], branch)
+                        pending[child] = ("dir", item["path"], subdir, None)
+    
+    return result
 
 
 def fetch_template_recursive(
     remote_path: str,
     local_path: Path,
     branch: str = "main",
-    exclude: Optional[List[str]] = None
+    exclude: Optional[List[str]] = None,
+    jobs: int = DEFAULT_JOBS
 ) -> int:
     """Recursively fetch template files from GitHub."""
+    return len(fetch_template(remote_path, local_path, branch, exclude, jobs).copied)
+
+
+def fetch_archive(
+    mode: str,
+    form: str,
+    target_dir: Path,
+    branch: str = "main",
+    exclude: Optional[List[str]] = None,
+    variables: Optional[TemplateVariables] = None
+) -> Tuple[Optional[Dict], FetchResult]:
+    """
+    Fetch a mode/form by streaming a single tarball of the branch or tag.
+    
+    The archive is decompressed as it arrives and only members under
+    modes/<mode>/_shared and modes/<mode>/forms/<form> are extracted, so the
+    whole download costs one request and never sits in memory. Files are
+    staged in a temporary directory and only moved into ``target_dir`` once
+    the form's project.json has been seen, so an unknown form leaves the
+    target untouched. ``exclude`` applies to form files and ``variables``
+    are rendered as files are placed, as in the API transport. The commit
+    git archive records in the tarball's pax header becomes the result's
+    revision, so the lock needs no API call to learn it.
+    
+    Returns: (project.json contents or None, fetch result)
+    """
     exclude = exclude or []
-    files_copied = 0
+    result = FetchResult()
+    prefixes = [
+        (f"modes/{mode}/_shared/", []),
+        (f"modes/{mode}/forms/{form}/", exclude),
+    ]
+    config_path = f"modes/{mode}/forms/{form}/project.json"
+    config = None
+    staged: List[Tuple[str, str]] = []
+    url = get_source().archive_url(branch)
     
-    contents = fetch_directory_tree(remote_path, branch)
-    if not contents:
-        return 0
+    staging = Path(tempfile.mkdtemp(prefix="arche-bootstrap-"))
+    try:
+        try:
+            with tracer.span("archive", url=url), get_client().get(url) as response:
+                with tarfile.open(fileobj=response, mode="r|gz") as archive:
+                    for member in archive:
+                        if result.revision is None:
+                            commit = archive.pax_headers.get("comment", "")
+                            result.revision = commit[:7] if re.fullmatch(r"[0-9a-f]{40}", commit) else None
+                        # Strip the leading "<repo>-<ref>/" component
+                        parts = member.name.split("/", 1)
+                        if len(parts) < 2 or not member.isfile():
+                            continue
+                        path = parts[1]
+                        
+                        if path == config_path:
+                            config = json.load(archive.extractfile(member))
+                            continue
+                        
+                        for prefix, skip in prefixes:
+                            if not path.startswith(prefix):
+                                continue
+                            relative = path[len(prefix):]
+                            if ".." in relative.split("/") or _excluded(relative, skip):
+                                break
+                            target = staging / relative
+                            target.parent.mkdir(parents=True, exist_ok=True)
+                            with archive.extractfile(member) as source, open(target, "wb") as out:
+                                shutil.copyfileobj(source, out)
+                            staged.append((path, relative))
+                            break
+        except (urllib.error.URLError, tarfile.TarError, OSError, ValueError) as e:
+            print(f"✗ Failed to fetch archive {url}: {describe_error(e) if isinstance(e, urllib.error.URLError) else e}")
+            return None, result
+        
+        if config is None:
+            return None, result
+        
+        for path, relative in staged:
+            local = variables.render_path(relative) if variables else relative
+            with tracer.span("place", path=path), open(staging / relative, "rb") as source:
+                materialize(source, target_dir / local, transform=variables.renderer() if variables else None)
+            print(f"  ✓ {path}")
+            result.copied.append(path)
+            result.installed[local] = (path, git_blob_sha_file(staging / relative))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
     
-    for item in contents:
-        name = item["name"]
-        if name in exclude:
-            continue
-            
-        if item["type"] == "file":
-            # Fetch file
-            file_url = f"{RAW_URL}/{branch}/{item['path']}"
-            target = local_path / name
-            if fetch_file(file_url, target):
-                print(f"  ✓ {item['path']}")
-                files_copied += 1
-                
-        elif item["type"] == "dir":
-            # Recursively fetch directory
-            subdir = local_path / name
-            subdir.mkdir(parents=True, exist_ok=True)
-            files_copied += fetch_template_recursive(
-                item["path"], subdir, branch, exclude
-            )
+    return config, result
+
+
+_catalogs: Dict[str, Optional[Dict]] = {}
+_catalog_lock = threading.Lock()
+
+
+def get_catalog(branch: str = "main") -> Optional[Dict]:
+    """
+    Fetch (once per run) the precomputed mode/form catalog for ``branch``.
     
-    return files_copied
+    One raw file holds every mode, form, project.json and file listing, so
+    listings and the interactive picker need a single request. It is
+    revalidated like other listings and served from the HTTP cache when
+    offline. Returns None if the branch has no (compatible) catalog; callers
+    then fall back to listing the repository.
+    """
+    with _catalog_lock:
+        if branch not in _catalogs:
+            with tracer.span("catalog", branch=branch):
+                _catalogs[branch] = _load_catalog(branch)
+        return _catalogs[branch]
+
+
+def _load_catalog(branch: str) -> Optional[Dict]:
+    try:
+        if _offline:
+            index = get_tree_index(branch)
+            entry = index.get(CATALOG_PATH) if index is not None else None
+            data = _cache.get(entry["sha"]) if entry and _cache is not None else None
+            if data is None:
+                return None
+        else:
+            data = get_source().read(CATALOG_PATH, branch)
+            if _cache is not None:
+                _cache.put(git_blob_sha(data), data)
+        catalog = json.loads(data)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(catalog, dict) or catalog.get("schema") != CATALOG_SCHEMA:
+        return None
+    return catalog
 
 
 def list_available_modes(branch: str = "main") -> List[str]:
     """List available modes from GitHub."""
+    catalog = get_catalog(branch)
+    if catalog is not None:
+        return sorted(catalog["modes"])
+    
     contents = fetch_directory_tree("modes", branch)
     if not contents:
         return []
@@ -117,6 +820,10 @@ def list_available_modes(branch: str = "main") -> List[str]:
 
 def list_available_forms(mode: str, branch: str = "main") -> List[str]:
     """List available forms for a specific mode."""
+    catalog = get_catalog(branch)
+    if catalog is not None:
+        return sorted(catalog["modes"].get(mode, {}).get("forms", {}))
+    
     contents = fetch_directory_tree(f"modes/{mode}/forms", branch)
     if not contents:
         return []
@@ -128,72 +835,100 @@ def list_available_forms(mode: str, branch: str = "main") -> List[str]:
     return forms
 
 
+def estimate_listings(mode: str, form: str, branch: str = "main") -> int:
+    """
+    Contents API listings a bootstrap makes without the tree index: one per
+    directory under the mode's _shared and the form. Counted from the
+    catalog or a cached tree listing; without either, the two roots are a
+    lower bound. Files themselves come from raw URLs, outside the API quota.
+    """
+    roots = [f"modes/{mode}/_shared", f"modes/{mode}/forms/{form}"]
+    catalog = get_catalog(branch)
+    if catalog is not None:
+        entry = catalog["modes"].get(mode, {})
+        paths = [item["path"] for item in entry.get("shared", []) + entry.get("forms", {}).get(form, {}).get("files", [])]
+    else:
+        tree_sha = _cache.resolve_ref(get_source().cache_ref(branch)) if _cache is not None else None
+        data = _cache.load_tree(tree_sha) if tree_sha else None
+        index = TreeIndex.from_api(data) if data else None
+        paths = [item["path"] for root in roots for item in index.files_under(root)] if index is not None else []
+    
+    directories = set(roots)
+    for path in paths:
+        for root in roots:
+            if path.startswith(root + "/"):
+                parts = path[len(root) + 1:].split("/")[:-1]
+                directories.update(f"{root}/{'/'.join(parts[:depth])}" for depth in range(1, len(parts) + 1))
+    return len(directories)
+
+
 def fetch_project_json(mode: str, form: str, branch: str = "main") -> Optional[Dict]:
     """Fetch project.json metadata for a form within a mode."""
-    url = f"{RAW_URL}/{branch}/modes/{mode}/forms/{form}/project.json"
+    catalog = get_catalog(branch)
+    if catalog is not None:
+        entry = catalog["modes"].get(mode, {}).get("forms", {}).get(form)
+        return entry.get("project") if entry else None
+    
+    path = f"modes/{mode}/forms/{form}/project.json"
+    index = get_tree_index(branch)
+    sha = None
+    if index is not None:
+        entry = index.get(path)
+        if entry is None:
+            return None
+        sha = entry["sha"]
+    
+    if sha and _cache is not None:
+        data = _cache.get(sha)
+        if data is not None:
+            return json.loads(data)
+    if _offline:
+        return None
+    
     try:
-        with urllib.request.urlopen(url) as response:
-            return json.loads(response.read())
-    except urllib.error.URLError:
+        with tracer.span("project.json", path=path):
+            data = get_source().read(path, branch)
+        if sha and _cache is not None:
+            _cache.put(sha, data)
+        return json.loads(data)
+    except (OSError, ValueError):
         return None
 
 
-def initialize_project(
+def write_project_files(
+    target_dir: Path,
+    config: Dict,
     mode: str,
     form: str,
-    target_dir: Path,
-    project_name: Optional[str] = None,
     branch: str = "main",
     enable_telemetry: Optional[bool] = None,
     update_strategy: str = "auto",
-    update_interval: Optional[int] = None
+    update_interval: Optional[int] = None,
+    quiet: bool = False,
+    project_name: Optional[str] = None,
+    version: Optional[str] = None
 ) -> bool:
     """
-    Initialize a new project from a mode/form.
+    Create the project directories, .arche-telemetry, .arche-config and
+    .gitignore entries once template files are in place.
     
-    This function uses selective sync - only files from the selected mode are copied.
-    Other modes, forms, and cross-mode documentation remain in the repository.
-    This keeps projects lightweight and focused on their specific architectural pattern.
+    ``version`` is the revision the files were fetched at (see
+    resolve_revision); without one the branch name is recorded.
+    Files are replaced rather than rewritten in place, so a hardlinked
+    template .gitignore never changes under other projects.
+    Returns whether telemetry ended up enabled.
     """
-    
-    print(f"\n🚀 Initializing project from Arche")
-    print(f"   Mode: {mode} (selective sync - only this mode's files)")
-    print(f"   Form: {form}")
-    print(f"   Source: {REPO_URL}")
-    print(f"   Branch: {branch}")
-    print(f"   Target: {target_dir}\n")
-    
-    # Fetch project.json to get metadata
-    config = fetch_project_json(mode, form, branch)
-    if not config:
-        print(f"✗ Form '{form}' in mode '{mode}' not found or invalid")
-        return False
-    
-    print(f"Template: {config.get('name', form)}")
-    print(f"Description: {config.get('description', 'No description')}\n")
-    
-    # Create target directory
-    target_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Fetch shared files for this mode
-    print(f"Fetching shared files from modes/{mode}/_shared/...")
-    shared_count = fetch_template_recursive(f"modes/{mode}/_shared", target_dir, branch)
-    
-    # Fetch form-specific files
-    print(f"\nFetching {form} form files...")
-    form_count = fetch_template_recursive(
-        f"modes/{mode}/forms/{form}", 
-        target_dir, 
-        branch,
-        exclude=["project.json"]  # Don't copy project.json to target
-    )
+    say = (lambda *args, **kwargs: None) if quiet else print
+    variables = TemplateVariables.for_project(project_name)
     
     # Create directories specified in config
-    print("\nCreating project directories...")
+    say("\nCreating project directories...")
     for dir_name in config.get("directories", []):
+        if variables:
+            dir_name = variables.render_path(dir_name)
         dir_path = target_dir / dir_name
         dir_path.mkdir(parents=True, exist_ok=True)
-        print(f"  ✓ {dir_name}/")
+        say(f"  ✓ {dir_name}/")
     
     # Create telemetry config if enabled
     if enable_telemetry is None:
@@ -216,30 +951,33 @@ def initialize_project(
             "project_type": None,
             "team_size": None,
             "created_at": datetime.now().strftime("%Y-%m-%d"),
-            "arche_version": branch,
+            "arche_version": version or branch,
             "notes": "This file is never committed. It helps the arche community understand usage patterns. To disable: set telemetry_enabled to false or delete this file. See TELEMETRY.md"
         }
         telemetry_file = target_dir / ".arche-telemetry"
-        telemetry_file.write_text(json.dumps(telemetry_data, indent=2))
-        print(f"\n  ✓ Created .arche-telemetry (helps improve arche, see TELEMETRY.md)")
+        _write_text(telemetry_file, json.dumps(telemetry_data, indent=2))
+        say(f"\n  ✓ Created .arche-telemetry (helps improve arche, see TELEMETRY.md)")
         
         # Ensure it's in .gitignore
         gitignore_file = target_dir / ".gitignore"
         if gitignore_file.exists():
             gitignore_content = gitignore_file.read_text()
             if ".arche-telemetry" not in gitignore_content:
-                gitignore_file.write_text(gitignore_content.rstrip() + "\n.arche-telemetry\n")
+                _write_text(gitignore_file, gitignore_content.rstrip() + "\n.arche-telemetry\n")
         else:
-            gitignore_file.write_text(".arche-telemetry\n")
+            _write_text(gitignore_file, ".arche-telemetry\n")
     
     # Create update config
     config_data = {
         "update_strategy": update_strategy,
         "mode": mode,
         "form": form,
-        "arche_version": branch,
+        "arche_version": version or branch,
         "branch": branch,
         "created_at": datetime.now().strftime("%Y-%m-%d"),
+        **({"source": get_source().spec} if get_source().spec else {}),
+        **({"cache_dir": str(_cache_dir)} if _cache_dir else {}),
+        **({"project_name": project_name} if project_name else {}),
         "telemetry_enabled": enable_telemetry if enable_telemetry is not None else False
     }
     
@@ -248,22 +986,224 @@ def initialize_project(
         config_data["last_update_check"] = datetime.now().strftime("%Y-%m-%d")
     
     config_file = target_dir / ".arche-config"
-    config_file.write_text(json.dumps(config_data, indent=2))
-    print(f"  ✓ Created .arche-config (update strategy: {update_strategy})")
+    _write_text(config_file, json.dumps(config_data, indent=2))
+    say(f"  ✓ Created .arche-config (update strategy: {update_strategy})")
     
     # Ensure .arche-config is in .gitignore
     gitignore_file = target_dir / ".gitignore"
     if gitignore_file.exists():
         gitignore_content = gitignore_file.read_text()
         if ".arche-config" not in gitignore_content:
-            gitignore_file.write_text(gitignore_content.rstrip() + "\n.arche-config\n.arche-backups/\n.arche-update.log\n")
+            _write_text(gitignore_file, gitignore_content.rstrip() + "\n.arche-config\n.arche-backups/\n.arche-update.log\n")
+    else:
+        _write_text(gitignore_file, ".arche-config\n.arche-backups/\n.arche-update.log\n")
+    for name in (LOCK_FILE, JOURNAL_FILE):
+        if (name == LOCK_FILE or (target_dir / name).exists()) and name not in gitignore_file.read_text():
+            _write_text(gitignore_file, gitignore_file.read_text().rstrip() + f"\n{name}\n")
+    
+    # Re-runs and --plan compare the .gitignore with what it holds now, entries included
+    journal = BootstrapJournal.load(target_dir)
+    if journal is not None:
+        journal.settle(gitignore_file)
+    
+    return enable_telemetry
+
+
+def write_lock(
+    target_dir: Path,
+    fetched: FetchResult,
+    mode: str,
+    form: str,
+    branch: str,
+    tree: Optional[str] = None,
+    rendered: bool = False,
+    revision: Optional[str] = None
+) -> ProjectLock:
+    """
+    Record every template file now in ``target_dir`` in its .arche-lock.
+    
+    Files are trusted to hold their blob unless ``rendered`` (a project name
+    was substituted) or later edited by write_project_files, in which case
+    the installed hash is read from disk. Call it after write_project_files.
+    With a ``revision`` the first update check can ask the source for the
+    changes since it instead of listing the whole tree.
+    
+    The mode's shared files, which update_arche.py updates, are also kept
+    in the project's backup store as merge bases for that first update.
+    """
+    lock = ProjectLock.create(
+        target_dir, mode=mode, form=form, branch=branch, tree=tree, revision=revision,
+        source=get_source().describe()
+    )
+    with tracer.span("lock"):
+        for local, (source, sha) in fetched.installed.items():
+            lock.record(local, source, sha, verified=not rendered and local != ".gitignore")
+        lock.save()
+        store = BackupStore(target_dir)
+        for local, entry in lock.files.items():
+            # A file rendered with the project name no longer holds its blob; it gets no base
+            if entry["source"].startswith(f"modes/{mode}/_shared/") and entry["sha"] and entry["installed"] == entry["sha"]:
+                store.put(entry["sha"], (target_dir / local).read_bytes())
+    return lock
+
+
+def resolve_revision(branch: str) -> Optional[str]:
+    """
+    The revision ``branch`` points at, as update_arche.py records it.
+    
+    Resolve it before fetching: if the branch moves meanwhile, the files
+    are at least this new and the next check reports the difference.
+    Sources whose revision is their tree's SHA answer from the tree index
+    the files are fetched from, at no extra request. Archive bootstraps
+    don't call this (see fetch_archive). Returns None offline or if the
+    source can't say.
+    """
+    if get_source().revision_from_tree:
+        index = get_tree_index(branch)
+        return index.sha[:7] if index else None
+    if _offline:
+        return None
+    try:
+        with tracer.span("version", branch=branch):
+            return get_source().revision(branch)
+    except urllib.error.URLError as e:
+        print(f"  ⚠ Couldn't resolve the revision of '{branch}' ({describe_error(e)}); the first update check lists the tree")
+    except (OSError, ValueError, KeyError) as e:
+        print(f"  ⚠ Couldn't resolve the revision of '{branch}' ({e}); the first update check lists the tree")
+    return None
+
+
+def _write_text(path: Path, text: str):
+    """Write ``text`` to ``path`` via a new file and rename."""
+    materialize(io.BytesIO(text.encode("utf-8")), path)
+
+
+def initialize_project(
+    mode: str,
+    form: str,
+    target_dir: Path,
+    project_name: Optional[str] = None,
+    branch: str = "main",
+    enable_telemetry: Optional[bool] = None,
+    update_strategy: str = "auto",
+    update_interval: Optional[int] = None,
+    jobs: int = DEFAULT_JOBS,
+    transport: str = "api"
+) -> bool:
+    """
+    Initialize a new project from a mode/form.
+    
+    This function uses selective sync - only files from the selected mode are copied.
+    Other modes, forms, and cross-mode documentation remain in the repository.
+    This keeps projects lightweight and focused on their specific architectural pattern.
+    """
+    
+    print(f"\n🚀 Initializing project from Arche")
+    print(f"   Mode: {mode} (selective sync - only this mode's files)")
+    print(f"   Form: {form}")
+    print(f"   Source: {get_source().describe()}")
+    print(f"   Branch: {branch}")
+    print(f"   Target: {target_dir}")
+    variables = TemplateVariables.for_project(project_name)
+    if variables:
+        print(f"   Name: {project_name} ({', '.join(f'{k} → {v}' for k, v in variables.values.items())})")
+    print()
+    # The tarball names its own commit; other transports ask before fetching
+    revision = resolve_revision(branch) if transport != "archive" else None
+    
+    if transport == "archive":
+        # One tarball request covers project.json, shared and form files
+        print(f"Streaming {get_source().archive_url(branch)} (modes/{mode}/_shared, modes/{mode}/forms/{form})...")
+        config, fetched = fetch_archive(
+            mode,
+            form,
+            target_dir,
+            branch,
+            exclude=["project.json"],  # Don't copy project.json to target
+            variables=variables
+        )
+        if not config:
+            print(f"✗ Form '{form}' in mode '{mode}' not found or invalid")
+            return False
+        revision = fetched.revision
+        
+        print(f"\nTemplate: {config.get('name', form)}")
+        print(f"Description: {config.get('description', 'No description')}")
+        target_dir.mkdir(parents=True, exist_ok=True)
     else:
-        gitignore_file.write_text(".arche-config\n.arche-backups/\n.arche-update.log\n")
+        # Fetch project.json to get metadata
+        config = fetch_project_json(mode, form, branch)
+        if not config:
+            print(f"✗ Form '{form}' in mode '{mode}' not found or invalid")
+            return False
+        
+        print(f"Template: {config.get('name', form)}")
+        print(f"Description: {config.get('description', 'No description')}\n")
+        
+        if not _offline and get_tree_index(branch) is None:
+            # Without the tree index every directory costs an API request:
+            # fail before touching the target rather than half-populating it
+            problem = get_source().check_budget(planned=estimate_listings(mode, form, branch))
+            if problem:
+                print(f"✗ Not starting: {problem}")
+                print("   Set GITHUB_TOKEN, wait for the reset, or use --transport archive.")
+                return False
+        
+        # Create target directory
+        target_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Track progress so an interrupted or repeated run only fetches what's missing
+        index = get_tree_index(branch)
+        journal = BootstrapJournal.begin(target_dir, mode, form, branch, index.sha if index else None, project_name)
+        
+        complete = False
+        try:
+            # Fetch shared files for this mode
+            print(f"Fetching shared files from modes/{mode}/_shared/...")
+            fetched = fetch_template(
+                f"modes/{mode}/_shared", target_dir, branch, jobs=jobs, journal=journal, variables=variables
+            )
+            
+            # Fetch form-specific files
+            print(f"\nFetching {form} form files...")
+            fetched.merge(fetch_template(
+                f"modes/{mode}/forms/{form}", 
+                target_dir, 
+                branch,
+                exclude=["project.json"],  # Don't copy project.json to target
+                jobs=jobs,
+                journal=journal,
+                variables=variables
+            ))
+            complete = not fetched.failed
+        finally:
+            # Also on Ctrl-C, so --resume knows what was already written
+            journal.finish(complete)
+    
+    with tracer.span("config"):
+        enable_telemetry = write_project_files(
+            target_dir, config, mode, form, branch, enable_telemetry, update_strategy, update_interval,
+            project_name=project_name, version=revision
+        )
+    index = get_tree_index(branch) if transport != "archive" else None
+    write_lock(
+        target_dir, fetched, mode, form, branch, index.sha if index else None,
+        rendered=variables is not None, revision=revision
+    )
     
     # Summary
-    total_files = shared_count + form_count
-    print(f"\n✅ Successfully initialized project!")
-    print(f"   Files copied: {total_files}")
+    if fetched.failed:
+        print(f"\n⚠️  {len(fetched.failed)} file(s) could not be fetched:")
+        for path, reason in fetched.failed:
+            print(f"   ✗ {path} ({reason})")
+        print(f"   Re-run with --resume to fetch only what's missing; files already copied are kept.")
+    
+    total_files = len(fetched.copied)
+    print(f"\n{'⚠️  Project initialized with errors' if fetched.failed else '✅ Successfully initialized project!'}")
+    print(f"   Files copied: {total_files}" + (f" ({len(fetched.cached)} from cache)" if fetched.cached else ""))
+    if fetched.unchanged:
+        print(f"   Files already up to date: {len(fetched.unchanged)}")
+    print(f"   Network: {get_client().stats.summary()}")
     print(f"   Mode: {mode}")
     print(f"   Form: {form}")
     print(f"\n💡 Selective Sync")
@@ -291,13 +1231,517 @@ def initialize_project(
     print(f"   others discover it—clearer docs, better examples, or just")
     print(f"   telling colleagues who might benefit. The virtuous circle grows naturally.")
     
-    return True
+    return not fetched.failed
+
+
+def plan_project(
+    mode: str,
+    form: str,
+    target_dir: Path,
+    branch: str = "main",
+    project_name: Optional[str] = None,
+    transport: str = "api",
+    enable_telemetry: Optional[bool] = None
+) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Work out what initialize_project would do, without touching ``target_dir``.
+    
+    Lists every template file with its action (create, overwrite or
+    unchanged), size and whether it would come from the cache, plus the
+    directories from project.json, the generated config files and the
+    number of requests the chosen transport would make. Requests needed to
+    build the plan itself (listings, project.json) are reported separately.
+    
+    Returns: (plan, error description)
+    """
+    client = get_client()
+    before = client.stats.requests
+    config = fetch_project_json(mode, form, branch)
+    if not config:
+        return None, f"form '{form}' in mode '{mode}' not found or invalid"
+    
+    variables = TemplateVariables.for_project(project_name)
+    index = get_tree_index(branch)
+    listings = 0
+    items: List[Tuple[Dict, str]] = []
+    for remote, exclude in template_dirs(mode, form):
+        if index is not None:
+            found = index.files_under(remote)
+        elif _offline:
+            return None, f"no cached tree for '{branch}'"
+        else:
+            found, dirs = _walk_listing(remote, branch)
+            if found is None:
+                return None, f"listing {remote} failed: {dirs}"
+            listings += dirs
+        for item in found:
+            relative = item["path"][len(remote) + 1:]
+            if not _excluded(relative, exclude):
+                items.append((item, variables.render_path(relative) if variables else relative))
+    
+    journal = BootstrapJournal.load(target_dir) or BootstrapJournal(target_dir, {"files": {}})
+    # Archive bootstraps keep no journal; the lock knows what they installed, .gitignore entries included
+    lock = ProjectLock.load(target_dir)
+    files = []
+    for item, relative in items:
+        target = target_dir / relative
+        entry = lock.entry(relative) if lock else None
+        installed = bool(item.get("sha")) and entry is not None and entry.get("sha") == item["sha"] and lock.is_modified(relative) is False
+        if installed or journal.matches(target, item.get("sha")):
+            action = "unchanged"
+        else:
+            action = "overwrite" if target.exists() else "create"
+        cached = (
+            transport == "api" and action != "unchanged" and _cache is not None
+            and bool(item.get("sha")) and _cache.has(item["sha"])
+        )
+        files.append({
+            "path": relative,
+            "source": item["path"],
+            "sha": item.get("sha"),
+            "size": item.get("size"),
+            "action": action,
+            "cached": cached,
+        })
+    
+    to_write = [f for f in files if f["action"] != "unchanged"]
+    if transport == "archive":
+        transfer = 1  # One tarball, whatever is already on disk
+    else:
+        downloads = [f for f in to_write if not f["cached"]]
+        transfer = listings + get_source().estimate_requests(len(downloads))
+    sizes = [f["size"] for f in to_write]
+    
+    directories = []
+    for name in config.get("directories", []):
+        name = variables.render_path(name) if variables else name
+        directories.append({"path": name, "exists": (target_dir / name).is_dir()})
+    
+    if enable_telemetry is None:
+        enable_telemetry = True  # As initialize_project, unless ~/.arche-config disables it
+        try:
+            enable_telemetry = json.loads((Path.home() / ".arche-config").read_text()).get("telemetry_enabled", True)
+        except (OSError, ValueError):
+            pass
+    generated = [".arche-config", LOCK_FILE, ".gitignore"] + ([".arche-telemetry"] if enable_telemetry else [])
+    if transport == "api":
+        generated.append(JOURNAL_FILE)
+    
+    return {
+        "mode": mode,
+        "form": form,
+        "target": str(target_dir),
+        "branch": branch,
+        "source": get_source().describe(),
+        "transport": transport,
+        "template": config.get("name", form),
+        "files": files,
+        "directories": directories,
+        "generated": [{"path": name, "action": "overwrite" if (target_dir / name).exists() else "create"} for name in generated],
+        "summary": {
+            "files": len(files),
+            "create": sum(f["action"] == "create" for f in files),
+            "overwrite": sum(f["action"] == "overwrite" for f in files),
+            "unchanged": sum(f["action"] == "unchanged" for f in files),
+            "bytes": None if None in sizes else sum(sizes),
+            "cached": sum(f["cached"] for f in files),
+            "requests": transfer,
+            "planning_requests": client.stats.requests - before,
+        },
+    }, None
+
 
+def _walk_listing(path: str, branch: str) -> Tuple[Optional[List[Dict]], object]:
+    """All files under ``path`` via per-directory listings: (files, listings made) or (None, error)."""
+    files = []
+    queue = [path]
+    listings = 0
+    while queue:
+        contents, error = _list_directory(queue.pop(0), branch)
+        if contents is None:
+            return None, error
+        listings += 1
+        for item in contents:
+            if item["type"] == "file":
+                files.append(item)
+            elif item["type"] == "dir":
+                queue.append(item["path"])
+    return files, listings
 
-def interactive_mode(branch: str = "main") -> bool:
+
+def print_plan(plan: Dict):
+    """Human-readable form of a plan_project() result."""
+    marks = {"create": "+", "overwrite": "!", "unchanged": "="}
+    summary = plan["summary"]
+    print(f"\n📋 Plan: {plan['mode']}/{plan['form']} → {plan['target']}")
+    print(f"   Source: {plan['source']} ({plan['branch']}, {plan['transport']} transport)")
+    print(f"   Template: {plan['template']}\n")
+    
+    for f in plan["files"]:
+        size = f"{f['size'] / 1024:7.1f} KB" if f["size"] is not None else "       ? KB"
+        notes = [note for note, on in (("overwrite", f["action"] == "overwrite"), ("cached", f["cached"])) if on]
+        print(f"  {marks[f['action']]} {f['path']:<50} {size}" + (f"  ({', '.join(notes)})" if notes else ""))
+    if plan["directories"]:
+        print("\n  Directories:")
+        for d in plan["directories"]:
+            print(f"    {d['path']}/" + (" (exists)" if d["exists"] else ""))
+    print("\n  Generated: " + ", ".join(
+        g["path"] + (" (updated)" if g["action"] == "overwrite" else "") for g in plan["generated"]
+    ))
+    
+    size = f"{summary['bytes'] / 1024:.1f} KB" if summary["bytes"] is not None else "unknown size"
+    print(f"\n   Files: {summary['files']} ({summary['create']} new, {summary['overwrite']} overwritten, "
+          f"{summary['unchanged']} unchanged), {size} to write")
+    print(f"   From cache: {summary['cached']}")
+    print(f"   Requests: {summary['requests']} to bootstrap ({summary['planning_requests']} made while planning)")
+    if summary["overwrite"]:
+        print(f"\n⚠️  {summary['overwrite']} existing file(s) in {plan['target']} would be overwritten")
+
+
+def plan_manifest(projects: List["ProjectSpec"]) -> Dict:
+    """
+    Plan every project in a manifest (see plan_project).
+    
+    The request estimate counts each distinct uncached blob once, as
+    bootstrap_manifest downloads shared files a single time for all projects.
+    """
+    client = get_client()
+    before = client.stats.requests
+    plans = []
+    blobs = set()
+    totals = Counter()
+    for project in projects:
+        plan, error = plan_project(
+            project.mode, project.form, project.target, project.branch,
+            project.name, "api", project.telemetry
+        )
+        if plan is None:
+            plans.append({"mode": project.mode, "form": project.form, "target": str(project.target), "error": error})
+            totals["failed"] += 1
+            continue
+        plans.append(plan)
+        for key in ("files", "create", "overwrite", "unchanged", "cached"):
+            totals[key] += plan["summary"][key]
+        totals["bytes"] = None if None in (totals["bytes"], plan["summary"]["bytes"]) else totals["bytes"] + plan["summary"]["bytes"]
+        blobs.update(f["sha"] for f in plan["files"] if f["action"] != "unchanged" and not f["cached"])
+    
+    summary = {key: totals[key] for key in ("files", "create", "overwrite", "unchanged", "bytes", "cached", "failed")}
+    summary["projects"] = len(projects)
+    summary["blobs"] = len(blobs)
+    summary["requests"] = get_source().estimate_requests(len(blobs))
+    summary["planning_requests"] = client.stats.requests - before
+    return {"source": get_source().describe(), "projects": plans, "summary": summary}
+
+
+def print_manifest_plan(plan: Dict):
+    """Human-readable form of a plan_manifest() result: one line per project."""
+    summary = plan["summary"]
+    print(f"\n📋 Bulk plan: {summary['projects']} project(s) from {plan['source']}\n")
+    for project in plan["projects"]:
+        label = f"{project['mode']}/{project['form']} → {project['target']}"
+        if "error" in project:
+            print(f"  ✗ {label}: {project['error']}")
+            continue
+        counts = project["summary"]
+        print(f"  {'!' if counts['overwrite'] else '+'} {label}: {counts['create']} new, "
+              f"{counts['overwrite']} overwritten, {counts['unchanged']} unchanged")
+    
+    size = f"{summary['bytes'] / 1024:.1f} KB" if summary["bytes"] is not None else "unknown size"
+    print(f"\n   Files: {summary['files']} ({summary['create']} new, {summary['overwrite']} overwritten, "
+          f"{summary['unchanged']} unchanged), {size} to write")
+    print(f"   Distinct blobs to download: {summary['blobs']} ({summary['cached']} file(s) from cache)")
+    print(f"   Requests: {summary['requests']} to bootstrap ({summary['planning_requests']} made while planning)")
+    if summary["failed"]:
+        print(f"\n✗ {summary['failed']} project(s) can't be planned")
+    if summary["overwrite"]:
+        print(f"\n⚠️  {summary['overwrite']} existing file(s) would be overwritten")
+
+
+@dataclass
+class ProjectSpec:
+    """One project to create in a --manifest run."""
+    mode: str
+    form: str
+    target: Path
+    name: Optional[str] = None
+    branch: str = "main"
+    telemetry: Optional[bool] = None
+    update_strategy: str = "auto"
+
+
+def load_manifest(path: Path, branch: str = "main", enable_telemetry: Optional[bool] = None) -> List[ProjectSpec]:
+    """
+    Read a bulk manifest: a list of projects, or {"defaults": {...}, "projects": [...]}.
+    
+    Each project needs mode, form and target (relative targets resolve
+    against the manifest's directory); name, branch, telemetry and
+    update_strategy are optional. Raises ValueError on a malformed manifest.
+    """
+    data = json.loads(path.read_text())
+    defaults: Dict = {}
+    if isinstance(data, dict):
+        defaults = data.get("defaults", {})
+        data = data.get("projects")
+    if not isinstance(data, list) or not data:
+        raise ValueError("expected a non-empty list of projects")
+    
+    known = {f.name for f in fields(ProjectSpec)}
+    projects = []
+    for number, entry in enumerate(data, 1):
+        entry = {**defaults, **entry}
+        unknown = set(entry) - known
+        missing = {"mode", "form", "target"} - set(entry)
+        if unknown or missing:
+            problem = f"unknown {', '.join(sorted(unknown))}" if unknown else f"missing {', '.join(sorted(missing))}"
+            raise ValueError(f"project {number}: {problem}")
+        entry.setdefault("branch", branch)
+        if enable_telemetry is not None:
+            entry.setdefault("telemetry", enable_telemetry)
+        entry["target"] = path.parent / Path(entry["target"]).expanduser()
+        projects.append(ProjectSpec(**entry))
+    
+    targets = [project.target.resolve() for project in projects]
+    if len(set(targets)) != len(targets):
+        raise ValueError("two projects share a target directory")
+    return projects
+
+
+def place_file(source: Path, target: Path, link: str = "copy") -> str:
+    """
+    Put the contents of ``source`` at ``target``; returns how it was placed.
+    
+    ``link`` asks for a "hardlink" (shares the inode: an in-place edit shows
+    up in every linked project) or a "reflink" (copy-on-write clone, on
+    filesystems that support it). Either falls back to a plain copy.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if link in ("hardlink", "reflink"):
+        fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".part")
+        try:
+            if link == "hardlink":
+                os.close(fd)
+                os.unlink(tmp)
+                os.link(source, tmp)
+            else:
+                with os.fdopen(fd, "wb") as out, open(source, "rb") as src:
+                    _reflink(src.fileno(), out.fileno())
+            os.replace(tmp, target)
+            return link
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+    with open(source, "rb") as src:
+        materialize(src, target)
+    return "copy"
+
+
+def _reflink(source_fd: int, target_fd: int):
+    """Clone a file's extents (Linux FICLONE); raises OSError where unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflinks are not supported on this platform")
+    FICLONE = 0x40049409
+    fcntl.ioctl(target_fd, FICLONE, source_fd)
+
+
+def bootstrap_manifest(projects: List[ProjectSpec], jobs: int = DEFAULT_JOBS, link: str = "copy") -> bool:
+    """
+    Create every project in a manifest from shared downloads.
+    
+    All projects are planned against one tree index per branch, each
+    distinct blob is fetched once (or taken from the template cache), and
+    projects are then written in parallel from those local copies. Prints
+    one aggregated summary; returns True if every project succeeded.
+    """
+    print(f"\n🚀 Bulk bootstrap: {len(projects)} project(s) from {get_source().describe()}\n")
+    
+    # Plan every project against its branch's tree
+    failed: Dict[int, str] = {}
+    plans: Dict[int, Tuple[Dict, List[Tuple[Dict, Path, str]]]] = {}
+    revisions: Dict[str, Optional[str]] = {}
+    for number, project in enumerate(projects):
+        if project.branch not in revisions:
+            revisions[project.branch] = resolve_revision(project.branch)
+        config = fetch_project_json(project.mode, project.form, project.branch)
+        index = get_tree_index(project.branch)
+        if not config:
+            failed[number] = f"form '{project.form}' in mode '{project.mode}' not found or invalid"
+            continue
+        if index is None:
+            failed[number] = f"no tree listing for '{project.branch}'"
+            continue
+        
+        variables = TemplateVariables.for_project(project.name)
+        files = []
+        for remote, exclude in template_dirs(project.mode, project.form):
+            for item in index.files_under(remote):
+                relative = item["path"][len(remote) + 1:]
+                if not _excluded(relative, exclude):
+                    local = variables.render_path(relative) if variables else relative
+                    files.append((item, project.target / local, project.branch))
+        plans[number] = (config, files)
+    
+    blobs: Dict[str, Tuple[Dict, str]] = {}
+    for _, files in plans.values():
+        for item, _, branch in files:
+            blobs.setdefault(item["sha"], (item, branch))
+    total_files = sum(len(files) for _, files in plans.values())
+    print(f"Planned {total_files} files across {len(plans)} project(s): {len(blobs)} distinct blob(s)")
+    
+    staging = Path(tempfile.mkdtemp(prefix="arche-bulk-"))
+    try:
+        # Fetch each distinct blob once
+        def blob_path(sha: str) -> Path:
+            staged = staging / sha
+            if staged.exists() or _cache is None:
+                return staged
+            return _cache.object_path(sha)
+        
+        missing = [sha for sha in blobs if _cache is None or not _cache.has(sha)]
+        blob_errors: Dict[str, str] = {}
+        if _offline:
+            blob_errors = {sha: "not in cache" for sha in missing}
+        elif missing:
+            print(f"Fetching {len(missing)} blob(s) ({len(blobs) - len(missing)} already cached)...")
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+                futures = {
+                    pool.submit(_download, blobs[sha][0]["path"], blobs[sha][1], staging / sha, sha, blobs[sha][0].get("size")): sha
+                    for sha in missing
+                }
+                for future in futures:
+                    error = future.result()
+                    if error:
+                        blob_errors[futures[future]] = error
+        
+        # Write projects in parallel from the local copies. Hardlinks all
+        # point at the staged copy, which nothing modifies afterwards
+        stage_lock = threading.Lock()
+        
+        def staged_copy(sha: str) -> Path:
+            staged = staging / sha
+            with stage_lock:
+                if not staged.exists():
+                    place_file(blob_path(sha), staged)
+            return staged
+        
+        # Whether a blob contains placeholders at all; the rest can still be linked
+        has_placeholders: Dict[str, bool] = {}
+        
+        def needs_render(sha: str, variables: TemplateVariables) -> bool:
+            with stage_lock:
+                if sha not in has_placeholders:
+                    has_placeholders[sha] = variables.applies_to(blob_path(sha).read_bytes())
+                return has_placeholders[sha]
+        
+        def build(number: int) -> Tuple[FetchResult, Counter]:
+            project = projects[number]
+            config, files = plans[number]
+            result = FetchResult()
+            placed: Counter = Counter()
+            project.target.mkdir(parents=True, exist_ok=True)
+            variables = TemplateVariables.for_project(project.name)
+            journal = BootstrapJournal.begin(
+                project.target, project.mode, project.form, project.branch,
+                get_tree_index(project.branch).sha, project.name
+            )
+            try:
+                for item, target, _ in files:
+                    sha = item["sha"]
+                    local = target.relative_to(project.target).as_posix()
+                    if journal.is_current(target, item["path"], sha):
+                        result.unchanged.append(item["path"])
+                        result.installed[local] = (item["path"], sha)
+                        continue
+                    if sha in blob_errors:
+                        result.failed.append((item["path"], blob_errors[sha]))
+                        continue
+                    try:
+                        with tracer.span("place", path=item["path"]) as span:
+                            if variables and needs_render(sha, variables):
+                                with open(blob_path(sha), "rb") as source:
+                                    materialize(source, target, transform=variables.renderer())
+                                how = "rendered"
+                            else:
+                                source = staged_copy(sha) if link == "hardlink" else blob_path(sha)
+                                how = place_file(source, target, link)
+                            if span is not None:
+                                span["how"] = how
+                    except OSError as e:
+                        result.failed.append((item["path"], str(e)))
+                        continue
+                    placed[how] += 1
+                    result.copied.append(item["path"])
+                    result.installed[local] = (item["path"], sha)
+                    journal.mark_done(target)
+            finally:
+                journal.finish(complete=not result.failed)
+            
+            with tracer.span("config", target=str(project.target)):
+                write_project_files(
+                    project.target, config, project.mode, project.form, project.branch,
+                    project.telemetry, project.update_strategy, quiet=True, project_name=project.name,
+                    version=revisions[project.branch]
+                )
+            write_lock(
+                project.target, result, project.mode, project.form, project.branch,
+                get_tree_index(project.branch).sha, rendered=variables is not None,
+                revision=revisions[project.branch]
+            )
+            return result, placed
+        
+        results: Dict[int, Tuple[FetchResult, Counter]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = {pool.submit(build, number): number for number in plans}
+            for future in futures:
+                number = futures[future]
+                try:
+                    results[number] = future.result()
+                except OSError as e:
+                    failed[number] = str(e)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    
+    # One aggregated report
+    print()
+    totals = FetchResult()
+    placed_total: Counter = Counter()
+    for number, project in enumerate(projects):
+        label = f"{project.target} ({project.mode}/{project.form})"
+        if number in failed:
+            print(f"  ✗ {label}: {failed[number]}")
+            continue
+        result, placed = results[number]
+        totals.merge(result)
+        placed_total += placed
+        if result.failed:
+            failed[number] = f"{len(result.failed)} file(s) failed"
+            print(f"  ✗ {label}: {len(result.failed)} of {len(plans[number][1])} file(s) failed")
+            for path, reason in result.failed:
+                print(f"     ✗ {path} ({reason})")
+        else:
+            print(f"  ✓ {label}: {len(result.copied)} written, {len(result.unchanged)} unchanged")
+    
+    ok = len(projects) - len(failed)
+    print(f"\n{'⚠️  Bulk bootstrap finished with errors' if failed else '✅ Bulk bootstrap complete!'}")
+    print(f"   Projects: {ok}/{len(projects)} succeeded")
+    print(f"   Files: {len(totals.copied)} written ({', '.join(f'{n} {how}' for how, n in sorted(placed_total.items())) or 'none'}), "
+          f"{len(totals.unchanged)} unchanged")
+    print(f"   Blobs: {len(blobs)} distinct, {len(missing) - len(blob_errors)} downloaded")
+    print(f"   Network: {get_client().stats.summary()}")
+    return not failed
+
+
+def interactive_mode(
+    branch: str = "main",
+    jobs: int = DEFAULT_JOBS,
+    transport: str = "api"
+) -> bool:
     """Interactive mode and form selection and initialization."""
     print("\n🎯 Arche Bootstrap - Interactive Mode")
-    print(f"   Repository: {REPO_URL}\n")
+    print(f"   Repository: {get_source().describe()}\n")
     
     # List available modes
     print("Fetching available modes...")
@@ -333,28 +1777,18 @@ def interactive_mode(branch: str = "main") -> bool:
     forms = list_available_forms(selected_mode, branch)
     
     if not forms:
-      Telemetry prompt
-    print(f"\n📊 Anonymous Telemetry")
-    print(f"   Help improve arche by sharing anonymous usage data (mode, form, project type).")
-    print(f"   No identifying information is collected. See TELEMETRY.md for details.")
-    telemetry_input = input(f"   Enable telemetry? (Y/n): ").strip().lower()
-    enable_telemetry = telemetry_input != 'n'
-    
-    #   print(f"✗ No forms found for {selected_mode} mode")
+        print(f"✗ No forms found for {selected_mode} mode")
         return False
     
+    # Served from the catalog when there is one; otherwise fetch all
+    # descriptions concurrently rather than one round-trip per form
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        configs = list(pool.map(lambda form: fetch_project_json(selected_mode, form, branch), forms))
+    
     print(f"\nAvailable forms in {selected_mode}:")
-    for i, form in enumerate(forms, 1):
-        config = fetch_project_json(selected_mode, form, branch)
+    for i, (form, config) in enumerate(zip(forms, configs), 1):
         desc = config.get("description", "No description") if config else "No description"
-        print(f"  {i}. {form}"
-        selected_mode, 
-        selected_form, 
-        target_dir, 
-        project_name, 
-        branch,
-        enable_telemetry
-    
+        print(f"  {i}. {form}")
         print(f"     {desc}")
     
     # Get form selection
@@ -384,6 +1818,13 @@ def interactive_mode(branch: str = "main") -> bool:
     target_input = input(f"\nTarget directory (default: {default_target}): ").strip()
     target_dir = Path(target_input) if target_input else default_target
     
+    # Telemetry prompt
+    print(f"\n📊 Anonymous Telemetry")
+    print(f"   Help improve arche by sharing anonymous usage data (mode, form, project type).")
+    print(f"   No identifying information is collected. See TELEMETRY.md for details.")
+    telemetry_input = input(f"   Enable telemetry? (Y/n): ").strip().lower()
+    enable_telemetry = telemetry_input != 'n'
+    
     # Confirm
     print(f"\n📝 Summary:")
     print(f"   Mode: {selected_mode}")
@@ -398,7 +1839,16 @@ def interactive_mode(branch: str = "main") -> bool:
         return False
     
     # Initialize
-    return initialize_project(selected_mode, selected_form, target_dir, project_name, branch)
+    return initialize_project(
+        selected_mode, 
+        selected_form, 
+        target_dir, 
+        project_name, 
+        branch,
+        enable_telemetry,
+        jobs=jobs,
+        transport=transport
+    )
 
 
 def main():
@@ -419,6 +1869,33 @@ Examples:
   # Use specific version
   python bootstrap.py --mode 3-layer --form automation --branch v1.0.0
   
+  # Limit parallel downloads (e.g. on constrained CI runners)
+  python bootstrap.py --mode 3-layer --form automation --jobs 4
+  
+  # Single-request download (avoids GitHub API rate limits)
+  python bootstrap.py --mode 3-layer --form automation --transport archive
+  
+  # Create many projects at once (see README for the manifest format)
+  python bootstrap.py --manifest projects.json --link hardlink
+  
+  # Preview what would be written (exit 3 if existing files would be overwritten)
+  python bootstrap.py --mode 3-layer --form automation --target ~/projects/my-etl --plan
+  python bootstrap.py --manifest projects.json --plan --json
+  
+  # Time each phase and save a Chrome trace of the run
+  python bootstrap.py --mode 3-layer --form automation --profile --trace-json bootstrap-trace.json
+  
+  # Finish an interrupted bootstrap (mode, form and branch come from the journal)
+  python bootstrap.py --resume --target ~/projects/my-etl
+  
+  # Bootstrap from a local checkout, an internal mirror or any git remote
+  python bootstrap.py --mode 3-layer --form automation --source /srv/arche
+  python bootstrap.py --mode 3-layer --form automation --source https://mirror.example.com/arche
+  python bootstrap.py --mode 3-layer --form automation --source git+https://git.example.com/arche.git
+  
+  # Re-use a previously fetched ref without touching the network
+  python bootstrap.py --mode 3-layer --form automation --offline
+  
   # List available modes
   python bootstrap.py --list-modes
   
@@ -463,10 +1940,125 @@ Repository: {REPO_URL}
     parser.add_argument(
         "-b", "--branch",
         type=str,
-        default="main",
         help="Git branch or tag to use (default: main)"
     )
     
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        metavar="N",
+        help=f"Number of parallel downloads (default: {DEFAULT_JOBS}, 1 = sequential)"
+    )
+    
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default="api",
+        help="How to fetch files: 'api' lists the tree once and downloads each file, "
+             "'archive' streams one tarball of the branch (default: api)"
+    )
+    
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=arche_http.DEFAULT_TIMEOUT,
+        metavar="SECONDS",
+        help=f"Network timeout per request (default: {arche_http.DEFAULT_TIMEOUT:g})"
+    )
+    
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=arche_http.DEFAULT_RETRIES,
+        metavar="N",
+        help=f"Retries for transient network errors, with backoff (default: {arche_http.DEFAULT_RETRIES})"
+    )
+    
+    parser.add_argument(
+        "--source",
+        type=str,
+        metavar="SOURCE",
+        help="Where to read templates from: 'github' (default), a local checkout or file:// mirror, "
+             "an HTTP mirror URL, or git+URL for a sparse partial clone"
+    )
+    
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        metavar="FILE",
+        help="Create every project listed in a JSON manifest, downloading each distinct file once"
+    )
+    
+    parser.add_argument(
+        "--link",
+        choices=LINK_MODES,
+        default="copy",
+        help="With --manifest, how identical files are placed: separate copies (default), "
+             "hardlinks between projects, or copy-on-write reflinks"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Finish an interrupted bootstrap in --target using its {JOURNAL_FILE}; "
+             "only missing or corrupt files are fetched"
+    )
+    
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Show the files, bytes and requests a bootstrap would involve without writing anything; "
+             "exits 3 if existing files would be overwritten"
+    )
+    
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="With --plan, print the plan as JSON"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a one-line timing summary per phase (tree, fetch, hash, writes) with request, "
+             "byte, retry and cache counters"
+    )
+    
+    parser.add_argument(
+        "--trace-json",
+        type=Path,
+        metavar="FILE",
+        help="Write a Chrome trace-event file of the run (open in chrome://tracing or ui.perfetto.dev)"
+    )
+    
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Bootstrap from the local template cache only (no network)"
+    )
+    
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        metavar="DIR",
+        help=f"Template cache location (default: {default_cache_dir()})"
+    )
+    
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_MB,
+        metavar="MB",
+        help=f"Evict least-recently-used cache entries above this size (default: {DEFAULT_CACHE_MB})"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the local template cache"
+    )
+    
     parser.add_argument(
         "--list-modes",
         action="store_true",
@@ -493,10 +2085,73 @@ Repository: {REPO_URL}
     )
     
     args = parser.parse_args()
+    if args.profile or args.trace_json:
+        tracer.enable()
+    
+    if args.resume:
+        journal = BootstrapJournal.load(args.target)
+        if journal is None:
+            parser.error(f"--resume: no {JOURNAL_FILE} in {args.target}")
+        for name in ("mode", "form", "branch"):
+            recorded = journal.data.get(name)
+            if getattr(args, name) and getattr(args, name) != recorded:
+                parser.error(f"--resume: --{name} {getattr(args, name)} doesn't match the journal ({recorded})")
+            setattr(args, name, recorded)
+        args.source = args.source or journal.data.get("source")
+        args.name = args.name or journal.data.get("name")
+        args.transport = "api"  # The journal tracks per-file progress, which archive mode doesn't use
+    args.branch = args.branch or "main"
+    
+    source = arche_source.configure(args.source, args.cache_dir)
+    if args.offline and not source.cacheable:
+        parser.error("--offline applies to GitHub and HTTP mirror sources; local and git sources don't need it")
+    if args.transport == "archive" and source.archive_url(args.branch) is None:
+        parser.error("--transport archive is only available for the GitHub source")
+    
+    # Local and git sources are already on disk; caching them would only duplicate files
+    cache = configure_cache(args.cache_dir, not args.no_cache and source.cacheable, args.offline, args.cache_size)
+    arche_http.configure(
+        timeout=args.timeout,
+        validator_dir=(args.cache_dir or default_cache_dir()) / "http" if not args.no_cache else None,
+        retries=args.retries,
+        max_concurrency=args.jobs
+    )
+    if args.offline:
+        if cache is None:
+            parser.error("--offline requires the template cache (drop --no-cache)")
+        args.transport = "api"  # Offline runs are served from the cache's tree listing
+    
+    try:
+        return run(args, parser)
+    finally:
+        if cache is not None:
+            try:
+                with tracer.span("prune"):
+                    cache.prune()
+            except OSError:
+                pass
+        if tracer.enabled:
+            tracer.report(args.profile, args.trace_json, run_counters(cache), {
+                "tool": "bootstrap", "argv": sys.argv[1:], "source": source.describe(), "branch": args.branch
+            })
+
+
+def run_counters(cache: Optional[TemplateCache] = None) -> Dict[str, int]:
+    """Network and cache counters for the --profile / --trace-json report."""
+    counters = {name: value for name, value in asdict(get_client().stats).items() if value or name == "requests"}
+    if cache is not None:
+        counters.update(cache_hits=cache.hits, cache_misses=cache.misses)
+    return counters
+
+
+def run(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """Dispatch the parsed command line."""
+    if args.json and not args.plan:
+        parser.error("--json only applies to --plan")
     
     # List modes
     if args.list_modes:
-        print(f"Available modes from {REPO_URL}:\n")
+        print(f"Available modes from {get_source().describe()}:\n")
         modes = list_available_modes(args.branch)
         if modes:
             for mode in modes:
@@ -507,37 +2162,74 @@ Repository: {REPO_URL}
     
     # List forms for a specific mode
     if args.list_forms:
-        print(f"Available forms in '{args.list_forms}' mode from {REPO_URL}:\n")
+        print(f"Available forms in '{args.list_forms}' mode from {get_source().describe()}:\n")
         forms = list_available_forms(args.list_forms, args.branch)
-    enable_telemetry = not args.no_telemetry
-    
-    success = initialize_project(
-        args.mode,
-        args.form,
-        args.target,
-        args.name,
-        args.branch,
-        enable_telemetrydesc:
+        if forms:
+            for form in forms:
+                print(f"  • {form}")
+                config = fetch_project_json(args.list_forms, form, args.branch)
+                desc = config.get("description") if config else None
+                if desc:
                     print(f"    {desc}")
         else:
             print(f"No forms found for mode '{args.list_forms}' or unable to connect to GitHub")
         return 0
     
+    # Bulk mode
+    if args.manifest:
+        if args.mode or args.form or args.resume or args.interactive:
+            parser.error("--manifest can't be combined with --mode, --form, --resume or --interactive")
+        if args.transport == "archive":
+            parser.error("--manifest uses the api transport (one tree listing shared by all projects)")
+        try:
+            projects = load_manifest(args.manifest, args.branch, False if args.no_telemetry else None)
+        except (OSError, ValueError) as e:
+            parser.error(f"--manifest {args.manifest}: {e}")
+        if args.plan:
+            plan = plan_manifest(projects)
+            if args.json:
+                print(json.dumps(plan, indent=2))
+            else:
+                print_manifest_plan(plan)
+            summary = plan["summary"]
+            return 1 if summary["failed"] else 3 if summary["overwrite"] else 0
+        return 0 if bootstrap_manifest(projects, args.jobs, args.link) else 1
+    
+    if args.plan and args.interactive:
+        parser.error("--plan can't be combined with --interactive")
+    
     # Interactive mode
     if args.interactive:
-        success = interactive_mode(args.branch)
+        success = interactive_mode(args.branch, args.jobs, args.transport)
         return 0 if success else 1
     
     # Direct mode - require mode and form
     if not args.mode or not args.form:
         parser.error("--mode and --form are required unless using --interactive, --list-modes, or --list-forms")
     
+    enable_telemetry = not args.no_telemetry
+    
+    if args.plan:
+        plan, error = plan_project(
+            args.mode, args.form, args.target, args.branch, args.name, args.transport, enable_telemetry
+        )
+        if args.json:
+            print(json.dumps(plan if plan else {"error": error}, indent=2))
+        elif plan:
+            print_plan(plan)
+        else:
+            print(f"✗ {error}")
+        return 1 if plan is None else 3 if plan["summary"]["overwrite"] else 0
+    
     success = initialize_project(
         args.mode,
         args.form,
         args.target,
         args.name,
-        args.branch
+        args.branch,
+        enable_telemetry,
+        jobs=args.jobs,
+        transport=args.transport
     )
     
     return 0 if success else 1
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Arche Catalog Builder - Precompute the mode/form catalog used by bootstrap
+
+Walks modes/ in a checkout of the arche repository and writes
+modes/catalog.json: every mode, its shared files, every form with its
+project.json payload, and each file's path, size and git blob SHA.
+bootstrap.py loads this one file instead of listing directories and
+fetching project.json per form.
+
+The output is deterministic (sorted, no timestamps), so CI can check that
+the committed catalog is current.
+
+Usage:
+    python build_catalog.py              # Regenerate modes/catalog.json
+    python build_catalog.py --check      # Exit 1 if the catalog is stale
+    python build_catalog.py --repo PATH  # Catalog another checkout
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from arche_cache import git_blob_sha_file
+from arche_source import CATALOG_PATH, CATALOG_SCHEMA, SKIP_DIRS
+
+
+def tracked_files(repo: Path) -> Optional[List[str]]:
+    """Paths under modes/ known to git, or None outside a git checkout."""
+    try:
+        output = subprocess.run(
+            ["git", "ls-files", "-z", "--", "modes"],
+            cwd=repo, capture_output=True, check=True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return [path for path in output.decode("utf-8").split("\0") if path]
+
+
+def walk_files(repo: Path) -> List[str]:
+    """Paths under modes/ found on disk (fallback when git isn't available)."""
+    paths = []
+    for path in (repo / "modes").rglob("*"):
+        if path.is_file() and not SKIP_DIRS.intersection(path.relative_to(repo).parts):
+            paths.append(path.relative_to(repo).as_posix())
+    return paths
+
+
+def file_entry(repo: Path, path: str) -> Dict:
+    full = repo / path
+    return {"path": path, "size": full.stat().st_size, "sha": git_blob_sha_file(full)}
+
+
+def build_catalog(repo: Path) -> Dict:
+    """Build the catalog for the checkout at ``repo``."""
+    paths = tracked_files(repo)
+    if paths is None:
+        paths = walk_files(repo)
+    paths = sorted(path for path in paths if path != CATALOG_PATH and (repo / path).is_file())
+
+    modes: Dict[str, Dict] = {}
+    for path in paths:
+        parts = path.split("/")
+        # modes/<mode>/..., with files under _shared/ and forms/<form>/
+        if len(parts) < 3 or parts[1].startswith((".", "_")):
+            continue
+        mode = modes.setdefault(parts[1], {"shared": [], "forms": {}})
+
+        if len(parts) < 4:
+            continue
+        if parts[2] == "_shared":
+            mode["shared"].append(file_entry(repo, path))
+        elif parts[2] == "forms" and len(parts) >= 5 and not parts[3].startswith((".", "_")):
+            form = mode["forms"].setdefault(parts[3], {"project": None, "files": []})
+            form["files"].append(file_entry(repo, path))
+            if parts[4:] == ["project.json"]:
+                try:
+                    form["project"] = json.loads((repo / path).read_text())
+                except ValueError as e:
+                    raise SystemExit(f"✗ {path} is not valid JSON: {e}")
+
+    return {"schema": CATALOG_SCHEMA, "modes": {name: modes[name] for name in sorted(modes)}}
+
+
+def render(catalog: Dict) -> str:
+    return json.dumps(catalog, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the arche mode/form catalog")
+    parser.add_argument(
+        "--repo",
+        type=Path,
+        default=Path(__file__).resolve().parent.parent,
+        help="Arche checkout to catalog (default: the one containing this script)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help=f"Where to write the catalog (default: REPO/{CATALOG_PATH})"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Don't write; exit 1 if the existing catalog is out of date"
+    )
+    args = parser.parse_args()
+
+    output = args.output or args.repo / CATALOG_PATH
+    text = render(build_catalog(args.repo))
+
+    if args.check:
+        try:
+            current = output.read_text()
+        except OSError:
+            current = None
+        if current != text:
+            print(f"✗ {output} is out of date. Run: python arche-tools/build_catalog.py")
+            return 1
+        print(f"✓ {output} is up to date")
+        return 0
+
+    output.write_text(text)
+    catalog = json.loads(text)
+    forms = sum(len(mode["forms"]) for mode in catalog["modes"].values())
+    print(f"✓ Wrote {output} ({len(catalog['modes'])} modes, {forms} forms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GitHub endpoints arche tools use.
+
+Serves one directory tree, held in memory, through the same URL shapes as
+GitHub: the recursive git-trees and contents APIs, commits, compare, raw
+files, the codeload tarball and /rate_limit. Reloading the tree under a new
+revision keeps the old one's blob SHAs, so compare can diff any two
+revisions the server has served. Responses carry ETags, so conditional
+requests get 304s as they would from GitHub. For benchmarks and manual
+testing, the server can inject:
+
+- latency: a fixed delay per request (plus optional random jitter)
+- errors: a fraction of requests answered with 503
+- rate limits: an API request budget, after which API calls get 403 with
+  X-RateLimit-Remaining: 0
+
+Requests are counted per endpoint, so a harness can check how many calls a
+run made without relying on the tool's own counters.
+
+Point a tool at the server by patching arche_source's URL constants with
+``FakeGitHub.urls()`` (see benchmark.py). To serve a checkout by hand:
+
+    python fake_github.py --root .. --port 8765 --latency 0.05
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import random
+import tarfile
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+
+from arche_cache import git_blob_sha
+from arche_source import SKIP_DIRS
+
+
+OWNER_REPO = "coreyshort/arche"
+DEFAULT_REVISION = "0123456789abcdef0123456789abcdef01234567"
+
+
+class FakeGitHub:
+    """A threaded HTTP server serving ``root`` as if it were the arche repository."""
+
+    def __init__(
+        self,
+        root: Path,
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[int] = None,
+        revision: str = DEFAULT_REVISION,
+        seed: int = 0
+    ):
+        self.root = Path(root)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.revision = revision
+        self.requests: Counter = Counter()
+        self._seed = seed
+        self._random = random.Random(seed)
+        self._remaining = rate_limit
+        self._lock = threading.Lock()
+        self._archive: Optional[bytes] = None
+        self.files: Dict[str, bytes] = {}
+        self.shas: Dict[str, str] = {}
+        self.history: Dict[str, Dict[str, str]] = {}  # Revision -> blob SHAs, oldest first
+        self.load()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def urls(self) -> Dict[str, str]:
+        """Values for arche_source's URL constants that point at this server."""
+        return {
+            "API_URL": f"{self.url}/repos/{OWNER_REPO}",
+            "RAW_URL": f"{self.url}/raw/{OWNER_REPO}",
+            "ARCHIVE_URL": f"{self.url}/codeload/{OWNER_REPO}/tar.gz",
+            "RATE_LIMIT_URL": f"{self.url}/rate_limit",
+        }
+
+    def start(self) -> "FakeGitHub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeGitHub":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # -- state -------------------------------------------------------------
+
+    def load(self, revision: Optional[str] = None, changes: Optional[Dict[str, Optional[bytes]]] = None):
+        """
+        (Re)read every file under ``root`` into memory, as ``revision`` if given.
+
+        ``changes`` maps paths to contents served instead of what is on disk
+        (None removes the path), to publish a revision without editing ``root``.
+        """
+        files = {}
+        for path in sorted(self.root.rglob("*")):
+            relative = path.relative_to(self.root)
+            if path.is_file() and not SKIP_DIRS.intersection(relative.parts):
+                files[relative.as_posix()] = path.read_bytes()
+        for path, data in (changes or {}).items():
+            if data is None:
+                files.pop(path, None)
+            else:
+                files[path] = data
+        with self._lock:
+            self.files = files
+            self.shas = {path: git_blob_sha(data) for path, data in files.items()}
+            self._archive = None
+            if revision:
+                self.revision = revision
+            self.history.pop(self.revision, None)
+            self.history[self.revision] = self.shas
+
+    def reset(self):
+        """Clear request counts and restore the rate-limit budget and error sequence."""
+        with self._lock:
+            self.requests = Counter()
+            self._remaining = self.rate_limit
+            self._random = random.Random(self._seed)
+
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+    # -- responses ---------------------------------------------------------
+
+    def tree(self) -> Dict:
+        entries = []
+        directories = set()
+        for path, data in self.files.items():
+            parts = path.split("/")
+            for depth in range(1, len(parts)):
+                directories.add("/".join(parts[:depth]))
+            entries.append({"path": path, "mode": "100644", "type": "blob", "sha": self.shas[path], "size": len(data)})
+        for path in directories:
+            entries.append({"path": path, "mode": "040000", "type": "tree", "sha": _tree_sha(path)})
+        entries.sort(key=lambda entry: entry["path"])
+        return {"sha": _tree_sha(self.revision), "tree": entries, "truncated": False}
+
+    def contents(self, path: str) -> Optional[list]:
+        prefix = path.strip("/") + "/"
+        items = {}
+        for name, data in self.files.items():
+            if not name.startswith(prefix):
+                continue
+            child, _, rest = name[len(prefix):].partition("/")
+            full = prefix + child
+            if rest:
+                items.setdefault(child, {"name": child, "path": full, "type": "dir", "sha": _tree_sha(full), "size": 0})
+            else:
+                items[child] = {"name": child, "path": full, "type": "file", "sha": self.shas[name], "size": len(data)}
+        return [items[name] for name in sorted(items)] if items else None
+
+    def resolve(self, ref: str) -> Optional[str]:
+        """Full revision for a (short) SHA the server has served; other refs mean the current one."""
+        if not all(char in "0123456789abcdef" for char in ref):
+            return self.revision
+        matches = [revision for revision in self.history if revision.startswith(ref)]
+        return matches[0] if len(matches) == 1 else None
+
+    def compare(self, base: str, head: str) -> Optional[Dict]:
+        """The compare API's answer for ``base...head`` (None if either is unknown)."""
+        base, head = self.resolve(base), self.resolve(head)
+        if base is None or head is None:
+            return None
+        order = list(self.history)
+        if order.index(base) > order.index(head):
+            return {"status": "behind", "total_commits": 0, "commits": [], "files": []}
+        old, new = self.history[base], self.history[head]
+        files = []
+        for path in sorted(set(old) | set(new)):
+            if old.get(path) == new.get(path):
+                continue
+            status = "added" if path not in old else "removed" if path not in new else "modified"
+            files.append({"filename": path, "status": status, "sha": new.get(path, old.get(path))})
+        status = "identical" if base == head else "ahead"
+        return {"status": status, "total_commits": order.index(head) - order.index(base),
+                "commits": [{"sha": head}] if base != head else [], "files": files}
+
+    def archive(self) -> bytes:
+        with self._lock:
+            if self._archive is None:
+                buffer = io.BytesIO()
+                # Like git archive, record the commit in a pax global header
+                with tarfile.open(fileobj=buffer, mode="w:gz", format=tarfile.PAX_FORMAT,
+                                  pax_headers={"comment": self.revision}) as tar:
+                    for path, data in self.files.items():
+                        info = tarfile.TarInfo(f"arche-{self.revision[:7]}/{path}")
+                        info.size = len(data)
+                        tar.addfile(info, io.BytesIO(data))
+                self._archive = buffer.getvalue()
+            return self._archive
+
+    def delay(self) -> float:
+        """Seconds to hold the next response for."""
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def admit(self, kind: str) -> Optional[int]:
+        """Count a request; returns a status to fail it with, if any."""
+        with self._lock:
+            self.requests[kind] += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 503
+            if kind.startswith("api") and self._remaining is not None:
+                if self._remaining <= 0:
+                    return 403
+                self._remaining -= 1
+        return None
+
+    def rate_headers(self) -> Dict[str, str]:
+        if self.rate_limit is None:
+            return {}
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(self._remaining, 0)),
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+        }
+
+
+def _tree_sha(path: str) -> str:
+    return hashlib.sha1(f"tree {path}".encode("utf-8")).hexdigest()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        fake: FakeGitHub = self.server.fake
+        parts = urllib.parse.urlsplit(self.path)
+        path = urllib.parse.unquote(parts.path)
+        api = f"/repos/{OWNER_REPO}/"
+        raw = f"/raw/{OWNER_REPO}/"
+        codeload = f"/codeload/{OWNER_REPO}/tar.gz/"
+
+        if path.startswith(api + "git/trees/"):
+            kind = "api.trees"
+        elif path.startswith(api + "contents/"):
+            kind = "api.contents"
+        elif path.startswith(api + "commits/"):
+            kind = "api.commits"
+        elif path.startswith(api + "compare/"):
+            kind = "api.compare"
+        elif path.startswith(raw):
+            kind = "raw"
+        elif path.startswith(codeload):
+            kind = "archive"
+        elif path == "/rate_limit":
+            kind = "rate_limit"
+        else:
+            kind = "other"
+
+        time.sleep(fake.delay())
+        failure = fake.admit(kind)
+        if failure == 503:
+            return self._send(503, b'{"message":"Service Unavailable"}')
+        if failure == 403:
+            return self._send(403, b'{"message":"API rate limit exceeded"}', extra=fake.rate_headers())
+        extra = fake.rate_headers() if kind.startswith("api") else {}
+
+        if kind == "api.trees":
+            return self._send(200, json.dumps(fake.tree()).encode("utf-8"), extra=extra)
+        if kind == "api.contents":
+            items = fake.contents(path[len(api + "contents/"):])
+            if items is None:
+                return self._send(404, b'{"message":"Not Found"}', extra=extra)
+            return self._send(200, json.dumps(items).encode("utf-8"), extra=extra)
+        if kind == "api.compare":
+            base, _, head = path[len(api + "compare/"):].partition("...")
+            data = fake.compare(base, head)
+            if data is None:
+                return self._send(404, b'{"message":"Not Found"}', extra=extra)
+            return self._send(200, json.dumps(data).encode("utf-8"), extra=extra)
+        if kind == "api.commits":
+            return self._send(200, json.dumps({"sha": fake.revision}).encode("utf-8"), extra=extra)
+        if kind == "raw":
+            _, _, file_path = path[len(raw):].partition("/")  # Drop the ref
+            data = fake.files.get(file_path)
+            if data is None:
+                return self._send(404, b"404: Not Found", "text/plain")
+            return self._send(200, data, "text/plain")
+        if kind == "archive":
+            return self._send(200, fake.archive(), "application/x-gzip")
+        if kind == "rate_limit":
+            remaining = fake._remaining if fake.rate_limit is not None else 5000
+            body = {"resources": {"core": {"limit": fake.rate_limit or 5000, "remaining": remaining,
+                                           "reset": int(time.time()) + 3600}}}
+            return self._send(200, json.dumps(body).encode("utf-8"))
+        self._send(404, b'{"message":"Not Found"}')
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json", extra: Optional[Dict] = None):
+        headers = dict(extra or {})
+        if status == 200:
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a directory as a fake GitHub for arche tools")
+    parser.add_argument("--root", type=Path, default=Path(__file__).resolve().parent.parent,
+                        help="Tree to serve (default: the arche checkout containing this script)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--latency", type=float, default=0.0, metavar="SECONDS", help="Delay added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, metavar="SECONDS", help="Extra random delay, up to this much")
+    parser.add_argument("--error-rate", type=float, default=0.0, metavar="FRACTION",
+                        help="Fraction of requests answered with 503")
+    parser.add_argument("--rate-limit", type=int, metavar="N", help="API requests allowed before 403 rate-limit responses")
+    args = parser.parse_args()
+
+    fake = FakeGitHub(args.root, args.port, args.latency, args.jitter, args.error_rate, args.rate_limit)
+    print(f"Serving {args.root} ({len(fake.files)} files) at {fake.url}")
+    for name, value in fake.urls().items():
+        print(f"  arche_source.{name} = {value!r}")
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Re-running bootstrap.py, or planning, over a project it just created."""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parents[1]
+
+# A template source with a .gitignore of its own, which bootstrap appends to
+SOURCE_FILES = {
+    "modes/demo/_shared/agents.md": "# Agents\n",
+    "modes/demo/_shared/INSTRUCTIONS.md": "# Instructions\n",
+    "modes/demo/forms/app/project.json": json.dumps({"name": "Demo app", "directories": ["src"]}),
+    "modes/demo/forms/app/README.md": "# Demo\n",
+    "modes/demo/forms/app/.gitignore": "__pycache__/\n",
+}
+
+
+class RerunTest(unittest.TestCase):
+    def setUp(self):
+        self.work = Path(tempfile.mkdtemp(prefix="arche-test-"))
+        self.addCleanup(shutil.rmtree, self.work, ignore_errors=True)
+        for path, text in SOURCE_FILES.items():
+            (self.work / "source" / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.work / "source" / path).write_text(text)
+        self.project = self.work / "project"
+        # Keep the user's cache and ~/.arche-config out of it
+        self.env = dict(os.environ, HOME=str(self.work / "home"), XDG_CACHE_HOME=str(self.work / "cache"))
+
+    def bootstrap(self, *extra: str) -> subprocess.CompletedProcess:
+        command = [
+            sys.executable, str(TOOLS_DIR / "bootstrap.py"), "--mode", "demo", "--form", "app",
+            "--source", str(self.work / "source"), "--target", str(self.project), "--no-telemetry", *extra,
+        ]
+        return subprocess.run(command, env=self.env, capture_output=True, text=True)
+
+    def files(self):
+        return {
+            path.relative_to(self.project).as_posix(): path.read_bytes()
+            for path in self.project.rglob("*") if path.is_file() and ".arche-backups" not in path.parts
+        }
+
+    def test_rerun_writes_nothing(self):
+        first = self.bootstrap()
+        self.assertEqual(first.returncode, 0, first.stdout + first.stderr)
+        before = self.files()
+        gitignore = before[".gitignore"].decode()
+        self.assertTrue(gitignore.startswith("__pycache__/\n"))
+        self.assertEqual(gitignore.count(".arche-config"), 1)
+
+        second = self.bootstrap()
+        self.assertEqual(second.returncode, 0, second.stdout + second.stderr)
+        self.assertIn("Files copied: 0", second.stdout)
+        after = self.files()
+        for name in ("agents.md", "INSTRUCTIONS.md", "README.md", ".gitignore"):
+            self.assertEqual(after[name], before[name], name)
+
+    def test_plan_after_bootstrap_reports_no_overwrites(self):
+        self.assertEqual(self.bootstrap().returncode, 0)
+        plan = self.bootstrap("--plan", "--json")
+        self.assertEqual(plan.returncode, 0, plan.stdout + plan.stderr)  # 3 if anything would be overwritten
+        summary = json.loads(plan.stdout)["summary"]
+        self.assertEqual((summary["overwrite"], summary["create"]), (0, 0))
+        self.assertEqual(summary["unchanged"], summary["files"])
+
+    def test_plan_reports_a_local_edit(self):
+        self.assertEqual(self.bootstrap().returncode, 0)
+        (self.project / "README.md").write_text("# Edited\n")
+        plan = self.bootstrap("--plan", "--json")
+        self.assertEqual(plan.returncode, 3)
+        files = {entry["path"]: entry["action"] for entry in json.loads(plan.stdout)["files"]}
+        self.assertEqual(files["README.md"], "overwrite")
+        self.assertEqual(files[".gitignore"], "unchanged")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Staging, committing and recovering project updates (arche_journal)."""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import arche_journal
+from arche_journal import JOURNAL, TXN_DIR, Transaction, TransactionBusy, recover
+
+
+class RecoverTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp(prefix="arche-test-"))
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        (self.root / "agents.md").write_text("old agents\n")
+        (self.root / "init_env.md").write_text("old init\n")
+        (self.root / "agents.md.rej").write_text("old rejects\n")
+
+    def contents(self):
+        return {path.name: path.read_text() for path in sorted(self.root.iterdir()) if path.is_file()}
+
+    def stage(self) -> Transaction:
+        txn = Transaction(self.root)
+        txn.write("agents.md", b"new agents\n")
+        txn.write("init_env.md", b"new init\n")
+        txn.delete("agents.md.rej")
+        return txn
+
+    def test_nothing_to_recover(self):
+        self.assertIsNone(recover(self.root))
+        self.assertFalse((self.root / ".arche-backups").exists())
+
+    def test_commit(self):
+        with self.stage() as txn:
+            txn.commit(version="abc1234")
+        self.assertEqual(self.contents(), {"agents.md": "new agents\n", "init_env.md": "new init\n"})
+        self.assertFalse((self.root / TXN_DIR).exists())
+
+    def test_crash_after_staging_is_discarded(self):
+        before = self.contents()
+        txn = self.stage()
+        txn._unlock()  # The process dies: the OS drops its lock, the staged files stay
+        self.assertTrue((self.root / TXN_DIR).is_dir())
+
+        self.assertEqual(recover(self.root), "discarded")
+        self.assertEqual(self.contents(), before)
+        self.assertFalse((self.root / TXN_DIR).exists())
+
+    def test_crash_mid_commit_is_finished(self):
+        def interrupted(root, journal):
+            # Carry out the first op only, then die
+            first = journal["ops"][0]
+            os.replace(root / TXN_DIR / first["staged"], root / first["path"])
+            raise KeyboardInterrupt
+
+        with mock.patch.object(arche_journal, "_replay", side_effect=interrupted):
+            with self.assertRaises(KeyboardInterrupt), self.stage() as txn:
+                txn.commit(version="abc1234")
+        self.assertEqual(self.contents()["agents.md"], "new agents\n")
+        self.assertEqual(self.contents()["init_env.md"], "old init\n")
+        self.assertTrue((self.root / TXN_DIR / JOURNAL).is_file())
+
+        self.assertEqual(recover(self.root), "committed")
+        self.assertEqual(self.contents(), {"agents.md": "new agents\n", "init_env.md": "new init\n"})
+        self.assertFalse((self.root / TXN_DIR).exists())
+        self.assertIsNone(recover(self.root))
+
+    def test_unreadable_journal_is_dropped(self):
+        txn = self.stage()
+        (self.root / TXN_DIR / JOURNAL).write_text("{not json")
+        txn._unlock()
+        self.assertEqual(recover(self.root), "corrupt")
+        self.assertEqual(self.contents()["agents.md"], "old agents\n")
+        self.assertFalse((self.root / TXN_DIR).exists())
+
+    def test_new_transaction_recovers_first(self):
+        txn = self.stage()
+        txn._unlock()
+        with Transaction(self.root) as second:
+            second.write("INSTRUCTIONS.md", b"instructions\n")
+            second.commit()
+        self.assertEqual(self.contents()["agents.md"], "old agents\n")
+        self.assertEqual(self.contents()["INSTRUCTIONS.md"], "instructions\n")
+
+    def test_second_transaction_is_busy(self):
+        with self.stage():
+            with self.assertRaises(TransactionBusy):
+                Transaction(self.root)
+        # Aborted on the way out, and the lock is free again
+        self.assertEqual(self.contents()["agents.md"], "old agents\n")
+        Transaction(self.root).abort()
+
+
+if __name__ == "__main__":
+    unittest.main()
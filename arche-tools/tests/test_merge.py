@@ -0,0 +1,98 @@
+"""Three-way merges of framework files (arche_merge.merge3)."""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from arche_merge import merge3, render, render_rejects
+
+BASE = "one\ntwo\nthree\nfour\nfive\nsix\nseven\n"
+
+
+def merged(base: str, local: str, upstream: str) -> str:
+    result = merge3(base, local, upstream)
+    if result.conflicts:
+        raise AssertionError(f"unexpected conflicts: {result.conflicts}")
+    return render(result)
+
+
+class CleanMergeTest(unittest.TestCase):
+    def test_edits_to_different_lines_are_both_kept(self):
+        local = BASE.replace("two\n", "two (local)\n")
+        upstream = BASE.replace("six\n", "six (upstream)\n")
+        self.assertEqual(merged(BASE, local, upstream), BASE.replace("two\n", "two (local)\n").replace("six\n", "six (upstream)\n"))
+
+    def test_same_edit_on_both_sides_is_taken_once(self):
+        both = BASE.replace("four\n", "FOUR\n")
+        self.assertEqual(merged(BASE, both, both), both)
+
+    def test_unchanged_local_takes_upstream(self):
+        upstream = BASE.replace("three\n", "") + "eight\n"
+        self.assertEqual(merged(BASE, BASE, upstream), upstream)
+
+    def test_insert_at_start_and_append_at_end(self):
+        local = "# local notes\n" + BASE
+        upstream = BASE + "eight\n"
+        self.assertEqual(merged(BASE, local, upstream), "# local notes\n" + BASE + "eight\n")
+
+    def test_edit_first_and_last_line(self):
+        local = BASE.replace("one\n", "ONE\n")
+        upstream = BASE.replace("seven\n", "SEVEN\n")
+        self.assertEqual(merged(BASE, local, upstream), BASE.replace("one\n", "ONE\n").replace("seven\n", "SEVEN\n"))
+
+    def test_last_line_without_newline(self):
+        base = BASE.rstrip("\n")
+        local = base.replace("one", "ONE")
+        upstream = base.replace("seven", "SEVEN")
+        self.assertEqual(merged(base, local, upstream), "ONE\ntwo\nthree\nfour\nfive\nsix\nSEVEN")
+
+    def test_line_endings_are_ignored_when_matching(self):
+        local = BASE.replace("\n", "\r\n").replace("two\r\n", "two (local)\r\n")
+        upstream = BASE.replace("six\n", "six (upstream)\n")
+        result = merged(BASE, local, upstream)
+        self.assertIn("two (local)\r\n", result)
+        self.assertIn("six (upstream)\n", result)
+
+
+class ConflictTest(unittest.TestCase):
+    def test_both_sides_change_the_same_line(self):
+        local = BASE.replace("four\n", "four (local)\n")
+        upstream = BASE.replace("four\n", "four (upstream)\n")
+        result = merge3(BASE, local, upstream)
+        self.assertEqual(len(result.conflicts), 1)
+        conflict = result.conflicts[0]
+        self.assertEqual((conflict.base, conflict.local, conflict.upstream), (["four\n"], ["four (local)\n"], ["four (upstream)\n"]))
+        self.assertEqual(
+            render(result),
+            "one\ntwo\nthree\n<<<<<<< local\nfour (local)\n=======\nfour (upstream)\n>>>>>>> upstream\nfive\nsix\nseven\n",
+        )
+
+    def test_rejects_keep_local_lines(self):
+        local = BASE.replace("four\n", "four (local)\n")
+        upstream = BASE.replace("four\n", "four (upstream)\n").replace("one\n", "ONE\n")
+        text, rejects = render_rejects(merge3(BASE, local, upstream), "agents.md")
+        self.assertEqual(text, "ONE\ntwo\nthree\nfour (local)\nfive\nsix\nseven\n")
+        self.assertEqual(rejects, "--- agents.md\n+++ agents.md (upstream)\n@@ -4,1 +4,1 @@\n-four (local)\n+four (upstream)\n")
+
+    def test_both_sides_append_at_end(self):
+        result = merge3(BASE, BASE + "local\n", BASE + "upstream\n")
+        self.assertEqual(len(result.conflicts), 1)
+        self.assertEqual((result.conflicts[0].local, result.conflicts[0].upstream), (["local\n"], ["upstream\n"]))
+        self.assertTrue(render(result).startswith(BASE + "<<<<<<< local\n"))
+
+    def test_both_sides_change_the_first_line(self):
+        result = merge3(BASE, BASE.replace("one", "local"), BASE.replace("one", "upstream"))
+        self.assertEqual(len(result.conflicts), 1)
+        self.assertTrue(render(result).startswith("<<<<<<< local\nlocal\n=======\nupstream\n>>>>>>> upstream\ntwo\n"))
+
+    def test_conflict_on_last_line_without_newline(self):
+        base = BASE.rstrip("\n")
+        result = merge3(base, base.replace("seven", "local"), base.replace("seven", "upstream"))
+        # The markers stay on lines of their own
+        self.assertTrue(render(result).endswith("<<<<<<< local\nlocal\n=======\nupstream\n>>>>>>> upstream\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,10 +7,14 @@ according to your configured update strategy.
 
 Usage:
     python update_arche.py --check              # Check for updates
+    python update_arche.py --status             # Last check, no network (for shell hooks)
     python update_arche.py --diff               # Show what would change
     python update_arche.py --apply              # Apply updates
     python update_arche.py --set-strategy auto  # Change update strategy
     python update_arche.py --rollback TIMESTAMP # Rollback to backup
+    python update_arche.py --list-backups       # List backup snapshots
+    python update_arche.py --gc --keep 5        # Prune old backups
+    python update_arche.py --fleet ~/monorepo   # Check every project below a directory
 
 Update Strategies:
     auto   - Automatically apply updates (default)
@@ -20,20 +24,64 @@ Update Strategies:
 """
 
 import argparse
+import io
 import json
+import os
+import subprocess
 import sys
-import urllib.request
+import time
 import urllib.error
 from pathlib import Path
 from datetime import datetime, timedelta
-import shutil
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import arche_http
+except ModuleNotFoundError as e:
+    if e.name != "arche_http":
+        raise
+    # Downloaded on its own: the arche_*.py modules it imports live next to it
+    sys.exit(
+        "✗ update_arche.py needs the arche_*.py modules from the same folder. Download the whole folder:\n"
+        "   curl -fsSL https://codeload.github.com/coreyshort/arche/tar.gz/main | tar -xz --strip-components=1 arche-main/arche-tools\n"
+        "   python arche-tools/update_arche.py --help"
+    )
+import arche_source
+from arche_backup import DEFAULT_KEEP, BackupStore
+from arche_cache import (
+    FINGERPRINT_FILE, TemplateCache, configure_fingerprints, default_cache_dir, fingerprints, git_blob_sha, materialize
+)
+from arche_http import describe_error, get_client
+from arche_journal import Transaction, TransactionBusy, locked, recover
+from arche_lock import LOCK_FILE, ProjectLock
+from arche_merge import diff_hunks, merge3, render, render_rejects, unified_diff
+from arche_source import get_source
+from arche_trace import tracer
+
 
 REPO_URL = "https://github.com/coreyshort/arche"
-RAW_URL = "https://raw.githubusercontent.com/coreyshort/arche"
-API_URL = "https://api.github.com/repos/coreyshort/arche"
+
+# Files under modes/<mode>/_shared that updates manage
+FRAMEWORK_FILES = ["agents.md", "INSTRUCTIONS.md", "init_env.md"]
+
+# Directories a --fleet search doesn't descend into (besides hidden ones)
+FLEET_SKIP_DIRS = {"node_modules", "__pycache__", "venv", "site-packages"}
+DEFAULT_JOBS = 8
+
+# Recorded update checks answer --status for this long (.arche-config:
+# update_check_ttl_hours); a failed check is retried sooner
+CHECK_TTL_HOURS = 24
+RETRY_AFTER_ERROR = 3600  # Seconds
+REFRESH_TIMEOUT = 600  # Seconds before an unfinished background refresh is retried
+
+# (source, branch) -> revision, resolved once per run so check and apply agree
+_latest_versions: Dict[Tuple[str, str], Optional[str]] = {}
+
+# --cache-dir, which takes precedence over the one a project recorded
+_cache_dir: Optional[Path] = None
 
 
 def load_config() -> Dict:
@@ -45,60 +93,153 @@ def load_config() -> Dict:
         sys.exit(1)
     
     try:
-        return json.loads(config_file.read_text())
+        return read_config(Path("."))
     except json.JSONDecodeError as e:
         print(f"✗ Invalid .arche-config: {e}")
         sys.exit(1)
 
 
-def save_config(config: Dict):
-    """Save config to .arche-config."""
-    config_file = Path(".arche-config")
-    config_file.write_text(json.dumps(config, indent=2))
+def project_cache_dir(config: Dict) -> Path:
+    """
+    The template cache a project's merge bases are looked up in: --cache-dir,
+    else the one bootstrap was given (``cache_dir`` in .arche-config), else
+    the default.
+    """
+    recorded = config.get("cache_dir")
+    return _cache_dir or (Path(recorded) if recorded else default_cache_dir())
+
 
+def read_config(root: Path) -> Dict:
+    """Parse ``root``/.arche-config (raises OSError or ValueError)."""
+    config = json.loads((root / ".arche-config").read_text())
+    if not isinstance(config, dict):
+        raise ValueError("expected a JSON object")
+    return config
 
-def get_file_hash(file_path: Path) -> str:
-    """Get SHA256 hash of file contents."""
-    if not file_path.exists():
-        return ""
-    return hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+def config_bytes(config: Dict) -> bytes:
+    """The contents of .arche-config for ``config``."""
+    return json.dumps(config, indent=2).encode("utf-8")
+
+
+def save_config(config: Dict, root: Path = Path(".")):
+    """Save config to .arche-config."""
+    config_file = root / ".arche-config"
+    config_file.write_bytes(config_bytes(config))
 
 
 def fetch_latest_version(branch: str = "main") -> Optional[str]:
-    """Fetch latest commit SHA or tag from GitHub."""
+    """Fetch latest commit SHA (or source revision) for the branch, once per run."""
+    key = (get_source().describe(), branch)
+    if _latest_versions.get(key):
+        return _latest_versions[key]
     try:
-        url = f"{API_URL}/commits/{branch}"
-        with urllib.request.urlopen(url) as response:
-            data = json.loads(response.read())
-            return data["sha"][:7]  # Short SHA
-    except urllib.error.URLError:
-        print("⚠ Unable to check for updates (no internet connection)")
+        with tracer.span("version", branch=branch):
+            _latest_versions[key] = get_source().revision(branch)
+            return _latest_versions[key]
+    except urllib.error.URLError as e:
+        print(f"⚠ Unable to check for updates ({describe_error(e)})")
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠ Unable to check for updates ({e})")
         return None
 
 
-def fetch_framework_files(mode: str, branch: str = "main") -> Dict[str, str]:
-    """Fetch framework files from GitHub for the specified mode."""
+def fetch_framework_files(mode: str, branch: str = "main", names: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Fetch framework files (all, or just ``names``) from the template source for the specified mode.
+    
+    Files that can't be read are left out: missing ones silently (not every
+    mode has them all), ones that aren't UTF-8 text with a warning on stderr,
+    which keeps --json output intact.
+    """
     files = {}
     base_path = f"modes/{mode}/_shared"
     
-    # Common framework files
-    framework_files = ["agents.md", "INSTRUCTIONS.md", "init_env.md"]
-    
-    for filename in framework_files:
-        url = f"{RAW_URL}/{branch}/{base_path}/{filename}"
+    for filename in FRAMEWORK_FILES if names is None else names:
         try:
-            with urllib.request.urlopen(url) as response:
-                files[filename] = response.read().decode('utf-8')
-        except urllib.error.URLError:
+            with tracer.span("fetch", path=f"{base_path}/{filename}"):
+                files[filename] = get_source().read(f"{base_path}/{filename}", branch).decode('utf-8')
+        except OSError:
             # File might not exist in this mode
             continue
+        except ValueError as e:
+            print(f"⚠ {base_path}/{filename} is not UTF-8 text ({e}); skipped", file=sys.stderr)
     
     return files
 
 
-def check_for_updates(config: Dict, verbose: bool = True) -> Tuple[bool, Dict[str, str]]:
+def fetch_remote_shas(
+    mode: str, branch: str = "main", since: Optional[str] = None, until: Optional[str] = None
+) -> Optional[Dict[str, str]]:
+    """
+    Upstream blob SHAs of the framework files, without downloading any.
+    
+    Given the revision the lock was written at (``since``) and the target
+    revision (``until``), the source is asked which files under the mode's
+    _shared folder changed in between, and only those are returned; a
+    release that touched nothing there costs one request. Otherwise, or if
+    the source can't compare the two, all SHAs come from one tree listing.
+    Returns None if neither works, and the caller then falls back to
+    downloading the files.
+    """
+    base_path = f"modes/{mode}/_shared/"
+    if since and until:
+        try:
+            with tracer.span("compare", base=since, head=until):
+                changes = get_source().changes(since, until, base_path)
+        except (OSError, ValueError, KeyError):
+            changes = None  # Unknown base (force push, pin) or no compare API: list the tree
+        if changes is not None:
+            return {name: sha for name, sha in changes.items() if name in FRAMEWORK_FILES and sha}
+    
+    try:
+        with tracer.span("tree", branch=branch):
+            tree = get_source().tree(branch)
+    except urllib.error.URLError as e:
+        print(f"⚠ Tree listing failed ({describe_error(e)}); comparing file contents instead")
+        return None
+    except (OSError, ValueError, KeyError):
+        return None
+    if tree is None:
+        return None
+    return framework_shas(tree, mode)
+
+
+def framework_shas(tree: Dict, mode: str) -> Dict[str, str]:
+    """Blob SHAs of ``mode``'s framework files in a tree listing."""
+    base_path = f"modes/{mode}/_shared/"
+    wanted = {base_path + name for name in FRAMEWORK_FILES}
+    return {
+        entry["path"][len(base_path):]: entry["sha"]
+        for entry in tree["tree"] if entry.get("type") == "blob" and entry["path"] in wanted
+    }
+
+
+def outdated_files(lock: ProjectLock, remote: Dict[str, str]) -> List[str]:
+    """Framework files whose upstream SHA in ``remote`` differs from the one installed."""
+    return [name for name in FRAMEWORK_FILES if name in remote and (lock.entry(name) or {}).get("sha") != remote[name]]
+
+
+def planned_api_requests(root: Path = Path(".")) -> int:
+    """
+    GitHub API requests an update plans: the version lookup, then with an
+    .arche-lock a compare against the locked revision (or, without one, a
+    tree listing). Changed files come from raw URLs, outside the API quota.
+    """
+    lock = ProjectLock.load(root)
+    return 1 if lock is None else 2
+
+
+def check_for_updates(config: Dict, verbose: bool = True, fetch: bool = True) -> Tuple[bool, Dict[str, Optional[str]]]:
     """
     Check if updates are available.
+    
+    With an .arche-lock, upstream blob SHAs (of the files changed since the
+    lock's revision, or from a tree listing) are compared with the locked
+    ones, and only changed files are downloaded (none unless ``fetch``;
+    their contents are then None). Without a lock, every framework file is
+    downloaded and hashed.
     Returns: (updates_available, files_dict)
     """
     mode = config.get("mode")
@@ -122,7 +263,30 @@ def check_for_updates(config: Dict, verbose: bool = True) -> Tuple[bool, Dict[st
             print("✓ You're up to date!")
         return False, {}
     
-    # Fetch latest files
+    lock = ProjectLock.load(Path.cwd())
+    remote = fetch_remote_shas(mode, branch, lock.data.get("revision"), latest_version) if lock is not None else None
+    if remote is not None:
+        changed = outdated_files(lock, remote)
+        if not changed:
+            if verbose:
+                print("✓ Framework files are up to date")
+            return False, {}
+        
+        changed_files: Dict[str, Optional[str]] = dict.fromkeys(changed)
+        if fetch:
+            changed_files.update(fetch_framework_files(mode, branch, changed))
+            if any(content is None for content in changed_files.values()):
+                if verbose:
+                    print("✗ Unable to fetch framework files")
+                return False, {}
+        if verbose:
+            print(f"\n📦 Updates available:")
+            for filename in changed:
+                note = " (locally modified)" if lock.is_modified(filename) else ""
+                print(f"   • {filename}{note}")
+        return True, changed_files
+    
+    # No lock (or no tree listing): fetch latest files and compare contents
     latest_files = fetch_framework_files(mode, branch)
     
     if not latest_files:
@@ -139,8 +303,9 @@ def check_for_updates(config: Dict, verbose: bool = True) -> Tuple[bool, Dict[st
             changed_files[filename] = content
             continue
         
-        local_hash = get_file_hash(local_file)
-        remote_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        with tracer.span("hash", path=str(local_file)):
+            local_hash = fingerprints().blob_sha(local_file)
+        remote_hash = git_blob_sha(content.encode('utf-8'))
         
         if local_hash != remote_hash:
             changed_files[filename] = content
@@ -153,132 +318,363 @@ def check_for_updates(config: Dict, verbose: bool = True) -> Tuple[bool, Dict[st
     return bool(changed_files), changed_files
 
 
-def show_diff(config: Dict):
-    """Show diff of what would change."""
+def show_diff(config: Dict, as_json: bool = False) -> Dict:
+    """
+    Show what an update would change, as unified diffs of each local file
+    against upstream (or, ``as_json``, as a JSON change report).
+    
+    Each local file is read once; diffs are written out as they are
+    produced. Returns the report.
+    """
     mode = config.get("mode")
     branch = config.get("branch", "main")
+    echo = (lambda *args, **kwargs: None) if as_json else print
     
-    print(f"📋 Checking differences for {mode} mode...\n")
+    echo(f"📋 Checking differences for {mode} mode...\n")
     
-    latest_files = fetch_framework_files(mode, branch)
+    # With a lock, only files changed upstream need downloading
+    lock = ProjectLock.load(Path.cwd())
+    latest_version = fetch_latest_version(branch)
+    remote = None
+    if lock is not None and latest_version:
+        remote = fetch_remote_shas(mode, branch, lock.data.get("revision"), latest_version)
+    report = {
+        "mode": mode,
+        "branch": branch,
+        "version": config.get("arche_version"),
+        "latest": latest_version,
+        "files": {},
+    }
+    if remote is not None:
+        changed = outdated_files(lock, remote)
+        latest_files = fetch_framework_files(mode, branch, changed)
+        for filename in FRAMEWORK_FILES:
+            if filename in changed or lock.entry(filename) is None:
+                continue
+            if lock.is_modified(filename):
+                report["files"][filename] = {"status": "local"}
+                echo(f"✎ {filename} (local changes, no upstream update)")
+            else:
+                report["files"][filename] = {"status": "unchanged"}
+                echo(f"✓ {filename} (unchanged)")
+    else:
+        latest_files = fetch_framework_files(mode, branch)
     
     for filename, new_content in latest_files.items():
-        local_file = Path(filename)
-        
-        if not local_file.exists():
-            print(f"➕ {filename} (new file)")
-            print(f"   {len(new_content.splitlines())} lines")
+        new_data = new_content.encode("utf-8")
+        try:
+            old_data = Path(filename).read_bytes()
+        except FileNotFoundError:
+            old_data = None
+        if old_data == new_data:
+            report["files"][filename] = {"status": "unchanged"}
+            echo(f"✓ {filename} (unchanged)")
             continue
         
-        old_content = local_file.read_text()
-        old_hash = get_file_hash(local_file)
-        new_hash = hashlib.sha256(new_content.encode('utf-8')).hexdigest()
+        old_lines = old_data.decode("utf-8", errors="replace").splitlines(keepends=True) if old_data is not None else []
+        new_lines = new_content.splitlines(keepends=True)
+        hunks = diff_hunks(old_lines, new_lines)
+        entry = {
+            "status": "added" if old_data is None else "modified",
+            "lines_added": sum(hunk.added for hunk in hunks),
+            "lines_removed": sum(hunk.removed for hunk in hunks),
+            "hunks": len(hunks),
+            "bytes_before": len(old_data) if old_data is not None else 0,
+            "bytes_after": len(new_data),
+        }
+        endings = _line_ending(old_lines), _line_ending(new_lines)
+        if old_data is not None and endings[0] != endings[1]:
+            entry["line_endings"] = list(endings)
+        if old_data is not None and lock is not None and lock.is_modified(filename):
+            # What apply_updates will do with the local edits
+            entry["locally_modified"] = True
+            locked = lock.entry(filename)
+            if locked.get("pending") == git_blob_sha(new_data) and not Path(f"{filename}.arche-new").exists():
+                entry["on_apply"] = "record"
+            elif find_base(filename, locked.get("sha"), cache=TemplateCache(project_cache_dir(config))) is not None:
+                entry["on_apply"] = "merge"
+            else:
+                entry["on_apply"] = "arche-new"
+        report["files"][filename] = entry
         
-        if old_hash != new_hash:
-            print(f"📝 {filename} (modified)")
-            old_lines = old_content.splitlines()
-            new_lines = new_content.splitlines()
-            print(f"   {len(old_lines)} lines → {len(new_lines)} lines")
-            # Could add actual diff here using difflib
-        else:
-            print(f"✓ {filename} (unchanged)")
+        icon, note = ("➕", "new file") if old_data is None else ("📝", "modified")
+        note += {
+            "record": ", merged by hand; --apply records it",
+            "merge": ", local edits will be merged",
+            "arche-new": f", local edits are kept and the update saved as {filename}.arche-new",
+        }.get(entry.get("on_apply"), "")
+        echo(f"{icon} {filename} ({note}): +{entry['lines_added']} -{entry['lines_removed']} in {len(hunks)} hunk(s)")
+        if "line_endings" in entry:
+            echo(f"   Line endings change from {endings[0]} to {endings[1]}")
+        if not as_json:
+            for line in unified_diff(old_lines, new_lines, hunks,
+                                     "/dev/null" if old_data is None else f"a/{filename}", f"b/{filename}"):
+                sys.stdout.write(line)
+        echo()
     
-    print()
+    files = report["files"].values()
+    report["summary"] = {
+        "files_changed": sum(entry["status"] in ("added", "modified") for entry in files),
+        "lines_added": sum(entry.get("lines_added", 0) for entry in files),
+        "lines_removed": sum(entry.get("lines_removed", 0) for entry in files),
+    }
+    if as_json:
+        print(json.dumps(report, indent=2))
+    else:
+        print()
+    return report
 
 
-def create_backup() -> str:
-    """Create backup of current framework files."""
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    backup_dir = Path(".arche-backups") / timestamp
-    backup_dir.mkdir(parents=True, exist_ok=True)
-    
-    framework_files = ["agents.md", "INSTRUCTIONS.md", "init_env.md"]
-    
-    for filename in framework_files:
-        source = Path(filename)
-        if source.exists():
-            dest = backup_dir / filename
-            shutil.copy2(source, dest)
+def _line_ending(lines: List[str]) -> str:
+    """"CRLF" if most of ``lines`` end that way, else "LF"."""
+    crlf = sum(line.endswith("\r\n") for line in lines)
+    return "CRLF" if crlf * 2 > len(lines) else "LF"
+
+
+def find_base(
+    filename: str, sha: Optional[str], root: Path = Path("."), cache: Optional[TemplateCache] = None
+) -> Optional[str]:
+    """
+    The upstream version (blob ``sha``) a framework file was installed from.
     
-    # Also backup config
-    config_source = Path(".arche-config")
-    if config_source.exists():
-        shutil.copy2(config_source, backup_dir / ".arche-config")
+    Looked up in the template ``cache`` (the default one if not given),
+    then in the project's backup store, where bootstrap and every apply
+    keep the upstream files they install. None if neither has it.
+    """
+    if not sha:
+        return None
+    cache = cache or TemplateCache(default_cache_dir())
+    for data in (cache.get(sha), BackupStore(root).get(sha)):
+        if data is not None and git_blob_sha(data) == sha:
+            return data.decode("utf-8")
+    return None
+
+
+def create_backup(version: Optional[str] = None, root: Path = Path(".")) -> str:
+    """
+    Snapshot the framework files, config and lock; returns the snapshot id.
     
-    return timestamp
+    Only contents the backup store doesn't have yet are written.
+    """
+    return BackupStore(root).snapshot([*FRAMEWORK_FILES, ".arche-config", LOCK_FILE], version).id
+
+
+def prune_backups(
+    store: BackupStore, keep: Optional[int], keep_days: Optional[float], verbose: bool = False, quiet: bool = False
+):
+    """Apply a retention policy, then drop file contents no snapshot or merge base needs."""
+    deleted = store.prune(keep, keep_days)
+    lock = ProjectLock.load(store.root)
+    bases = [sha for entry in lock.files.values() for sha in (entry.get("sha"), entry.get("pending")) if sha] if lock else []
+    freed = store.gc(keep=bases)
+    if (verbose or deleted) and not quiet:
+        print(f"   🧹 Removed {len(deleted)} old backup(s), freed {freed / 1024:.1f} KB")
 
 
-def apply_updates(config: Dict, files: Dict[str, str], auto: bool = False) -> bool:
-    """Apply updates to local files."""
+def list_backups():
+    """Print every backup snapshot, oldest first."""
+    store = BackupStore(Path.cwd())
+    snapshots = store.snapshots()
+    if not snapshots:
+        print("No backups yet")
+        return
+    print(f"💾 Backups in .arche-backups/ ({store.size() / 1024:.1f} KB):")
+    for snapshot in snapshots:
+        version = f" · version {snapshot.version}" if snapshot.version else ""
+        legacy = " · legacy copy" if snapshot.legacy is not None else ""
+        print(f"   {snapshot.id}  {snapshot.created_at:%Y-%m-%d %H:%M}  {len(snapshot.files)} file(s){version}{legacy}")
+    print(f"\n   To rollback: python update_arche.py --rollback {snapshots[-1].id}")
+
+
+def apply_updates(
+    config: Dict,
+    files: Dict[str, str],
+    auto: bool = False,
+    force: bool = False,
+    conflicts: str = "markers",
+    root: Path = Path("."),
+    quiet: bool = False,
+    summary: Optional[Dict[str, List[str]]] = None
+) -> bool:
+    """
+    Apply updates to local files and record them in .arche-lock.
+    
+    The new files, .arche-config and .arche-lock are staged and then
+    committed as one transaction (see arche_journal.py), so an interrupted
+    apply either never happened or is finished by the next run.
+    
+    A file whose contents no longer match the lock has been edited locally
+    (``force`` overwrites it anyway). The local edits and the upstream
+    changes are merged line by line against the version the file was
+    installed from. Where both changed the same lines, the file gets
+    conflict markers, or with ``conflicts="rej"`` keeps the local lines and
+    the upstream hunks go to ``<file>.rej``.
+    
+    If that base version can't be found, the file is kept and the update is
+    written next to it as ``<file>.arche-new``. Once the user has merged it
+    and deleted the .arche-new file, the next apply records the update as
+    taken. Merged files still count as locally modified, so later updates
+    merge again rather than overwrite.
+    
+    ``root`` is the project directory. ``quiet`` suppresses the progress
+    output, and ``summary`` (if given) receives the files that were
+    "updated", "merged", "conflicts" and "kept", plus the "backup" id, or
+    the "error" that stopped the update.
+    """
+    echo = (lambda *args, **kwargs: None) if quiet else print
     if not files:
-        print("✓ No updates to apply")
+        echo("✓ No updates to apply")
         return True
     
-    print(f"\n📦 Applying updates...")
+    def fail(reason: str) -> bool:
+        echo(f"✗ {reason}; nothing was changed")
+        if summary is not None:
+            summary["error"] = [reason]
+        return False
+    
+    latest_version = fetch_latest_version(config.get("branch", "main"))
+    if not latest_version:
+        return fail("Unable to resolve the latest version")
     
-    # Create backup
-    print("   Creating backup...")
-    timestamp = create_backup()
-    print(f"   ✓ Backup created: .arche-backups/{timestamp}/")
+    echo(f"\n📦 Applying updates...")
     
-    # Apply changes
-    for filename, content in files.items():
-        local_file = Path(filename)
+    # Backups, staging and the commit hold the project's transaction lock
+    try:
+        txn = Transaction(root)
+    except TransactionBusy as e:
+        return fail(str(e))
+    with txn:
+        # Create backup
+        echo("   Creating backup...")
+        with tracer.span("backup"):
+            timestamp = create_backup(config.get("arche_version"), root)
+            echo(f"   ✓ Backup created: {timestamp}")
+            prune_backups(BackupStore(root), config.get("backup_keep", DEFAULT_KEEP), config.get("backup_keep_days"), quiet=quiet)
         
-        # Check if file was modified by user
-        if local_file.exists():
-            # Simple check: compare with last known version
-            # (In full implementation, would track original hashes)
-            pass
+        # Projects bootstrapped before the lock existed get one now
+        lock = ProjectLock.load(root) or ProjectLock.create(
+            root, mode=config.get("mode"), form=config.get("form"), branch=config.get("branch", "main")
+        )
+        base_path = f"modes/{config.get('mode')}/_shared"
+        store = TemplateCache(project_cache_dir(config))
+        backups = BackupStore(root)
         
-        print(f"   Updating {filename}...")
-        local_file.write_text(content)
-        print(f"   ✓ {filename} updated")
-    
-    # Update config
-    latest_version = fetch_latest_version(config.get("branch", "main"))
-    if latest_version:
-        config["arche_version"] = latest_version
-        config["last_update_check"] = datetime.now().strftime("%Y-%m-%d")
-        save_config(config)
+        # Stage every change; nothing in the project is touched until the commit
+        # below (if this run dies first, the next one discards the staged files)
+        kept = []
+        conflicted = []
+        merged = []
+        updated = []
+        for filename, content in files.items():
+            local_file = root / filename
+            side_file = root / f"{filename}.arche-new"
+            reject_file = root / f"{filename}.rej"
+            sha = git_blob_sha(content.encode("utf-8"))
+            # Base for merging the next update
+            store.put(sha, content.encode("utf-8"))
+            backups.put(sha, content.encode("utf-8"))
+            
+            # Exact check against what was installed; files the lock doesn't know are overwritten as before
+            if lock.is_modified(filename) and local_file.exists() and not force:
+                if lock.entry(filename).get("pending") == sha and not side_file.exists():
+                    lock.record(filename, f"{base_path}/{filename}", sha)
+                    merged.append(filename)
+                    echo(f"   ✓ {filename} (merged by hand)")
+                    continue
+                base = find_base(filename, lock.entry(filename).get("sha"), root, store)
+                if base is not None:
+                    with tracer.span("merge", path=filename):
+                        result = merge3(base, local_file.read_bytes().decode("utf-8"), content)
+                        if conflicts == "rej":
+                            text, rejects = render_rejects(result, filename)
+                        else:
+                            text, rejects = render(result, "local", f"arche {latest_version or 'upstream'}"), ""
+                    with tracer.span("write", path=filename):
+                        txn.write(filename, text.encode("utf-8"))  # Keep the file's line endings as merged
+                        if rejects:
+                            txn.write(f"{filename}.rej", rejects.encode("utf-8"))
+                        else:
+                            txn.delete(f"{filename}.rej")
+                    # Recorded as installed from the new version, so the local edits still show as modified
+                    lock.record(filename, f"{base_path}/{filename}", sha)
+                    lock.entry(filename).pop("pending", None)
+                    txn.delete(f"{filename}.arche-new")
+                    if result.conflicts:
+                        where = f"see {reject_file.name}" if rejects else "resolve the <<<<<<< markers"
+                        echo(f"   ⚠ {filename} merged with {len(result.conflicts)} conflict(s); {where}")
+                        conflicted.append(filename)
+                    else:
+                        echo(f"   ✓ {filename} merged with your local changes")
+                        merged.append(filename)
+                    continue
+                txn.write(f"{filename}.arche-new", content.encode("utf-8"))
+                lock.entry(filename)["pending"] = sha
+                echo(f"   ⚠ {filename} has local changes; kept it and saved the update as {side_file.name}")
+                kept.append(filename)
+                continue
+            
+            echo(f"   Updating {filename}...")
+            with tracer.span("write", path=filename):
+                txn.write(filename, content.encode("utf-8"))
+            lock.record(filename, f"{base_path}/{filename}", sha)
+            txn.delete(f"{filename}.arche-new")
+            updated.append(filename)
+            echo(f"   ✓ {filename} updated")
+        
+        # Config and lock commit with the files; with files left to merge the
+        # project isn't on the new version yet
+        if not kept:
+            config["arche_version"] = latest_version
+            config["last_update_check"] = datetime.now().strftime("%Y-%m-%d")
+            txn.write(".arche-config", config_bytes(config))
+            lock.data["revision"] = latest_version
+        txn.write(LOCK_FILE, lock.dumps())
+        with tracer.span("commit"):
+            txn.commit(version=latest_version, backup=timestamp)
     
-    print(f"\n✅ Updates applied successfully!")
-    print(f"   New version: {latest_version}")
-    print(f"   Backup: .arche-backups/{timestamp}/")
-    print(f"   To rollback: python update_arche.py --rollback {timestamp}")
+    echo(f"\n✅ Updates applied successfully!" if not kept else f"\n⚠️  Updates applied except {len(kept)} locally modified file(s)")
+    if kept:
+        echo(f"   Merge each <file>.arche-new into <file> and delete it, then run --apply again;")
+        echo(f"   or re-run with --force to overwrite your changes.")
+    if conflicted:
+        echo(f"   Conflicts where both you and upstream changed the same lines: {', '.join(conflicted)}")
+    echo(f"   New version: {latest_version}")
+    echo(f"   Backup: {timestamp} (python update_arche.py --list-backups)")
+    echo(f"   To rollback: python update_arche.py --rollback {timestamp}")
     
     # Log update
-    log_file = Path(".arche-update.log")
-    log_entry = f"[{datetime.now().isoformat()}] Updated to {latest_version} - {len(files)} files\n"
+    log_file = root / ".arche-update.log"
+    log_entry = f"[{datetime.now().isoformat()}] Updated to {latest_version} - {len(files) - len(kept)} files"
+    if kept:
+        log_entry += f", kept local changes in {', '.join(kept)}"
+    if conflicted:
+        log_entry += f", merge conflicts in {', '.join(conflicted)}"
     with open(log_file, "a") as f:
-        f.write(log_entry)
+        f.write(log_entry + "\n")
     
+    if summary is not None:
+        summary.update(updated=updated, merged=merged, conflicts=conflicted, kept=kept, backup=[timestamp])
     return True
 
 
 def rollback(timestamp: str) -> bool:
-    """Rollback to a specific backup."""
-    backup_dir = Path(".arche-backups") / timestamp
+    """Rollback to a specific backup, rewriting only files that differ from it."""
+    store = BackupStore(Path.cwd())
+    snapshot = store.find(timestamp)
     
-    if not backup_dir.exists():
-        print(f"✗ Backup not found: {backup_dir}")
+    if snapshot is None:
+        print(f"✗ Backup not found: {timestamp}")
+        print("   List backups with: python update_arche.py --list-backups")
         return False
     
     print(f"🔄 Rolling back to backup: {timestamp}")
     
-    for backup_file in backup_dir.iterdir():
-        if backup_file.name.startswith("."):
-            continue
-        
-        dest = Path(backup_file.name)
-        print(f"   Restoring {backup_file.name}...")
-        shutil.copy2(backup_file, dest)
-        print(f"   ✓ {backup_file.name} restored")
-    
-    # Restore config
-    backup_config = backup_dir / ".arche-config"
-    if backup_config.exists():
-        shutil.copy2(backup_config, ".arche-config")
+    restored = store.restore(snapshot)
+    for name in restored:
+        if not name.startswith("."):
+            print(f"   ✓ {name} restored")
+    if not restored:
+        print("   Files already match the backup")
     
     print("\n✅ Rollback complete!")
     return True
@@ -328,23 +724,487 @@ def check_should_prompt(config: Dict) -> bool:
     return datetime.now() >= next_check_date
 
 
+def check_state_path(root: Path) -> Path:
+    """Where the last update check of the project in ``root`` is remembered."""
+    key = hashlib.sha256(str(Path(root).resolve()).encode("utf-8")).hexdigest()[:16]
+    return default_cache_dir() / "checks" / f"{key}.json"
+
+
+def load_check_state(root: Path) -> Optional[Dict]:
+    """The last recorded update check, or None if there is none."""
+    try:
+        state = json.loads(check_state_path(root).read_text())
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) and "checked_at" in state else None
+
+
+def save_check_state(config: Dict, root: Path, latest: Optional[str], files: List[str]) -> Dict:
+    """Record the outcome of an update check (``latest`` None: it failed)."""
+    state = {
+        "root": str(Path(root).resolve()),
+        "checked_at": time.time(),
+        "source": get_source().describe(),
+        "version": config.get("arche_version"),
+        "latest": latest,
+        "files": sorted(files),
+        "error": None if latest else "unable to reach the template source",
+    }
+    materialize(io.BytesIO((json.dumps(state, indent=2) + "\n").encode("utf-8")), check_state_path(root))
+    return state
+
+
+def check_state_fresh(config: Dict, state: Optional[Dict], ttl_hours: float) -> bool:
+    """
+    Whether ``state`` can answer for the project without a new check.
+    
+    A check goes stale after ``ttl_hours``, a failed one after at most
+    RETRY_AFTER_ERROR, and any check once the installed version or the
+    template source changes.
+    """
+    if state is None:
+        return False
+    if state.get("version") != config.get("arche_version") or state.get("source") != get_source().describe():
+        return False
+    ttl = ttl_hours * 3600
+    if state.get("error"):
+        ttl = min(ttl, RETRY_AFTER_ERROR)
+    return 0 <= time.time() - state["checked_at"] < ttl
+
+
+def refresh_check_state(config: Dict, root: Path = Path(".")) -> Dict:
+    """Check for updates (no file bodies) and record the outcome."""
+    try:
+        latest = fetch_latest_version(config.get("branch", "main"))
+        _, files = check_for_updates(config, verbose=False, fetch=False) if latest else (False, {})
+        return save_check_state(config, root, latest, list(files))
+    finally:
+        check_state_path(root).with_suffix(".refreshing").unlink(missing_ok=True)
+
+
+def spawn_refresher(root: Path, args: argparse.Namespace) -> bool:
+    """
+    Start a detached ``--refresh-state`` run for ``root`` and return at once.
+    
+    A claim file next to the state keeps concurrent shells from starting
+    more than one; a claim older than REFRESH_TIMEOUT is assumed abandoned.
+    Returns whether a refresher was started.
+    """
+    claim = check_state_path(root).with_suffix(".refreshing")
+    claim.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        if time.time() - claim.stat().st_mtime < REFRESH_TIMEOUT:
+            return False
+        claim.unlink(missing_ok=True)
+    except OSError:
+        pass
+    try:
+        os.close(os.open(claim, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return False
+    
+    command = [sys.executable, str(Path(__file__).resolve()), "--refresh-state", "--timeout", str(args.timeout)]
+    if args.source:
+        command += ["--source", args.source]
+    options = {"start_new_session": True} if os.name == "posix" else {
+        "creationflags": getattr(subprocess, "DETACHED_PROCESS", 0) | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+    }
+    try:
+        subprocess.Popen(command, cwd=root, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, close_fds=True, **options)
+    except OSError:
+        claim.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def cached_status(config: Dict, args: argparse.Namespace, root: Path = Path(".")) -> Tuple[Optional[Dict], bool]:
+    """
+    The recorded update check and whether it is current, without touching
+    the network. A stale or missing record starts a background refresh.
+    """
+    state = load_check_state(root)
+    fresh = check_state_fresh(config, state, config.get("update_check_ttl_hours", CHECK_TTL_HOURS))
+    if not fresh:
+        spawn_refresher(root, args)
+    if state is not None and (state.get("version") != config.get("arche_version")
+                              or state.get("source") != get_source().describe()):
+        state = None  # Describes the version before the last apply, or another source
+    return state, fresh
+
+
+def _age(seconds: float) -> str:
+    if seconds < 60:
+        return "just now"
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit} ago"
+
+
+def print_status_line(state: Optional[Dict], fresh: bool) -> int:
+    """One line for shell and editor start-up hooks; 1 if updates are available."""
+    if state is None:
+        print("… arche: checking for updates in the background")
+        return 0
+    checked = _age(time.time() - state["checked_at"])
+    refreshing = "" if fresh else ", refreshing"
+    if state.get("error"):
+        print(f"⚠ arche: last update check failed ({checked}{refreshing})")
+        return 0
+    if state["files"]:
+        print(f"⬆️  arche: updates available for {', '.join(state['files'])} (checked {checked}{refreshing})"
+              " — run python update_arche.py --apply")
+        return 1
+    print(f"✓ arche: up to date (checked {checked}{refreshing})")
+    return 0
+
+
+@dataclass
+class FleetProject:
+    """One project in a --fleet run and what the run found or did there."""
+    root: Path
+    config: Dict = field(default_factory=dict)
+    version: str = "unknown"  # arche_version before this run
+    status: str = "pending"  # up-to-date, updates, updated, merged, conflicts, kept, frozen, error
+    latest: Optional[str] = None
+    files: List[str] = field(default_factory=list)  # Framework files with an update
+    modified: List[str] = field(default_factory=list)  # Of those, edited locally
+    applied: Dict[str, List[str]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def group(self) -> Tuple[str, str, str]:
+        return self.config.get("mode", "?"), self.config.get("branch", "main"), self.version
+
+
+def find_projects(roots: List[Path]) -> List[Path]:
+    """Directories under ``roots`` holding an .arche-config, skipping hidden and vendored trees."""
+    found = set()
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [name for name in dirnames if not name.startswith(".") and name not in FLEET_SKIP_DIRS]
+            if ".arche-config" in filenames:
+                found.add(Path(dirpath))
+    return sorted(found)
+
+
+def fleet_update(
+    roots: List[Path],
+    apply: bool = False,
+    force: bool = False,
+    conflicts: str = "markers",
+    jobs: int = DEFAULT_JOBS,
+    source: Optional[str] = None
+) -> Dict:
+    """
+    Check (or apply) updates in every arche project under ``roots``.
+    
+    Upstream is read once for the whole fleet: one version lookup and one
+    tree listing per (source, branch), and each changed framework file is
+    downloaded once per (source, mode, branch) however many projects need
+    it. Per-project work (hashing, merging, backups, writes) runs on
+    ``jobs`` threads. ``source`` overrides the source each project
+    recorded. Returns the report that print_fleet_report() shows.
+    """
+    start = time.perf_counter()
+    projects = [FleetProject(root) for root in find_projects(roots)]
+    
+    def load(project: FleetProject):
+        try:
+            recovered = recover(project.root)
+        except OSError as e:
+            project.status, project.error = "error", f"finishing an interrupted update: {e}"
+            return
+        try:
+            project.config = read_config(project.root)
+            project.version = project.config.get("arche_version", "unknown")
+        except (OSError, ValueError) as e:
+            project.status, project.error = "error", f"invalid .arche-config: {e}"
+        else:
+            if recovered == "corrupt":
+                project.status, project.error = "error", (
+                    "discarded an interrupted update with an unreadable journal; run --check there to review its files"
+                )
+            elif project.config.get("update_strategy", "auto") == "frozen":
+                project.status = "frozen"
+    
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        list(pool.map(load, projects))
+    
+    # Upstream state, once per source and branch
+    by_source: Dict[Optional[str], List[FleetProject]] = {}
+    for project in projects:
+        if project.status == "pending":
+            by_source.setdefault(source or project.config.get("source"), []).append(project)
+    
+    for spec, members in by_source.items():
+        try:
+            arche_source.configure(spec, _cache_dir)
+        except (OSError, ValueError) as e:
+            for project in members:
+                project.status, project.error = "error", f"source {spec}: {e}"
+            continue
+        contents: Dict[Tuple[str, str, str], str] = {}
+        for branch in sorted({project.group[1] for project in members}):
+            in_branch = [project for project in members if project.group[1] == branch]
+            latest = fetch_latest_version(branch)
+            if not latest:
+                for project in in_branch:
+                    project.status, project.error = "error", f"unable to resolve {branch}"
+                continue
+            try:
+                with tracer.span("tree", branch=branch):
+                    tree = get_source().tree(branch)
+            except (OSError, ValueError, KeyError):
+                tree = None
+            
+            remote: Dict[str, Dict[str, str]] = {}
+            for mode in sorted({project.group[0] for project in in_branch}):
+                if tree is not None:
+                    remote[mode] = framework_shas(tree, mode)
+                else:
+                    # No listing from this source: hash the files themselves, once per mode
+                    fetched = fetch_framework_files(mode, branch)
+                    contents.update({(mode, branch, name): text for name, text in fetched.items()})
+                    remote[mode] = {name: git_blob_sha(text.encode("utf-8")) for name, text in fetched.items()}
+            
+            def inspect(project: FleetProject):
+                project.latest = latest
+                mode = project.group[0]
+                lock = ProjectLock.load(project.root)
+                if project.group[2] == latest:
+                    changed = []
+                elif lock is not None:
+                    changed = outdated_files(lock, remote[mode])
+                else:
+                    changed = [
+                        name for name, sha in remote[mode].items()
+                        if not (project.root / name).is_file() or fingerprints().blob_sha(project.root / name) != sha
+                    ]
+                project.files = changed
+                project.modified = [name for name in changed if lock is not None and lock.is_modified(name)]
+                project.status = "updates" if changed else "up-to-date"
+            
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+                list(pool.map(inspect, in_branch))
+        
+        if not apply:
+            continue
+        pending = [project for project in members if project.status == "updates"]
+        wanted = sorted({(*project.group[:2], name) for project in pending for name in project.files} - set(contents))
+        
+        def download(key: Tuple[str, str, str]):
+            mode, branch, name = key
+            contents.update({(mode, branch, found): text for found, text in fetch_framework_files(mode, branch, [name]).items()})
+        
+        def update(project: FleetProject):
+            mode, branch, _ = project.group
+            files = {name: contents[(mode, branch, name)] for name in project.files if (mode, branch, name) in contents}
+            if len(files) < len(project.files):
+                project.status, project.error = "error", "unable to fetch framework files"
+                return
+            try:
+                applied = apply_updates(project.config, files, force=force, conflicts=conflicts, root=project.root,
+                                        quiet=True, summary=project.applied)
+            except (OSError, ValueError) as e:
+                project.status, project.error = "error", str(e)
+                return
+            if not applied:
+                project.status, project.error = "error", project.applied.pop("error", ["update not applied"])[0]
+                return
+            for status in ("kept", "conflicts", "merged"):
+                if project.applied.get(status):
+                    project.status = status
+                    break
+            else:
+                project.status = "updated"
+        
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            list(pool.map(download, wanted))
+            list(pool.map(update, pending))
+    
+    groups: Dict[Tuple[str, str, str], Dict] = {}
+    for project in projects:
+        if project.status == "error" and not project.config:
+            continue
+        mode, branch, version = project.group
+        entry = groups.setdefault(project.group, {
+            "mode": mode, "branch": branch, "version": version, "latest": project.latest, "projects": 0, "status": {}
+        })
+        entry["projects"] += 1
+        entry["status"][project.status] = entry["status"].get(project.status, 0) + 1
+    
+    counts: Dict[str, int] = {}
+    for project in projects:
+        counts[project.status] = counts.get(project.status, 0) + 1
+    return {
+        "roots": [str(root) for root in roots],
+        "action": "apply" if apply else "check",
+        "projects": [
+            {
+                "root": str(project.root),
+                "mode": project.group[0],
+                "branch": project.group[1],
+                "version": project.group[2],
+                "latest": project.latest,
+                "status": project.status,
+                "files": project.files,
+                "modified": project.modified,
+                **({"applied": project.applied} if project.applied else {}),
+                **({"error": project.error} if project.error else {}),
+            }
+            for project in projects
+        ],
+        "groups": [groups[key] for key in sorted(groups)],
+        "summary": {"projects": len(projects), "status": counts, "seconds": round(time.perf_counter() - start, 2),
+                    "requests": get_client().stats.requests},
+    }
+
+
+def print_fleet_report(report: Dict):
+    """Human-readable form of a fleet_update() result: one line per group, then projects needing attention."""
+    summary = report["summary"]
+    verb = "Applied updates in" if report["action"] == "apply" else "Checked"
+    print(f"🚢 {verb} {summary['projects']} project(s) under {', '.join(report['roots'])}\n")
+    for group in report["groups"]:
+        states = ", ".join(f"{count} {status}" for status, count in sorted(group["status"].items()))
+        target = f" → {group['latest']}" if group["latest"] and group["latest"] != group["version"] else ""
+        print(f"   {group['mode']} @ {group['branch']} ({group['version']}{target}): {group['projects']} project(s) · {states}")
+    
+    icons = {"updates": "⬆", "updated": "✓", "merged": "✓", "conflicts": "⚠", "kept": "⚠", "error": "✗"}
+    attention = [project for project in report["projects"] if project["status"] in icons]
+    if attention:
+        print()
+    for project in attention:
+        if project["status"] == "error":
+            detail = project["error"]
+        elif project["status"] in ("updates", "updated"):
+            detail = ", ".join(name + (" (locally modified)" if name in project["modified"] else "") for name in project["files"])
+        elif project["status"] == "conflicts":
+            detail = "conflicts in " + ", ".join(project["applied"]["conflicts"])
+        elif project["status"] == "kept":
+            detail = "local changes kept, update saved as .arche-new: " + ", ".join(project["applied"]["kept"])
+        else:
+            detail = "merged with local changes: " + ", ".join(project["applied"]["merged"])
+        print(f"   {icons[project['status']]} {project['root']}: {detail}")
+    
+    states = ", ".join(f"{count} {status}" for status, count in sorted(summary["status"].items())) or "no projects found"
+    print(f"\n   {states} · {summary['requests']} request(s) · {summary['seconds']:.2f}s")
+
+
 def main():
+    global _cache_dir
     parser = argparse.ArgumentParser(
         description="Arche Update Tool - Manage framework updates",
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
     
     parser.add_argument("--check", action="store_true", help="Check for updates")
+    parser.add_argument("--status", action="store_true",
+                        help="Report the last update check without network access (refreshed in the background)")
+    parser.add_argument("--refresh-state", action="store_true", help=argparse.SUPPRESS)
     parser.add_argument("--diff", action="store_true", help="Show what would change")
     parser.add_argument("--apply", action="store_true", help="Apply updates")
     parser.add_argument("--set-strategy", type=str, help="Change update strategy (auto/frozen/manual/prompt)")
     parser.add_argument("--interval", type=int, help="Set check interval in days (for prompt strategy)")
     parser.add_argument("--rollback", type=str, metavar="TIMESTAMP", help="Rollback to specific backup")
+    parser.add_argument("--list-backups", action="store_true", help="List backup snapshots")
+    parser.add_argument("--fleet", nargs="+", type=Path, metavar="ROOT",
+                        help="Check (or with --apply, update) every arche project found under these directories")
+    parser.add_argument("--json", action="store_true", help="With --fleet or --diff, print the report as JSON")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"With --fleet, projects and downloads handled in parallel (default: {DEFAULT_JOBS})")
+    parser.add_argument("--gc", action="store_true",
+                        help="Delete backups outside the retention policy and file contents no backup needs")
+    parser.add_argument("--keep", type=int, metavar="N",
+                        help=f"With --gc, keep the newest N backups (default: backup_keep in .arche-config, else {DEFAULT_KEEP})")
+    parser.add_argument("--keep-days", type=float, metavar="DAYS",
+                        help="With --gc, also keep backups younger than DAYS (default: backup_keep_days in .arche-config)")
     parser.add_argument("--pin", type=str, metavar="VERSION", help="Pin to specific version")
+    parser.add_argument("--force", action="store_true",
+                        help="With --apply, overwrite framework files you have changed locally (a backup is still made)")
+    parser.add_argument("--conflicts", choices=["markers", "rej"], default="markers",
+                        help="Where both you and upstream changed the same lines: write conflict markers into "
+                             "the file, or keep your lines and save upstream's hunks to <file>.rej (default: markers)")
+    parser.add_argument("--timeout", type=float, default=arche_http.DEFAULT_TIMEOUT, metavar="SECONDS",
+                        help=f"Network timeout per request (default: {arche_http.DEFAULT_TIMEOUT:g})")
+    parser.add_argument("--retries", type=int, default=arche_http.DEFAULT_RETRIES, metavar="N",
+                        help=f"Retries for transient network errors, with backoff (default: {arche_http.DEFAULT_RETRIES})")
+    parser.add_argument("--no-cache", action="store_true", help="Don't revalidate against cached responses")
+    parser.add_argument("--cache-dir", type=Path, metavar="DIR",
+                        help="Template cache location, as given to bootstrap.py "
+                             f"(default: cache_dir in .arche-config, else {default_cache_dir()})")
+    parser.add_argument("--verify", action="store_true",
+                        help="Hash every local file instead of trusting unchanged size and modification times")
+    parser.add_argument("--source", type=str, metavar="SOURCE",
+                        help="Template source: 'github', a local checkout or file:// mirror, an HTTP mirror URL "
+                             "or git+URL (default: the source recorded in .arche-config, else GitHub)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print network statistics")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a one-line timing summary per phase with request, byte and retry counters")
+    parser.add_argument("--trace-json", type=Path, metavar="FILE",
+                        help="Write a Chrome trace-event file of the run (open in chrome://tracing or ui.perfetto.dev)")
     
     args = parser.parse_args()
+    if args.profile or args.trace_json:
+        tracer.enable()
+    _cache_dir = args.cache_dir.resolve() if args.cache_dir else None
+    arche_http.configure(
+        timeout=args.timeout,
+        validator_dir=None if args.no_cache else (_cache_dir or default_cache_dir()) / "http",
+        retries=args.retries
+    )
+    configure_fingerprints((_cache_dir or default_cache_dir()) / FINGERPRINT_FILE, verify=args.verify)
+    
+    try:
+        result = run(args)
+    finally:
+        fingerprints().save()
+        if tracer.enabled:
+            stats = asdict(get_client().stats)
+            stats.update(files_hashed=fingerprints().hashed, hashes_cached=fingerprints().hits)
+            tracer.report(args.profile, args.trace_json, {
+                name: value for name, value in stats.items() if value or name == "requests"
+            }, {"tool": "update_arche", "argv": sys.argv[1:], "source": get_source().describe()})
+    
+    if args.verbose:
+        print(f"\n🌐 Network: {get_client().stats.summary()}")
+    
+    return result
+
+
+def run(args: argparse.Namespace) -> int:
+    """Dispatch the parsed command line."""
+    if args.json and not (args.fleet or args.diff):
+        print("✗ --json needs --fleet or --diff")
+        return 1
+    if args.fleet:
+        missing = [str(root) for root in args.fleet if not root.is_dir()]
+        if missing:
+            print(f"✗ Not a directory: {', '.join(missing)}")
+            return 1
+        report = fleet_update(args.fleet, apply=args.apply, force=args.force, conflicts=args.conflicts,
+                              jobs=args.jobs, source=args.source)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_fleet_report(report)
+        states = report["summary"]["status"]
+        return 1 if states.get("error") or (not args.apply and states.get("updates")) else 0
+    
+    # Finish (or drop) an apply that was interrupted before reading any state.
+    # Start-up hooks and the background refresh only read, and never touch it
+    recovered = None if args.status or args.refresh_state else recover(Path.cwd())
+    if recovered == "committed":
+        print("⚠ Finished an update that was interrupted while it was being written")
+    elif recovered == "discarded":
+        print("⚠ Discarded an update that was interrupted before it changed any files")
+    elif recovered == "corrupt":
+        print("⚠ Discarded an interrupted update whose journal was unreadable")
+        print("   Files it had already written show up as local changes; review them with --check")
     
     config = load_config()
+    arche_source.configure(args.source or config.get("source"), project_cache_dir(config))
     strategy = config.get("update_strategy", "auto")
     
     # Handle strategy change
@@ -357,6 +1217,18 @@ def main():
         success = rollback(args.rollback)
         return 0 if success else 1
     
+    # Handle backups
+    if args.list_backups:
+        list_backups()
+        return 0
+    if args.gc:
+        keep = args.keep if args.keep is not None else config.get("backup_keep", DEFAULT_KEEP)
+        keep_days = args.keep_days if args.keep_days is not None else config.get("backup_keep_days")
+        print(f"🧹 Pruning backups (keep {keep} newest" + (f" and any from the last {keep_days:g} days)" if keep_days else ")"))
+        with locked(Path.cwd()):
+            prune_backups(BackupStore(Path.cwd()), keep, keep_days, verbose=True)
+        return 0
+    
     # Handle pin
     if args.pin:
         config["update_strategy"] = "frozen"
@@ -366,6 +1238,17 @@ def main():
         print(f"✓ Pinned to version: {args.pin}")
         return 0
     
+    # Answer start-up hooks from the recorded check
+    if args.status:
+        if strategy == "frozen":
+            print("🔒 arche: frozen, no updates")
+            return 0
+        return print_status_line(*cached_status(config, args))
+    if args.refresh_state:
+        if strategy != "frozen":
+            refresh_check_state(config)
+        return 0
+    
     # Check if frozen
     if strategy == "frozen":
         print("🔒 Update strategy: frozen")
@@ -375,16 +1258,33 @@ def main():
     
     # Handle check
     if args.check:
-        has_updates, files = check_for_updates(config, verbose=True)
+        has_updates, files = check_for_updates(config, verbose=True, fetch=False)
+        latest = _latest_versions.get((get_source().describe(), config.get("branch", "main")))
+        if latest:
+            save_check_state(config, Path("."), latest, list(files))
         return 0 if not has_updates else 1
     
     # Handle diff
     if args.diff:
-        show_diff(config)
+        show_diff(config, as_json=args.json)
         return 0
     
+    # Without flags the auto strategy answers from the recorded check like
+    # --status, and only goes to the network when that check found updates
+    if strategy == "auto" and not args.apply:
+        state, fresh = cached_status(config, args)
+        if state is None or state.get("error") or not state["files"]:
+            print_status_line(state, fresh)
+            return 0
+    
     # Handle apply
     if args.apply or strategy == "auto":
+        problem = get_source().check_budget(planned=planned_api_requests())
+        if problem:
+            print(f"✗ Not starting update: {problem}")
+            print("   Set GITHUB_TOKEN for a higher limit or try again after the reset.")
+            return 1
+        
         has_updates, files = check_for_updates(config, verbose=True)
         
         if not has_updates:
@@ -394,7 +1294,10 @@ def main():
             print("\n💡 Updates available. Run with --apply to install.")
             return 0
         
-        success = apply_updates(config, files, auto=(strategy == "auto"))
+        success = apply_updates(config, files, auto=(strategy == "auto"), force=args.force, conflicts=args.conflicts)
+        latest = _latest_versions.get((get_source().describe(), config.get("branch", "main")))
+        if success and latest and config.get("arche_version") == latest:
+            save_check_state(config, Path("."), latest, [])  # Nothing left to apply at this version
         return 0 if success else 1
     
     # Default: show status
@@ -403,12 +1306,17 @@ def main():
     print(f"   Mode: {config.get('mode')}")
     print(f"   Version: {config.get('arche_version', 'unknown')}")
     
-    has_updates, _ = check_for_updates(config, verbose=False)
-    if has_updates:
-        print("\n   ⬆️  Updates available!")
+    state, fresh = cached_status(config, args)
+    refreshing = "" if fresh else " (refreshing in the background)"
+    if state is None:
+        print("\n   … Checking for updates in the background; run again in a moment")
+    elif state.get("error"):
+        print(f"\n   ⚠ Last update check failed, {_age(time.time() - state['checked_at'])}{refreshing}")
+    elif state["files"]:
+        print(f"\n   ⬆️  Updates available! (checked {_age(time.time() - state['checked_at'])}){refreshing}")
         print("   Run 'python update_arche.py --check' for details")
     else:
-        print("\n   ✓ Up to date")
+        print(f"\n   ✓ Up to date (checked {_age(time.time() - state['checked_at'])}){refreshing}")
     
     return 0
 